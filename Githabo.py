@@ -18,6 +18,65 @@ pip install requests
 2. Установите переменную окружения GITHUB_TOKEN или измените TOKEN в скрипте
 3. Запустите скрипт: python github_data_collector_graphql.py
 
+Дополнительные режимы:
+- --async [--concurrency N]      Параллельный сбор данных (N одновременных запросов)
+- --benchmark [--concurrency N]  Сравнение времени последовательного и параллельного сбора
+- --e2e-benchmark [--repos N] [--stars N] [--forks N] [--issues N] [--latency MS] [--concurrency N]
+                  [--rate-limit N]
+                                 Сквозной бенчмарк на локальном стенде GitHub API (без токена):
+                                 время и число запросов по фазам сбора и сценариям менеджера лицензий
+                                 (стенд - модуль githabo_fake.py рядом со скриптом)
+- --license-manager [--workers N] [--dry-run]
+                                 Массовое добавление лицензий пулом из N потоков
+- --license-benchmark [--workers 1,4,8] [--license MIT]
+                                 Пропускная способность добавления лицензий (без создания файлов)
+- --incremental                  Догрузить только изменения с прошлого запуска и объединить
+                                 их с существующим github_data.json
+- --resume                       Продолжить прерванный сбор с контрольной точки (github_checkpoint/)
+- --stream                       Писать форки, issues и starred репозитории постранично в
+                                 github_<набор>.ndjson вместо хранения всего в памяти
+- --warehouse                    Записывать репозитории, форки, issues, звезды, языки и дни
+                                 активности в github_warehouse.sqlite3 (upsert по фазам)
+- --warehouse-report [--parquet DIR]
+                                 Отчеты по хранилищу индексированными запросами (без API);
+                                 --parquet выгружает таблицы в Parquet (нужен pyarrow)
+- --all-years                    Вклады за все годы с регистрации (один запрос с алиасами по годам)
+- --history                      Записывать изменения звезд, форков, наблюдателей и issues
+                                 репозиториев и метрик профиля в github_history.sqlite3
+- --growth-report [--days N]     Прирост метрик за последние N дней (по умолчанию 90) по истории
+- --demo-unstar [--workers N] [--restart]
+                                 Снять все звезды (резервная копия starred_backup_<дата>.json);
+                                 прерванная операция продолжается по starred_unstar_journal.jsonl
+- --restar FILE [--workers N] [--restart]
+                                 Восстановить звезды из резервной копии (с журналом продолжения)
+- --accounts LOGIN1,LOGIN2 | --accounts @FILE [--tokens-file FILE] [--workers N] [--output DIR]
+                                 Сбор для нескольких аккаунтов (N одновременно) в каталоги
+                                 DIR/<логин>/; запросы распределяются по токенам из файла
+                                 GITHUB_TOKENS (через запятую) или GITHUB_TOKEN по остатку лимита;
+                                 совместим с --async, --resume, --stream, --warehouse, --history
+- --contributors [--repos OWNER/NAME,...]
+                                 Контрибьюторы всех собственных (или перечисленных) репозиториев
+                                 пакетными запросами: пользователи без повторов, компании и
+                                 локации -> github_contributors.json и github_contributors.csv
+- --outputs json,forks,...       Записать только выбранные выводы: json, profile, languages,
+                                 top_repos, activity_trends, starred, forks, repos_stars,
+                                 stars_distribution, analytics, forks_of_user_repos, issues, quality
+                                 (без json следующий --incremental выполнит полный сбор)
+- --compress gzip|zstd           Сжимать JSON и CSV (.gz / .zst; для zstd нужен zstandard)
+- --compact-json                 github_data.json без отступов
+- --parquet                      Дополнительно github_<набор>.parquet для табличных наборов
+                                 (нужен pyarrow)
+- --profile                      Телеметрия запросов: таблица в конце запуска, отчеты
+                                 github_telemetry.json и github_telemetry.prom (Prometheus)
+
+Адрес API (например, GitHub Enterprise или локальный тестовый сервер):
+- --api-url URL        По умолчанию GITHUB_API_URL или https://api.github.com
+
+Кэш ответов REST API (github_cache.sqlite3, условные запросы по ETag):
+- --cache-ttl HOURS    Время жизни записей кэша (по умолчанию 168 часов)
+- --cache-max-mb N     Максимальный размер кэша (по умолчанию 200 МБ)
+- --no-cache           Отключить кэш
+
 Преимущества GraphQL версии:
 - Один запрос для получения всех данных
 - Более эффективное использование API (меньше запросов)
@@ -25,41 +84,2929 @@ pip install requests
 - Лучшая производительность для больших объемов данных
 """
 
-import os
-import json
-import csv
-import time
-import sys
-import base64
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
-import requests
+import os
+import re
+import json
+import csv
+import time
+import sys
+import base64
+import gzip
+import io
+import asyncio
+import threading
+import sqlite3
+import hashlib
+import heapq
+import shutil
+import random
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from urllib.parse import urlparse
+from typing import List, Dict, Any, Optional, Tuple, Callable, Set
+from dataclasses import dataclass
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+# Поля репозитория для детальной аналитики (общий фрагмент для одиночных и пакетных запросов)
+REPOSITORY_ANALYTICS_FRAGMENT = """
+fragment RepositoryAnalyticsFields on Repository {
+  nameWithOwner
+  description
+  createdAt
+  updatedAt
+  pushedAt
+  isArchived
+  isPrivate
+  isFork
+  forkCount
+  stargazerCount
+  watchers {
+    totalCount
+  }
+  primaryLanguage {
+    name
+  }
+  languages(first: 5, orderBy: {field: SIZE, direction: DESC}) {
+    totalSize
+    edges {
+      size
+      node {
+        name
+      }
+    }
+  }
+  diskUsage
+  issues(states: [OPEN, CLOSED]) {
+    totalCount
+  }
+  pullRequests(states: [OPEN, CLOSED, MERGED]) {
+    totalCount
+  }
+  releases {
+    totalCount
+  }
+  licenseInfo {
+    name
+  }
+  repositoryTopics(first: 5) {
+    nodes {
+      topic {
+        name
+      }
+    }
+  }
+}
+"""
+
+# Количество connection-полей во фрагменте аналитики: каждое стоит один запрос
+# на репозиторий при расчете стоимости GraphQL (cost = запросы / 100)
+ANALYTICS_CONNECTIONS_PER_REPO = 6
+
+# Максимальная стоимость одного пакетного запроса аналитики в баллах rate limit
+ANALYTICS_MAX_QUERY_COST = 3
+
+# Верхняя граница числа алиасов в одном запросе (защита от таймаутов GraphQL)
+ANALYTICS_MAX_ALIASES = 50
+
+# Поля форка собственного репозитория (общий фрагмент для постраничных и пакетных запросов)
+FORK_FIELDS_FRAGMENT = """
+fragment ForkFields on Repository {
+  name
+  nameWithOwner
+  url
+  createdAt
+  pushedAt
+  updatedAt
+  description
+  primaryLanguage {
+    name
+  }
+  stargazerCount
+  owner {
+    login
+  }
+}
+"""
+
+# Сколько собственных репозиториев запрашивать в одном пакетном запросе форков
+# (100 алиасов x forks(first: 100) = 10 000 узлов, в пределах лимита GraphQL)
+FORKS_BATCH_MAX_ALIASES = 100
+
+# Сколько репозиториев запрашивать в одном запросе списка файлов корня (object(expression: "HEAD:"))
+FILE_INDEX_MAX_ALIASES = 100
+
+# Сколько репозиториев запрашивать в одном пакетном запросе контрибьюторов
+# (25 алиасов x (20 коллабораторов + 50 пользователей) = 1 750 узлов)
+CONTRIBUTORS_BATCH_MAX_ALIASES = 25
+
+# Поля пользователя для пакетного анализа контрибьюторов
+CONTRIBUTOR_FIELDS_FRAGMENT = """
+fragment ContributorFields on User {
+  login
+  name
+  company
+  location
+}
+"""
+
+# Предельный размер страницы GraphQL connection (first/last)
+GRAPHQL_MAX_PAGE_SIZE = 100
+
+# Бюджет одной страницы пагинации: стоимость в баллах rate limit и число узлов
+# (страница с вложенными connection-полями уменьшается, чтобы уложиться в него)
+GRAPHQL_PAGE_MAX_COST = 3
+GRAPHQL_PAGE_NODE_BUDGET = 10000
+
+# Ответы, после которых страница запрашивается повторно меньшим размером
+# (GitHub отвечает 502/504, если запрос не уложился в лимит времени)
+GRAPHQL_PAGE_SHRINK_STATUSES = (502, 504)
+
+# Адрес API по умолчанию (переопределяется переменной окружения GITHUB_API_URL или --api-url)
+DEFAULT_API_URL = "https://api.github.com"
+
+
+@dataclass
+class LicenseResult:
+    repo_name: str
+    success: bool
+    license_type: str
+    message: str
+    already_had_license: bool = False
+    error: Optional[str] = None
+
+
+class GitHubRateLimiter:
+    """
+    Общий ограничитель скорости запросов к GitHub API (token bucket)
+
+    Бюджет берется из заголовков X-RateLimit-* каждого ответа и из поля
+    rateLimit { cost remaining resetAt } GraphQL ответов. Пока бюджета
+    достаточно, запросы идут без задержек; когда остаток опускается ниже
+    порога, интервал между запросами плавно растет так, чтобы остатка
+    хватило до сброса лимита. Retry-After и вторичные лимиты блокируют
+    все запросы до указанного момента.
+    """
+
+    def __init__(self, slowdown_threshold: float = 0.2, write_interval: float = 1.0,
+                 writes_per_hour: int = 500):
+        """
+        Args:
+            slowdown_threshold: Доля оставшегося бюджета, ниже которой начинается замедление
+            write_interval: Минимальный интервал между запросами, создающими контент (сек)
+            writes_per_hour: Максимум запросов, создающих контент, за скользящий час
+                (вторичный лимит GitHub - 500 в час и 80 в минуту)
+        """
+        self.slowdown_threshold = slowdown_threshold
+        self.write_interval = write_interval
+        self.writes_per_hour = writes_per_hour
+        self.total_wait = 0.0
+        self._budgets = {}
+        self._next_slot = {}
+        self._next_write = 0.0
+        self._recent_writes = deque()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, resource: str = "core", write: bool = False) -> float:
+        """
+        Дождаться разрешения на запрос
+
+        Args:
+            resource: Ресурс лимита (core, graphql, search)
+            write: Запрос создает/изменяет контент (действует вторичный лимит)
+
+        Returns:
+            Время ожидания в секундах
+        """
+        with self._lock:
+            now = time.time()
+            start = max(now, self._blocked_until, self._next_slot.get(resource, 0.0))
+
+            if write:
+                start = max(start, self._next_write)
+                if len(self._recent_writes) >= self.writes_per_hour:
+                    start = max(start, self._recent_writes[0] + 3600)
+                while self._recent_writes and self._recent_writes[0] <= start - 3600:
+                    self._recent_writes.popleft()
+                self._recent_writes.append(start)
+                self._next_write = start + self.write_interval
+
+            budget = self._budgets.get(resource)
+            spacing = 0.0
+            if budget:
+                if budget["reset"] <= start:
+                    # Окно лимита сброшено - бюджет восстановлен
+                    budget["remaining"] = budget["limit"]
+                    budget["reset"] = start + 3600
+                if budget["remaining"] <= 0:
+                    start = max(start, budget["reset"] + 1)
+                    budget["remaining"] = budget["limit"]
+                    budget["reset"] = start + 3600
+                spacing = self._spacing(budget, start)
+                budget["remaining"] -= 1
+
+            self._next_slot[resource] = start + spacing
+            wait = start - now
+            self.total_wait += wait
+
+        if wait > 0:
+            if wait >= 5:
+                print(f"⏳ Лимит запросов ({resource}): ожидание {wait:.0f} сек...")
+            time.sleep(wait)
+        return wait
+
+    def _spacing(self, budget: Dict[str, float], now: float) -> float:
+        """Интервал до следующего запроса при текущем остатке бюджета"""
+        limit = budget["limit"]
+        remaining = budget["remaining"]
+        if limit <= 0 or remaining <= 0:
+            return 0.0
+
+        fraction = remaining / limit
+        if fraction >= self.slowdown_threshold:
+            return 0.0
+
+        # Равномерно распределяем остаток до сброса; у порога интервал нулевой
+        window = max(budget["reset"] - now, 0.0)
+        return window / remaining * (1 - fraction / self.slowdown_threshold)
+
+    def update_from_response(self, response: requests.Response, resource: str = "core"):
+        """Обновить бюджет по заголовкам ответа"""
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+
+        with self._lock:
+            now = time.time()
+            if "X-RateLimit-Remaining" in headers:
+                try:
+                    remaining = int(headers["X-RateLimit-Remaining"])
+                    limit = int(headers.get("X-RateLimit-Limit", 0)) or remaining + int(headers.get("X-RateLimit-Used", 0))
+                    reset = float(headers.get("X-RateLimit-Reset", now + 3600))
+                except ValueError:
+                    return
+                self._set_budget(resource, limit, remaining, reset)
+
+            if response.status_code in (403, 429):
+                retry_after = headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    self._blocked_until = max(self._blocked_until, now + int(retry_after))
+                elif headers.get("X-RateLimit-Remaining") != "0" and "secondary rate limit" in response.text.lower():
+                    # Вторичный лимит без Retry-After: GitHub рекомендует ждать минуту
+                    self._blocked_until = max(self._blocked_until, now + 60)
+
+    def update_from_graphql(self, rate_limit: Dict[str, Any]):
+        """Обновить бюджет GraphQL по полю rateLimit { cost remaining resetAt }"""
+        if not rate_limit or rate_limit.get("remaining") is None:
+            return
+
+        reset = time.time() + 3600
+        if rate_limit.get("resetAt"):
+            reset = datetime.fromisoformat(rate_limit["resetAt"].replace('Z', '+00:00')).timestamp()
+
+        with self._lock:
+            current = self._budgets.get("graphql", {})
+            limit = rate_limit.get("limit") or current.get("limit") or 5000
+            self._set_budget("graphql", limit, rate_limit["remaining"], reset)
+
+    def mark_exhausted(self, resource: str):
+        """Отметить бюджет ресурса как исчерпанный (ответ с ошибкой RATE_LIMITED)"""
+        with self._lock:
+            budget = self._budgets.get(resource)
+            if budget and budget["reset"] > time.time():
+                budget["remaining"] = 0
+            else:
+                self._blocked_until = max(self._blocked_until, time.time() + 60)
+
+    def _set_budget(self, resource: str, limit: int, remaining: int, reset: float):
+        """Сохранить бюджет ресурса (вызывается под блокировкой)"""
+        self._budgets[resource] = {"limit": limit, "remaining": remaining, "reset": reset}
+
+    def is_rate_limited(self, response: requests.Response) -> bool:
+        """Ответ означает превышение лимита (первичного или вторичного)"""
+        if response.status_code not in (403, 429):
+            return False
+        if response.status_code == 429 or response.headers.get("Retry-After"):
+            return True
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            return True
+        return "rate limit" in response.text.lower()
+
+    def get_budget(self, resource: str = "core") -> Dict[str, float]:
+        """Текущий известный бюджет ресурса"""
+        with self._lock:
+            return dict(self._budgets.get(resource, {}))
+
+    def headroom(self, resource: str = "core") -> Optional[int]:
+        """Запас запросов ресурса: 0 - исчерпан или заблокирован, None - бюджет еще неизвестен"""
+        with self._lock:
+            now = time.time()
+            if self._blocked_until > now:
+                return 0
+            budget = self._budgets.get(resource)
+            if not budget:
+                return None
+            if budget["reset"] <= now:
+                return budget["limit"]
+            return max(0, budget["remaining"])
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(token: str) -> GitHubRateLimiter:
+    """Общий ограничитель для токена (лимиты GitHub считаются на токен)"""
+    with _rate_limiters_lock:
+        if token not in _rate_limiters:
+            _rate_limiters[token] = GitHubRateLimiter()
+        return _rate_limiters[token]
+
+
+def resolve_api_url(base_url: Optional[str] = None) -> str:
+    """Адрес API: явно указанный, из GITHUB_API_URL или api.github.com"""
+    return (base_url or os.environ.get("GITHUB_API_URL") or DEFAULT_API_URL).rstrip("/")
+
+
+class GitHubTransport:
+    """
+    Общий HTTP транспорт для запросов к GitHub API
+
+    Одна requests.Session с пулом keep-alive соединений и gzip на токен и
+    адрес API, чтобы менеджер лицензий и коллектор не открывали новое
+    TCP+TLS соединение на каждый запрос. Ответы 500/502/503/504 и обрывы
+    соединения повторяются с экспоненциальной задержкой и случайным
+    разбросом (full jitter). Повторяются только идемпотентные запросы
+    (см. is_retryable): создание файлов через /contents/ и POST к REST API
+    не повторяются, GraphQL запросы повторяются.
+    """
+
+    RETRY_STATUSES = (500, 502, 503, 504)
+
+    def __init__(self, token: str, base_url: Optional[str] = None, pool_size: int = 10,
+                 max_retries: int = 4, backoff_base: float = 0.5, backoff_max: float = 16.0,
+                 timeout: float = 60.0):
+        """
+        Args:
+            token: GitHub Personal Access Token
+            base_url: Адрес API (None = GITHUB_API_URL или api.github.com)
+            pool_size: Максимум одновременно открытых соединений
+            max_retries: Количество повторов при 5xx и сетевых ошибках
+            backoff_base: Базовая задержка повтора (сек), удваивается с каждой попыткой
+            backoff_max: Верхняя граница задержки повтора (сек)
+            timeout: Таймаут подключения и чтения ответа (сек)
+        """
+        self.base_url = resolve_api_url(base_url)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.pool_size = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": "GitHub-Data-Collector-GraphQL/1.0"
+        })
+        self.ensure_pool_size(pool_size)
+
+    def ensure_pool_size(self, pool_size: int):
+        """Увеличить пул соединений под количество параллельных запросов"""
+        with self._lock:
+            if pool_size <= self.pool_size:
+                return
+            # Повторы выполняет request() с разбросом задержки, urllib3 сам не повторяет
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+            self.pool_size = pool_size
+
+    def url(self, path: str) -> str:
+        """Полный URL для пути API (абсолютные URL возвращаются без изменений)"""
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method: str, url: str, max_retries: Optional[int] = None, **kwargs) -> requests.Response:
+        """
+        Выполнить HTTP запрос с повтором при 5xx и сетевых ошибках
+
+        Args:
+            method: HTTP метод
+            url: Полный URL или путь относительно base_url
+            max_retries: Число повторов для этого запроса (None = значение транспорта)
+            **kwargs: Дополнительные параметры requests
+
+        Returns:
+            Ответ API (без проверки статуса)
+        """
+        url = self.url(url)
+        kwargs.setdefault("timeout", self.timeout)
+        retryable = self.is_retryable(method, url)
+        if max_retries is None:
+            max_retries = self.max_retries
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if not retryable or attempt >= max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                print(f"Сетевая ошибка ({e.__class__.__name__}), повтор через {delay:.1f} сек...")
+            else:
+                if response.status_code not in self.RETRY_STATUSES or not retryable or attempt >= max_retries:
+                    response.retry_count = attempt
+                    return response
+                delay = self._backoff(attempt, response.headers.get("Retry-After"))
+                print(f"Ответ {response.status_code} от {url}, повтор через {delay:.1f} сек...")
+                response.close()
+
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            time.sleep(delay)
+
+    @staticmethod
+    def is_retryable(method: str, url: str) -> bool:
+        """
+        Можно ли повторить запрос после 5xx или обрыва соединения
+
+        Повторяются только идемпотентные запросы: чтение, GraphQL и PUT/DELETE
+        звезд. PUT /contents/ создает коммит - если GitHub успел его принять,
+        повтор без sha получит 422 и добавленный файл будет засчитан как ошибка.
+        """
+        if method in ("GET", "HEAD"):
+            return True
+        if method == "POST":
+            return url.endswith("/graphql")
+        return method in ("PUT", "DELETE") and "/contents/" not in urlparse(url).path
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Задержка перед повтором: случайная в [0, base * 2^attempt], не меньше Retry-After"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return delay
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(token: str, base_url: Optional[str] = None) -> GitHubTransport:
+    """Общий транспорт для токена и адреса API (одна сессия и пул соединений)"""
+    key = (token, resolve_api_url(base_url))
+    with _transports_lock:
+        if key not in _transports:
+            _transports[key] = GitHubTransport(token, base_url)
+        return _transports[key]
+
+
+class GitHubTokenPool:
+    """
+    Пул токенов для запросов на чтение
+
+    Каждый запрос уходит токену с наибольшим запасом лимита по ресурсу
+    (core или graphql) - по бюджетам общих ограничителей скорости токенов,
+    которые обновляются из заголовков и полей rateLimit ответов. Для токена,
+    чей бюджет еще неизвестен, запас - стандартный лимит за вычетом уже
+    отправленных через пул запросов; при равном запасе выбирается реже
+    использованный. Токены должны иметь одинаковый доступ к
+    собираемым данным: приватные репозитории видны только владельцу токена.
+    """
+
+    # Запас токена, по которому еще не было ответов (стандартный часовой лимит)
+    UNKNOWN_HEADROOM = 5000
+
+    def __init__(self, tokens: List[str], base_url: Optional[str] = None):
+        self.tokens = list(dict.fromkeys(token for token in tokens if token))
+        if not self.tokens:
+            raise ValueError("Пул токенов пуст")
+        self.base_url = resolve_api_url(base_url)
+        self._uses = {token: 0 for token in self.tokens}
+        self._lock = threading.Lock()
+
+    def choose(self, resource: str = "core") -> str:
+        """Токен с наибольшим запасом лимита для ресурса"""
+        with self._lock:
+            headroom = {}
+            for token in self.tokens:
+                value = get_rate_limiter(token).headroom(resource)
+                headroom[token] = self.UNKNOWN_HEADROOM - self._uses[token] if value is None else value
+            token = max(self.tokens, key=lambda t: (headroom[t], -self._uses[t]))
+            self._uses[token] += 1
+            return token
+
+    def ensure_pool_size(self, pool_size: int):
+        """Увеличить пулы соединений всех токенов"""
+        for token in self.tokens:
+            get_transport(token, self.base_url).ensure_pool_size(pool_size)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Использование и остаток бюджета по токенам (токены маскируются)"""
+        with self._lock:
+            uses = dict(self._uses)
+        return [
+            {
+                "token": f"{token[:4]}…{token[-4:]}" if len(token) > 12 else "…",
+                "requests": uses[token],
+                "core_remaining": get_rate_limiter(token).get_budget("core").get("remaining"),
+                "graphql_remaining": get_rate_limiter(token).get_budget("graphql").get("remaining")
+            }
+            for token in self.tokens
+        ]
+
+
+class GraphQLPagePlanner:
+    """
+    Планировщик размера страниц GraphQL пагинации
+
+    Стоимость страницы оценивается по правилам GitHub: запросы = 1 + first x
+    число вложенных connection-полей, cost = запросы / 100 (не меньше 1),
+    узлы = first x (1 + сумма first вложенных полей). Для каждого набора
+    данных выбирается наибольшая страница в пределах бюджета стоимости и
+    узлов. Если страница не уложилась по времени (502/504, таймаут), ее
+    размер уменьшается вдвое и она запрашивается заново с того же курсора;
+    после серии успешных страниц размер снова растет до запланированного.
+    """
+
+    def __init__(self, max_cost: int = GRAPHQL_PAGE_MAX_COST, max_nodes: int = GRAPHQL_PAGE_NODE_BUDGET,
+                 max_page: int = GRAPHQL_MAX_PAGE_SIZE, min_page: int = 1, grow_after: int = 3):
+        """
+        Args:
+            max_cost: Максимальная стоимость страницы в баллах rate limit
+            max_nodes: Максимальное число узлов в странице
+            max_page: Предельный размер страницы (first)
+            min_page: Минимальный размер страницы, дальше которого не уменьшать
+            grow_after: Сколько успешных страниц подряд нужно для увеличения размера
+        """
+        self.max_cost = max_cost
+        self.max_nodes = max_nodes
+        self.max_page = max_page
+        self.min_page = min_page
+        self.grow_after = grow_after
+        self._state: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def estimate(page_size: int, nested: Tuple[int, ...] = ()) -> Dict[str, int]:
+        """
+        Оценить стоимость страницы
+
+        Args:
+            page_size: Размер страницы (first)
+            nested: Значения first вложенных connection-полей каждого узла
+
+        Returns:
+            Словарь с числом запросов, стоимостью в баллах и числом узлов
+        """
+        request_count = 1 + page_size * len(nested)
+        return {
+            "requests": request_count,
+            "cost": max(1, round(request_count / 100)),
+            "nodes": page_size * (1 + sum(nested))
+        }
+
+    def plan(self, nested: Tuple[int, ...] = ()) -> int:
+        """Наибольший размер страницы, укладывающийся в бюджет стоимости и узлов"""
+        for size in range(self.max_page, self.min_page, -1):
+            estimate = self.estimate(size, nested)
+            if estimate["cost"] <= self.max_cost and estimate["nodes"] <= self.max_nodes:
+                return size
+        return self.min_page
+
+    def _get_state(self, key: str, nested: Tuple[int, ...] = ()) -> Dict[str, int]:
+        state = self._state.get(key)
+        if state is None:
+            planned = self.plan(nested)
+            state = self._state[key] = {"planned": planned, "size": planned, "streak": 0, "shrinks": 0}
+        return state
+
+    def page_size(self, key: str, nested: Tuple[int, ...] = ()) -> int:
+        """Текущий размер страницы для набора данных (при первом обращении - запланированный)"""
+        with self._lock:
+            return self._get_state(key, nested)["size"]
+
+    def record_success(self, key: str):
+        """Страница получена: после серии успехов размер удваивается до запланированного"""
+        with self._lock:
+            state = self._get_state(key)
+            state["streak"] += 1
+            if state["streak"] >= self.grow_after and state["size"] < state["planned"]:
+                state["size"] = min(state["planned"], state["size"] * 2)
+                state["streak"] = 0
+
+    def record_failure(self, key: str) -> bool:
+        """
+        Страница не уложилась по времени: уменьшить размер вдвое
+
+        Returns:
+            False, если размер уже минимальный и уменьшать некуда
+        """
+        with self._lock:
+            state = self._get_state(key)
+            state["streak"] = 0
+            if state["size"] <= self.min_page:
+                return False
+            state["size"] = max(self.min_page, state["size"] // 2)
+            state["shrinks"] += 1
+            return True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Запланированный и текущий размер страниц и число уменьшений по наборам"""
+        with self._lock:
+            return {key: dict(state) for key, state in self._state.items()}
+
+
+class GitHubTelemetry:
+    """
+    Телеметрия запросов к GitHub API
+
+    Для каждой пары (эндпоинт или имя GraphQL запроса, фаза сбора) хранит
+    количество запросов по кодам ответа, гистограмму задержек, объем
+    ответов, число повторов, время ожидания лимита и суммарную стоимость
+    GraphQL запросов в баллах rateLimit. Отчет сохраняется в JSON или в
+    текстовом формате Prometheus; print_summary() печатает таблицу.
+    """
+
+    # Верхние границы корзин гистограммы задержек (сек)
+    LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self):
+        self._series: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def record(self, endpoint: str, phase: Optional[str], status: Any, latency: float,
+               size: int = 0, retries: int = 0, wait: float = 0.0):
+        """
+        Записать выполненный запрос
+
+        Args:
+            endpoint: Шаблон REST эндпоинта ("GET /repos/{owner}/{repo}") или "graphql <ИмяЗапроса>"
+            phase: Фаза сбора (None - вне фаз)
+            status: Код ответа или "error" при сетевой ошибке
+            latency: Время запроса вместе с повторами (сек)
+            size: Размер ответа в байтах (как передан по сети)
+            retries: Количество повторов транспорта
+            wait: Ожидание ограничителя скорости перед запросом (сек)
+        """
+        with self._lock:
+            series = self._series.get((endpoint, phase or ""))
+            if series is None:
+                series = {
+                    "requests": 0, "statuses": {}, "latency_sum": 0.0,
+                    "buckets": [0] * (len(self.LATENCY_BUCKETS) + 1),
+                    "bytes": 0, "retries": 0, "wait_seconds": 0.0, "graphql_cost": 0
+                }
+                self._series[(endpoint, phase or "")] = series
+
+            series["requests"] += 1
+            series["statuses"][str(status)] = series["statuses"].get(str(status), 0) + 1
+            series["latency_sum"] += latency
+            series["buckets"][self._bucket(latency)] += 1
+            series["bytes"] += size
+            series["retries"] += retries
+            series["wait_seconds"] += wait
+
+    def record_response(self, endpoint: str, phase: Optional[str], response: Optional[requests.Response],
+                        latency: float, wait: float = 0.0):
+        """Записать запрос по ответу (None - запрос завершился сетевой ошибкой)"""
+        if response is None:
+            self.record(endpoint, phase, "error", latency, wait=wait)
+            return
+        size = response.headers.get("Content-Length")
+        self.record(endpoint, phase, response.status_code, latency,
+                    size=int(size) if size and size.isdigit() else len(response.content),
+                    retries=getattr(response, "retry_count", 0), wait=wait)
+
+    def add_graphql_cost(self, endpoint: str, phase: Optional[str], cost: int):
+        """Добавить стоимость GraphQL запроса к ряду (известна только после разбора ответа)"""
+        with self._lock:
+            series = self._series.get((endpoint, phase or ""))
+            if series is not None:
+                series["graphql_cost"] += cost
+
+    def _bucket(self, latency: float) -> int:
+        for index, bound in enumerate(self.LATENCY_BUCKETS):
+            if latency <= bound:
+                return index
+        return len(self.LATENCY_BUCKETS)
+
+    def _quantile(self, buckets: List[int], q: float) -> float:
+        """Квантиль по гистограмме (линейная интерполяция внутри корзины, как histogram_quantile)"""
+        total = sum(buckets)
+        if not total:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        lower = 0.0
+        for index, count in enumerate(buckets):
+            upper = self.LATENCY_BUCKETS[index] if index < len(self.LATENCY_BUCKETS) else self.LATENCY_BUCKETS[-1]
+            if count and cumulative + count >= rank:
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = upper
+        return self.LATENCY_BUCKETS[-1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Отчет: ряды по эндпоинтам и фазам и итоги по фазам"""
+        with self._lock:
+            series = [
+                dict(
+                    endpoint=endpoint, phase=phase,
+                    requests=data["requests"], statuses=dict(data["statuses"]),
+                    latency_seconds_sum=round(data["latency_sum"], 4),
+                    latency_p50=round(self._quantile(data["buckets"], 0.5), 4),
+                    latency_p95=round(self._quantile(data["buckets"], 0.95), 4),
+                    latency_buckets=dict(zip([str(b) for b in self.LATENCY_BUCKETS] + ["+Inf"], data["buckets"])),
+                    bytes=data["bytes"], retries=data["retries"],
+                    rate_limit_wait_seconds=round(data["wait_seconds"], 3),
+                    graphql_cost=data["graphql_cost"]
+                )
+                for (endpoint, phase), data in sorted(self._series.items())
+            ]
+
+        phases = {}
+        for item in series:
+            phase = phases.setdefault(item["phase"] or "-", {
+                "requests": 0, "latency_seconds_sum": 0.0, "bytes": 0, "retries": 0,
+                "rate_limit_wait_seconds": 0.0, "graphql_cost": 0
+            })
+            for key in phase:
+                phase[key] = round(phase[key] + item[key], 4) if isinstance(phase[key], float) else phase[key] + item[key]
+
+        return {"started_at": datetime.fromtimestamp(self.started).isoformat(), "series": series, "phases": phases}
+
+    def to_prometheus(self) -> str:
+        """Отчет в текстовом формате Prometheus (exposition format)"""
+        report = self.to_dict()["series"]
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP githabo_{name} {help_text}")
+            lines.append(f"# TYPE githabo_{name} {kind}")
+
+        def labels(item: Dict[str, Any], **extra) -> str:
+            values = dict(endpoint=item["endpoint"], phase=item["phase"], **extra)
+            escaped = {key: str(value).replace("\\", "\\\\").replace('"', '\\"') for key, value in values.items()}
+            return "{" + ",".join(f'{key}="{value}"' for key, value in escaped.items()) + "}"
+
+        metric("requests_total", "counter", "Запросы к GitHub API по коду ответа")
+        for item in report:
+            for status, count in item["statuses"].items():
+                lines.append(f"githabo_requests_total{labels(item, status=status)} {count}")
+
+        metric("request_duration_seconds", "histogram", "Задержка запросов вместе с повторами")
+        for item in report:
+            cumulative = 0
+            for bound, count in item["latency_buckets"].items():
+                cumulative += count
+                lines.append(f"githabo_request_duration_seconds_bucket{labels(item, le=bound)} {cumulative}")
+            lines.append(f"githabo_request_duration_seconds_sum{labels(item)} {item['latency_seconds_sum']}")
+            lines.append(f"githabo_request_duration_seconds_count{labels(item)} {item['requests']}")
+
+        for name, key, help_text in (
+            ("response_bytes_total", "bytes", "Объем ответов в байтах"),
+            ("retries_total", "retries", "Повторы после 5xx и сетевых ошибок"),
+            ("rate_limit_wait_seconds_total", "rate_limit_wait_seconds", "Ожидание ограничителя скорости"),
+            ("graphql_cost_total", "graphql_cost", "Стоимость GraphQL запросов в баллах rateLimit"),
+        ):
+            metric(name, "counter", help_text)
+            for item in report:
+                lines.append(f"githabo_{name}{labels(item)} {item[key]}")
+
+        return "\n".join(lines) + "\n"
+
+    def save(self, path: str):
+        """Сохранить отчет: .prom - формат Prometheus, иначе JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith(".prom"):
+                f.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"Телеметрия сохранена в {path}")
+
+    def print_summary(self, limit: int = 25):
+        """Напечатать таблицу самых затратных по времени эндпоинтов и итоги по фазам"""
+        report = self.to_dict()
+        series = sorted(report["series"], key=lambda item: item["latency_seconds_sum"], reverse=True)
+
+        print("\n📈 ПРОФИЛЬ ЗАПРОСОВ К GITHUB API:")
+        print(f"{'Эндпоинт':<44} {'Фаза':<20} {'Запр.':>6} {'p50':>7} {'p95':>7} {'Всего,с':>8} "
+              f"{'КБ':>8} {'Повт.':>5} {'Ожид.,с':>8} {'Cost':>6}")
+        for item in series[:limit]:
+            print(f"{item['endpoint'][:44]:<44} {item['phase'][:20]:<20} {item['requests']:>6} "
+                  f"{item['latency_p50']:>7.3f} {item['latency_p95']:>7.3f} {item['latency_seconds_sum']:>8.2f} "
+                  f"{item['bytes'] / 1024:>8.0f} {item['retries']:>5} {item['rate_limit_wait_seconds']:>8.1f} "
+                  f"{item['graphql_cost']:>6}")
+        if len(series) > limit:
+            print(f"... и еще {len(series) - limit} рядов (полный отчет - в JSON)")
+
+        print(f"\n{'Фаза':<24} {'Запр.':>6} {'Всего,с':>8} {'КБ':>8} {'Повт.':>5} {'Ожид.,с':>8} {'Cost':>6}")
+        for name, phase in sorted(report["phases"].items(), key=lambda item: item[1]["latency_seconds_sum"], reverse=True):
+            print(f"{name[:24]:<24} {phase['requests']:>6} {phase['latency_seconds_sum']:>8.2f} "
+                  f"{phase['bytes'] / 1024:>8.0f} {phase['retries']:>5} {phase['rate_limit_wait_seconds']:>8.1f} "
+                  f"{phase['graphql_cost']:>6}")
+
+
+def _endpoint_label(method: str, url: str, base_url: str) -> str:
+    """Шаблон REST эндпоинта для телеметрии (имена владельцев и репозиториев заменяются)"""
+    path = urlparse(url).path
+    base_path = urlparse(base_url).path.rstrip("/")
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    path = re.sub(r"^/repos/[^/]+/[^/]+", "/repos/{owner}/{repo}", path)
+    path = re.sub(r"^/user/starred/[^/]+/[^/]+", "/user/starred/{owner}/{repo}", path)
+    path = re.sub(r"^/licenses/[^/]+", "/licenses/{key}", path)
+    path = re.sub(r"/git/trees/[^/]+$", "/git/trees/{sha}", path)
+    return f"{method} {path}"
+
+
+def _graphql_operation_name(query: str) -> str:
+    """Имя GraphQL операции (query Имя(...)) для телеметрии"""
+    match = re.match(r"\s*(?:query|mutation)\s+([_A-Za-z][_0-9A-Za-z]*)", query)
+    return match.group(1) if match else "anonymous"
+
+
+def _with_rate_limit_field(query: str) -> str:
+    """
+    Добавить rateLimit { cost remaining resetAt } в GraphQL операцию, если его нет
+
+    Поле не увеличивает стоимость запроса, а его значения нужны ограничителю
+    скорости и телеметрии. Добавляется в конец первой операции документа
+    (фрагменты в этом скрипте всегда идут после нее).
+    """
+    if "rateLimit" in query:
+        return query
+    start = query.find("{")
+    if start < 0:
+        return query
+    depth = 0
+    for index in range(start, len(query)):
+        if query[index] == "{":
+            depth += 1
+        elif query[index] == "}":
+            depth -= 1
+            if depth == 0:
+                return query[:index] + "  rateLimit { cost remaining resetAt }\n" + query[index:]
+    return query
+
+
+class GitHubResponseCache:
+    """
+    Постоянный кэш ответов REST API в SQLite с условными запросами
+
+    Ответы хранятся по ключу URL + параметры + область токена вместе с
+    ETag/Last-Modified. Повторный запрос отправляется с If-None-Match /
+    If-Modified-Since, и ответ 304 (не расходует лимит) заменяется
+    сохраненным телом. Ответы без валидаторов (например, 404 при проверке
+    файлов) отдаются из кэша без запроса, но только в течение короткого
+    negative_ttl_seconds - иначе README или LICENSE, добавленные вне этого
+    скрипта, считались бы отсутствующими до истечения основного TTL.
+    """
+
+    def __init__(self, path: str = "github_cache.sqlite3", ttl_seconds: int = 7 * 24 * 3600,
+                 max_size_mb: float = 200, negative_ttl_seconds: int = 10 * 60):
+        """
+        Args:
+            path: Путь к файлу базы SQLite
+            ttl_seconds: Время жизни записи (после истечения запись удаляется)
+            max_size_mb: Максимальный размер тел ответов в кэше (вытеснение по давности использования)
+            negative_ttl_seconds: Время жизни ответов без ETag/Last-Modified (404 и т.п.)
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = min(negative_ttl_seconds, ttl_seconds)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._puts_since_evict = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT,
+                body BLOB,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_stored ON responses (stored_at)")
+        self._conn.commit()
+        self.evict()
+
+    @staticmethod
+    def make_key(url: str, params: Dict = None, scope: str = "") -> str:
+        """Ключ записи: URL, отсортированные параметры и хэш области токена"""
+        scope_hash = hashlib.sha256(scope.encode('utf-8')).hexdigest()[:16]
+        params_part = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(f"{url}|{params_part}|{scope_hash}".encode('utf-8')).hexdigest()
+
+    def fetch(self, send: Callable[[Dict[str, str]], requests.Response], url: str,
+              params: Dict = None, scope: str = "") -> requests.Response:
+        """
+        Выполнить GET через кэш
+
+        Args:
+            send: Функция, отправляющая запрос с дополнительными заголовками
+            url: URL запроса
+            params: Параметры запроса
+            scope: Область кэша (токен), чтобы ответы разных токенов не смешивались
+
+        Returns:
+            Ответ API или восстановленный из кэша ответ
+        """
+        key = self.make_key(url, params, scope)
+        entry = self._load(key)
+
+        if entry and not entry["etag"] and not entry["last_modified"]:
+            self.hits += 1
+            self._touch(key)
+            return self._to_response(entry)
+
+        conditional_headers = {}
+        if entry and entry["etag"]:
+            conditional_headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            conditional_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = send(conditional_headers)
+
+        if response.status_code == 304 and entry:
+            self.revalidated += 1
+            self._touch(key)
+            return self._to_response(entry)
+
+        self.misses += 1
+        if response.status_code in (200, 404):
+            self._store(key, url, response)
+        return response
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Прочитать неистекшую запись"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, etag, last_modified, headers, body, stored_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if not row:
+            return None
+        ttl = self.ttl_seconds if row[2] or row[3] else self.negative_ttl_seconds
+        if row[6] < time.time() - ttl:
+            return None
+        return {
+            "url": row[0],
+            "status": row[1],
+            "etag": row[2],
+            "last_modified": row[3],
+            "headers": json.loads(row[4] or "{}"),
+            "body": row[5]
+        }
+
+    def _store(self, key: str, url: str, response: requests.Response):
+        """Сохранить ответ"""
+        now = time.time()
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() in ("content-type", "etag", "last-modified", "link")}
+        body = response.content
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, status, etag, last_modified, headers, body, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, response.status_code, response.headers.get("ETag"),
+                 response.headers.get("Last-Modified"), json.dumps(headers), body, len(body), now, now)
+            )
+            self._conn.commit()
+            self._puts_since_evict += 1
+            evict_now = self._puts_since_evict >= 100
+        if evict_now:
+            self.evict()
+
+    def _touch(self, key: str):
+        """Обновить время последнего использования записи"""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+    @staticmethod
+    def _to_response(entry: Dict[str, Any]) -> requests.Response:
+        """Восстановить объект requests.Response из записи кэша"""
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response._content = entry["body"] or b""
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.headers["X-Githabo-Cache"] = "hit"
+        response.url = entry["url"]
+        response.encoding = "utf-8"
+        return response
+
+    def evict(self):
+        """Удалить истекшие записи и старые записи сверх лимита размера"""
+        with self._lock:
+            self._puts_since_evict = 0
+            self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl_seconds,))
+            total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total_size > self.max_size_bytes:
+                freed = 0
+                to_delete = []
+                for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC"):
+                    to_delete.append((key,))
+                    freed += size
+                    if total_size - freed <= self.max_size_bytes:
+                        break
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", to_delete)
+            self._conn.commit()
+
+    def invalidate(self, url: str, params: Dict = None, scope: str = ""):
+        """Удалить запись (например, после изменения ресурса через API)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (self.make_key(url, params, scope),))
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Статистика использования кэша за текущий запуск"""
+        return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
+
+
+class GitHubCollectionCheckpoint:
+    """
+    Контрольные точки сбора данных для продолжения прерванного запуска
+
+    В каталоге хранятся state.json (курсоры и количество сохраненных страниц
+    по каждой пагинации, завершенные фазы) и файлы с данными: страницы
+    пагинации дописываются построчно в JSONL, результаты фаз - в JSON.
+    state.json перезаписывается атомарно после каждой страницы, поэтому
+    прерывание в любой момент оставляет согласованное состояние.
+    """
+
+    def __init__(self, path: str = "github_checkpoint", username: str = None, resume: bool = False):
+        """
+        Args:
+            path: Каталог контрольной точки
+            username: Пользователь, для которого собираются данные
+            resume: Продолжить с сохраненного состояния (False = начать заново)
+        """
+        self.path = path
+        self.username = username
+        self._lock = threading.Lock()
+
+        state = self._load_state() if resume else None
+        if state and state.get("username") == username:
+            self.state = state
+            print(f"Продолжаем с контрольной точки {path}: "
+                  f"{len(state['connections'])} пагинаций, {len(state['phases'])} завершенных фаз")
+        else:
+            if resume:
+                print(f"Контрольная точка для {username} не найдена - начинаем сбор заново")
+            self.clear()
+            self.state = {"username": username, "connections": {}, "phases": {}}
+
+        os.makedirs(path, exist_ok=True)
+        self._save_state()
+
+    def _state_file(self) -> str:
+        return os.path.join(self.path, "state.json")
+
+    def _data_file(self, kind: str, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        extension = "jsonl" if kind == "connection" else "json"
+        return os.path.join(self.path, f"{kind}_{digest}.{extension}")
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._state_file(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_atomic(self, filename: str, data: Any):
+        """Записать JSON во временный файл и заменить им целевой"""
+        tmp_filename = filename + ".tmp"
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, default=_json_default)
+        os.replace(tmp_filename, filename)
+
+    def _save_state(self):
+        self._write_atomic(self._state_file(), self.state)
+
+    def load_connection(self, key: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Загрузить сохраненные страницы пагинации
+
+        Returns:
+            Кортеж (записи всех сохраненных страниц, состояние: cursor, pages, done, total_count)
+        """
+        with self._lock:
+            entry = self.state["connections"].get(key)
+            if not entry:
+                return [], {}
+
+            with open(self._data_file("connection", key), 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+
+            # Страница, дописанная перед прерыванием, но не учтенная в state.json, отбрасывается
+            lines = lines[:entry["pages"]]
+            with open(self._data_file("connection", key), 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+
+            items = [item for line in lines for item in json.loads(line)]
+            return items, dict(entry)
+
+    def save_page(self, key: str, nodes: List[Dict[str, Any]], cursor: Optional[str],
+                  total_count: Optional[int] = None):
+        """Дописать страницу и курсор для ее продолжения"""
+        with self._lock:
+            entry = self.state["connections"].get(key)
+            mode = 'a' if entry else 'w'
+            if not entry:
+                entry = self.state["connections"][key] = {"pages": 0, "cursor": None, "done": False}
+
+            with open(self._data_file("connection", key), mode, encoding='utf-8') as f:
+                f.write(json.dumps(nodes, ensure_ascii=False) + "\n")
+
+            entry.update(pages=entry["pages"] + 1, cursor=cursor, total_count=total_count)
+            self._save_state()
+
+    def finish_connection(self, key: str):
+        """Отметить пагинацию как полностью полученную"""
+        with self._lock:
+            entry = self.state["connections"].setdefault(key, {"pages": 0, "cursor": None})
+            if entry["pages"] == 0:
+                open(self._data_file("connection", key), 'w', encoding='utf-8').close()
+            entry["done"] = True
+            self._save_state()
+
+    def load_phase(self, name: str) -> Tuple[bool, Any]:
+        """Получить результат завершенной фазы: (найден, результат)"""
+        with self._lock:
+            if name not in self.state["phases"]:
+                return False, None
+            with open(self._data_file("phase", name), 'r', encoding='utf-8') as f:
+                return True, json.load(f)
+
+    def save_phase(self, name: str, result: Any):
+        """Сохранить результат завершенной фазы"""
+        with self._lock:
+            self._write_atomic(self._data_file("phase", name), result)
+            self.state["phases"][name] = True
+            self._save_state()
+
+    def clear(self):
+        """Удалить контрольную точку (после успешного завершения сбора)"""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class StarOperationJournal:
+    """
+    Журнал массовой операции со звездами (append-only JSONL)
+
+    Первая строка - заголовок операции (тип, файл резервной копии, время
+    начала), далее по строке на каждый завершенный репозиторий. Строка
+    дописывается и сбрасывается на диск сразу после ответа API, поэтому
+    после прерывания операция продолжается ровно с незавершенных
+    репозиториев. Оборванная последняя строка (сбой во время записи) при
+    чтении пропускается.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.header: Optional[Dict[str, Any]] = None
+        self.completed: Dict[str, str] = {}
+        self._file = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if "operation" in entry:
+                        self.header = entry
+                    elif "repo" in entry:
+                        self.completed[entry["repo"]] = entry.get("status", "done")
+        except OSError:
+            pass
+
+    def matches(self, operation: str, backup_file: str = None) -> bool:
+        """Журнал относится к этой операции (и к этому файлу резервной копии, если он указан)"""
+        if not self.header or self.header.get("operation") != operation:
+            return False
+        return backup_file is None or self.header.get("backup_file") == backup_file
+
+    def start(self, operation: str, backup_file: str, total: int):
+        """Начать новый журнал (старый перезаписывается)"""
+        with self._lock:
+            self.close()
+            self.header = {"operation": operation, "backup_file": backup_file, "total": total,
+                           "started_at": datetime.now().isoformat()}
+            self.completed = {}
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(self.header, ensure_ascii=False) + "\n")
+
+    def record(self, repo: str, status: str):
+        """Дописать завершенный репозиторий (status: done - выполнено, not_found - репозитория/звезды нет)"""
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(json.dumps({"repo": repo, "status": status}, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.completed[repo] = status
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Удалить журнал (операция завершена без ошибок)"""
+        with self._lock:
+            self.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class NDJSONDataset:
+    """
+    Набор записей в NDJSON файле (одна JSON запись на строку)
+
+    Записи дописываются постранично через extend и читаются лениво при
+    итерации, поэтому в памяти не держится весь набор. Поддерживает len()
+    и многократную итерацию, чего достаточно для анализа и CSV экспорта.
+    """
+
+    def __init__(self, path: str, truncate: bool = True):
+        """
+        Args:
+            path: Путь к NDJSON файлу
+            truncate: Начать набор заново (False = открыть существующий файл для чтения и дописывания)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._count = 0
+
+        if truncate or not os.path.exists(path):
+            open(path, 'w', encoding='utf-8').close()
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._count = sum(1 for line in f if line.strip())
+
+    def extend(self, records: List[Dict[str, Any]]):
+        """Дописать записи в конец файла"""
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n")
+                    self._count += 1
+
+    def append(self, record: Dict[str, Any]):
+        self.extend([record])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def map(self, func: Callable[[Dict[str, Any]], Any]) -> "NDJSONDatasetView":
+        """Ленивое представление записей, преобразованных функцией func"""
+        return NDJSONDatasetView(self, func)
+
+    def to_reference(self) -> Dict[str, Any]:
+        """Ссылка на файл для записи в github_data.json вместо самих данных"""
+        return {"ndjson": self.path, "count": self._count}
+
+
+class NDJSONDatasetView:
+    """
+    Ленивое преобразование записей NDJSONDataset или списка (пересчитывается при каждой итерации)
+
+    В github_data.json представление над NDJSONDataset записывается ссылкой
+    на файл, а над списком - полным списком преобразованных записей.
+    """
+
+    def __init__(self, dataset: Any, func: Callable[[Dict[str, Any]], Any]):
+        self.dataset = dataset
+        self.func = func
+
+    def __len__(self) -> int:
+        return len(self.dataset)
+
+    def __iter__(self):
+        for record in self.dataset:
+            yield self.func(record)
+
+    def to_reference(self) -> Any:
+        if not isinstance(self.dataset, NDJSONDataset):
+            return list(self)
+        return {"derived_from": self.dataset.path, "count": len(self.dataset)}
+
+
+class GitHubStreamSink:
+    """
+    Потоковая запись крупных наборов данных в NDJSON файлы по мере получения страниц
+
+    Файлы называются github_<набор>.ndjson и создаются заново для каждого запуска.
+    """
+
+    def __init__(self, directory: str = "."):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def dataset(self, name: str) -> NDJSONDataset:
+        """Создать (очистить) файл набора данных"""
+        return NDJSONDataset(os.path.normpath(os.path.join(self.directory, f"github_{name}.ndjson")))
+
+
+def _json_default(value: Any) -> Any:
+    """Сериализация потоковых наборов данных в github_data.json в виде ссылок на файлы"""
+    if isinstance(value, (NDJSONDataset, NDJSONDatasetView)):
+        return value.to_reference()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def open_output_file(filename: str, mode: str = 'w'):
+    """
+    Открыть текстовый файл с учетом сжатия по расширению
+
+    .gz - gzip (уровень 6: в 5 раз быстрее уровня 9 при файле на ~12%
+    больше), .zst - zstandard (нужен пакет zstandard), иначе - обычный
+    файл. Для записи используется newline='' (как требует модуль csv).
+    """
+    newline = '' if 'w' in mode else None
+    if filename.endswith(".gz"):
+        return gzip.open(filename, mode + 't', compresslevel=6, encoding='utf-8', newline=newline)
+    if filename.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Для сжатия zstd установите zstandard: pip install zstandard")
+        raw = open(filename, mode + 'b')
+        if 'w' in mode:
+            stream = zstandard.ZstdCompressor().stream_writer(raw)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw)
+        return io.TextIOWrapper(stream, encoding='utf-8', newline=newline)
+    return open(filename, mode, encoding='utf-8', newline=newline)
+
+
+def _flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Запись с вложенными объектами и списками в виде JSON строк (для табличных форматов)"""
+    return {
+        key: json.dumps(value, ensure_ascii=False, default=_json_default) if isinstance(value, (dict, list)) else value
+        for key, value in record.items()
+    }
+
+
+# Диапазоны распределения звезд: верхняя граница (None = без границы) -> название
+STARS_DISTRIBUTION_RANGES = (
+    (0, "0 звезд"),
+    (5, "1-5 звезд"),
+    (10, "6-10 звезд"),
+    (25, "11-25 звезд"),
+    (50, "26-50 звезд"),
+    (100, "51-100 звезд"),
+    (500, "101-500 звезд"),
+    (None, "501+ звезд"),
+)
+
+
+def summarize_repositories(repositories: Any) -> Dict[str, Any]:
+    """
+    Итоги по репозиториям одним проходом
+
+    Общие для summary в github_data.json, github_repos_stars_sorted.csv и
+    github_stars_distribution.csv, чтобы каждый вывод не обходил набор заново.
+    """
+    summary = {
+        "count": 0, "total_stars": 0, "total_forks": 0, "total_disk_usage": 0, "top_repo": None,
+        "languages": {}, "star_ranges": {name: 0 for _, name in STARS_DISTRIBUTION_RANGES}
+    }
+    for repo in repositories:
+        stars = repo.get('stargazerCount', 0)
+        summary["count"] += 1
+        summary["total_stars"] += stars
+        summary["total_forks"] += repo.get('forkCount', 0)
+        summary["total_disk_usage"] += repo.get('diskUsage') or 0
+        if summary["top_repo"] is None:
+            summary["top_repo"] = repo
+
+        lang = repo.get('primaryLanguage', {}).get('name', 'Unknown') if repo.get('primaryLanguage') else 'Unknown'
+        summary["languages"][lang] = summary["languages"].get(lang, 0) + 1
+
+        for bound, name in STARS_DISTRIBUTION_RANGES:
+            if bound is None or stars <= bound:
+                summary["star_ranges"][name] += 1
+                break
+    return summary
+
+
+class GitHubDataExporter:
+    """
+    Запись результатов сбора в файлы
+
+    Каждый вывод (github_data.json и CSV отчеты) - отдельная цель; невыбранные
+    цели не формируются вовсе. Общие итоги (summarize) считаются одним
+    проходом и передаются всем выводам. Цели пишутся по очереди: форматирование
+    JSON и CSV упирается в GIL, и пул потоков запись не ускоряет. Файлы можно
+    сжимать (gzip или zstd - к имени добавляется .gz или .zst), JSON писать без
+    отступов, а табличные наборы дополнительно выгружать в
+    github_<набор>.parquet (нужен pyarrow).
+    """
+
+    # Цели по порядку: имя -> файл
+    TARGETS = {
+        "json": "github_data.json",
+        "profile": "github_profile_growth.csv",
+        "languages": "github_languages.csv",
+        "top_repos": "github_top_repos.csv",
+        "activity_trends": "github_activity_trends.csv",
+        "starred": "github_starred_analysis.csv",
+        "forks": "github_forks.csv",
+        "repos_stars": "github_repos_stars_sorted.csv",
+        "stars_distribution": "github_stars_distribution.csv",
+        "analytics": "github_top_repos_detailed_analytics.csv",
+        "forks_of_user_repos": "github_forks_of_user_repos.csv",
+        "issues": "github_issues.csv",
+        "quality": "github_quality_analysis.csv",
+    }
+
+    # Табличные наборы для Parquet (ключи datasets)
+    PARQUET_DATASETS = ("forks", "user_repos", "repos_stars_sorted", "all_repos_analytics",
+                        "forks_of_user_repos", "issues")
+
+    COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+    # Строк в одной пачке записи Parquet
+    PARQUET_BATCH_SIZE = 5000
+
+    def __init__(self, outputs: List[str] = None, compression: Optional[str] = None,
+                 compact_json: bool = False, parquet: bool = False):
+        """
+        Args:
+            outputs: Имена целей из TARGETS (None = все)
+            compression: None, "gzip" или "zstd"
+            compact_json: Писать github_data.json без отступов
+            parquet: Дополнительно выгрузить табличные наборы в Parquet
+        """
+        unknown = [name for name in outputs or [] if name not in self.TARGETS]
+        if unknown:
+            raise ValueError(f"Неизвестные выводы: {', '.join(unknown)} (доступны: {', '.join(self.TARGETS)})")
+        if compression not in self.COMPRESSION_SUFFIXES:
+            raise ValueError(f"Неизвестное сжатие: {compression} (доступно: gzip, zstd)")
+        if compression == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                raise ImportError("Для сжатия zstd установите zstandard: pip install zstandard")
+
+        self.outputs = [name for name in self.TARGETS if outputs is None or name in outputs]
+        self.compression = compression
+        self.compact_json = compact_json
+        self.parquet = parquet
+
+    def filename(self, target: str) -> str:
+        """Имя файла цели с учетом сжатия"""
+        return self.TARGETS[target] + self.COMPRESSION_SUFFIXES[self.compression]
+
+    @staticmethod
+    def summarize(datasets: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Общие итоги для всех выводов: один проход по репозиториям и по issues
+
+        Returns:
+            {"repositories": summarize_repositories(...), "issues": {"count", "states"}}
+        """
+        issue_states = {}
+        issues_count = 0
+        for issue in datasets["issues"]:
+            issues_count += 1
+            issue_states[issue.get('state')] = issue_states.get(issue.get('state'), 0) + 1
+        return {
+            "repositories": summarize_repositories(datasets["repos_stars_sorted"]),
+            "issues": {"count": issues_count, "states": issue_states}
+        }
+
+    def export(self, collector: "GitHubDataCollector", data: Dict[str, Any],
+               datasets: Dict[str, Any], summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Записать выбранные выводы
+
+        Args:
+            collector: Коллектор (методы save_* и каталог вывода)
+            data: Содержимое github_data.json
+            datasets: Собранные наборы данных
+            summary: Итоги summarize() (None = посчитать здесь)
+
+        Returns:
+            {"written": [пути], "errors": [...]}
+        """
+        profile_stats = datasets["profile_stats"]
+        repositories_summary = (summary or self.summarize(datasets))["repositories"]
+        writers = {
+            "json": lambda path: collector.save_to_json(data, path, compact=self.compact_json),
+            "profile": lambda path: collector.save_profile_stats_to_csv(profile_stats, path),
+            "languages": lambda path: collector.save_languages_to_csv(profile_stats.get("languages", {}), path),
+            "top_repos": lambda path: collector.save_top_repos_to_csv(profile_stats.get("top_repositories", []), path),
+            "activity_trends": lambda path: collector.save_activity_trends_to_csv(
+                profile_stats.get("activity_trends", {}), path),
+            "starred": lambda path: collector.save_starred_analysis_to_csv(datasets["starred_analysis"], path),
+            "forks": lambda path: collector.save_forks_to_csv(datasets["forks"], path),
+            "repos_stars": lambda path: collector.save_repositories_stars_to_csv(
+                datasets["repos_stars_sorted"], path, summary=repositories_summary),
+            "stars_distribution": lambda path: collector.save_stars_distribution_to_csv(
+                datasets["repos_stars_sorted"], path, summary=repositories_summary),
+            "analytics": lambda path: collector.save_repository_analytics_to_csv(datasets["all_repos_analytics"], path),
+            "forks_of_user_repos": lambda path: collector.save_forks_of_user_repos_to_csv(
+                datasets["forks_of_user_repos"], path),
+            "issues": lambda path: collector.save_issues_to_csv(datasets["issues"], path),
+            "quality": lambda path: collector.save_quality_analysis_to_csv(datasets["quality_analysis"], path),
+        }
+        jobs = [(collector._output_path(self.filename(name)), writers[name]) for name in self.outputs]
+
+        if self.parquet:
+            try:
+                import pyarrow  # noqa: F401
+                for name in self.PARQUET_DATASETS:
+                    jobs.append((collector._output_path(f"github_{name}.parquet"),
+                                 lambda path, records=datasets[name]: self.write_parquet(records, path)))
+            except ImportError:
+                print("Для выгрузки в Parquet установите pyarrow: pip install pyarrow")
+
+        written = []
+        errors = []
+        for path, writer in jobs:
+            try:
+                writer(path)
+                written.append(path)
+            except Exception as e:
+                errors.append(f"{path}: {e}")
+                print(f"❌ Ошибка записи {path}: {e}")
+
+        return {"written": sorted(written), "errors": errors}
+
+    def write_parquet(self, records: Any, path: str) -> int:
+        """
+        Записать набор записей в Parquet
+
+        Первый проход по записям определяет типы столбцов (числа и логические
+        значения сохраняют тип, остальное - строки, вложенные объекты - JSON),
+        второй пишет пачками по PARQUET_BATCH_SIZE строк.
+
+        Returns:
+            Количество записанных строк
+        """
+        import pyarrow
+        import pyarrow.parquet
+
+        if isinstance(records, dict):
+            # Набор не собран (словарь с ошибкой)
+            return 0
+
+        kinds: Dict[str, Set[type]] = {}
+        for record in records:
+            for key, value in _flatten_record(record).items():
+                column = kinds.setdefault(key, set())
+                if value is not None:
+                    column.add(type(value))
+
+        def arrow_type(column: Set[type]):
+            if column == {bool}:
+                return pyarrow.bool_()
+            if column == {int}:
+                return pyarrow.int64()
+            if column and column <= {int, float}:
+                return pyarrow.float64()
+            return pyarrow.string()
+
+        schema = pyarrow.schema([(key, arrow_type(column)) for key, column in kinds.items()])
+        as_string = {key for key, column in kinds.items() if arrow_type(column) == pyarrow.string()}
+
+        def row(record: Dict[str, Any]) -> Dict[str, Any]:
+            flat = _flatten_record(record)
+            return {
+                key: (str(flat[key]) if key in as_string and flat.get(key) is not None else flat.get(key))
+                for key in kinds
+            }
+
+        count = 0
+        with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+            batch = []
+            for record in records:
+                batch.append(row(record))
+                if len(batch) >= self.PARQUET_BATCH_SIZE:
+                    writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+                    count += len(batch)
+                    batch = []
+            if batch or not count:
+                writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+        print(f"Parquet: {count} строк -> {path}")
+        return count
+
+
+class GitHubDataWarehouse:
+    """
+    Локальное хранилище собранных данных в SQLite с индексами
+
+    Таблицы repositories, languages, forks, issues, stars и contribution_days
+    обновляются по мере завершения фаз сбора (upsert по естественному ключу:
+    nameWithOwner, url, дата). Записи, которых нет в новом полном наборе
+    (удаленные репозитории, снятые звезды), удаляются - кроме форков
+    репозиториев, запрос которых завершился ошибкой; дни активности
+    накапливаются между запусками. Отчеты выполняются индексированными
+    SQL запросами без загрузки github_data.json, таблицы можно выгрузить в
+    Parquet (нужен pyarrow).
+    """
+
+    SCHEMA = {
+        "repositories": """
+            name_with_owner TEXT PRIMARY KEY,
+            name TEXT,
+            url TEXT,
+            description TEXT,
+            primary_language TEXT,
+            stargazer_count INTEGER,
+            fork_count INTEGER,
+            disk_usage INTEGER,
+            is_archived INTEGER,
+            is_fork INTEGER,
+            license TEXT,
+            topics TEXT,
+            created_at TEXT,
+            updated_at TEXT,
+            pushed_at TEXT,
+            seen_at REAL
+        """,
+        "languages": """
+            repository TEXT NOT NULL,
+            language TEXT NOT NULL,
+            size INTEGER,
+            seen_at REAL,
+            PRIMARY KEY (repository, language)
+        """,
+        "forks": """
+            name_with_owner TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            parent TEXT,
+            owner_login TEXT,
+            url TEXT,
+            description TEXT,
+            primary_language TEXT,
+            stargazer_count INTEGER,
+            fork_count INTEGER,
+            created_at TEXT,
+            pushed_at TEXT,
+            updated_at TEXT,
+            seen_at REAL
+        """,
+        "issues": """
+            url TEXT PRIMARY KEY,
+            repository TEXT,
+            title TEXT,
+            state TEXT,
+            comments INTEGER,
+            labels TEXT,
+            created_at TEXT,
+            closed_at TEXT,
+            updated_at TEXT,
+            seen_at REAL
+        """,
+        "stars": """
+            name_with_owner TEXT PRIMARY KEY,
+            starred_at TEXT,
+            owner_login TEXT,
+            owner_type TEXT,
+            description TEXT,
+            primary_language TEXT,
+            stargazer_count INTEGER,
+            fork_count INTEGER,
+            topics TEXT,
+            created_at TEXT,
+            updated_at TEXT,
+            seen_at REAL
+        """,
+        "contribution_days": """
+            date TEXT PRIMARY KEY,
+            contribution_count INTEGER,
+            seen_at REAL
+        """
+    }
+
+    INDEXES = (
+        "CREATE INDEX IF NOT EXISTS idx_repositories_stars ON repositories (stargazer_count DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_repositories_language ON repositories (primary_language)",
+        "CREATE INDEX IF NOT EXISTS idx_languages_language ON languages (language, size)",
+        "CREATE INDEX IF NOT EXISTS idx_forks_parent ON forks (kind, parent)",
+        "CREATE INDEX IF NOT EXISTS idx_forks_created ON forks (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_issues_state ON issues (state)",
+        "CREATE INDEX IF NOT EXISTS idx_issues_repository ON issues (repository)",
+        "CREATE INDEX IF NOT EXISTS idx_issues_created ON issues (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_stars_starred ON stars (starred_at)",
+        "CREATE INDEX IF NOT EXISTS idx_stars_language ON stars (primary_language)",
+    )
+
+    # Какие таблицы заполняются из каких наборов данных collect_all_data
+    DATASETS = ("profile_stats", "forks", "user_repos", "starred_analysis", "forks_of_user_repos", "issues")
+
+    # Размер пачки строк при записи и выгрузке (ограничивает расход памяти)
+    BATCH_SIZE = 1000
+
+    def __init__(self, path: str = "github_warehouse.sqlite3"):
+        """
+        Args:
+            path: Путь к файлу базы SQLite
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for table, columns in self.SCHEMA.items():
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+        for statement in self.INDEXES:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _columns(self, table: str) -> List[str]:
+        return [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+
+    def _upsert(self, table: str, rows, key: Tuple[str, ...], seen_at: float) -> int:
+        """Вставить или обновить строки пачками (строки - кортежи в порядке столбцов без seen_at)"""
+        columns = self._columns(table)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column not in key)
+        statement = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                     f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates}")
+        count = 0
+        batch = []
+        for row in rows:
+            batch.append(tuple(row) + (seen_at,))
+            if len(batch) >= self.BATCH_SIZE:
+                self._conn.executemany(statement, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._conn.executemany(statement, batch)
+            count += len(batch)
+        return count
+
+    def _prune(self, table: str, seen_at: float, where: str = "", params: Tuple = ()) -> int:
+        """Удалить строки, не обновленные в текущей записи набора"""
+        condition = f"seen_at < ?{' AND ' + where if where else ''}"
+        return self._conn.execute(f"DELETE FROM {table} WHERE {condition}", (seen_at,) + params).rowcount
+
+    @staticmethod
+    def _nested_name(value: Optional[Dict[str, Any]]) -> Optional[str]:
+        return value.get("name") if value else None
+
+    @staticmethod
+    def _topics(repo: Dict[str, Any]) -> str:
+        nodes = (repo.get("repositoryTopics") or {}).get("nodes") or []
+        return json.dumps([node["topic"]["name"] for node in nodes], ensure_ascii=False)
+
+    def store_dataset(self, name: str, data: Any, keep_parents: Optional[Set[str]] = None) -> Dict[str, int]:
+        """
+        Записать набор данных collect_all_data в соответствующие таблицы
+
+        Args:
+            name: Имя набора ("user_repos", "forks", "issues", ...)
+            data: Полный набор (список, NDJSONDataset или словарь фазы)
+            keep_parents: Репозитории, форки которых получены не полностью - их
+                ранее сохраненные форки не удаляются
+
+        Returns:
+            Количество записанных строк по таблицам (пусто для наборов без таблицы)
+        """
+        if name not in self.DATASETS or not data:
+            return {}
+
+        seen_at = time.time()
+        stored = {}
+        with self._lock:
+            if name == "user_repos":
+                stored["repositories"] = self._upsert("repositories", (
+                    (repo.get("nameWithOwner"), repo.get("name"), repo.get("url"), repo.get("description"),
+                     self._nested_name(repo.get("primaryLanguage")), repo.get("stargazerCount", 0), repo.get("forkCount", 0),
+                     repo.get("diskUsage"), int(bool(repo.get("isArchived"))), int(bool(repo.get("isFork"))),
+                     self._nested_name(repo.get("licenseInfo")), self._topics(repo),
+                     repo.get("createdAt"), repo.get("updatedAt"), repo.get("pushedAt"))
+                    for repo in data if repo.get("nameWithOwner")
+                ), ("name_with_owner",), seen_at)
+                self._prune("repositories", seen_at)
+                stored["languages"] = self._upsert("languages", (
+                    (repo["nameWithOwner"], edge["node"]["name"], edge.get("size", 0))
+                    for repo in data if repo.get("nameWithOwner")
+                    for edge in (repo.get("languages") or {}).get("edges") or []
+                ), ("repository", "language"), seen_at)
+                self._prune("languages", seen_at)
+
+            elif name in ("forks", "forks_of_user_repos"):
+                kind = "fork" if name == "forks" else "fork_of_repo"
+                stored["forks"] = self._upsert("forks", (
+                    (fork.get("nameWithOwner"), kind,
+                     (fork.get("parent") or {}).get("nameWithOwner") if kind == "fork" else fork.get("_original_repo"),
+                     (fork.get("owner") or {}).get("login") or fork.get("nameWithOwner", "").split("/")[0],
+                     fork.get("url"), fork.get("description"), self._nested_name(fork.get("primaryLanguage")),
+                     fork.get("stargazerCount", 0), fork.get("forkCount", 0),
+                     fork.get("createdAt"), fork.get("pushedAt"), fork.get("updatedAt"))
+                    for fork in data if fork.get("nameWithOwner")
+                ), ("name_with_owner",), seen_at)
+                keep_parents = sorted(keep_parents or ())
+                if keep_parents:
+                    print(f"Хранилище: форки {len(keep_parents)} репозиториев получены не полностью - "
+                          f"старые записи по ним сохранены")
+                self._prune("forks", seen_at, "kind = ?" + (
+                    f" AND (parent IS NULL OR parent NOT IN ({', '.join('?' * len(keep_parents))}))"
+                    if keep_parents else ""
+                ), (kind,) + tuple(keep_parents))
+
+            elif name == "issues":
+                stored["issues"] = self._upsert("issues", (
+                    (issue.get("url"), (issue.get("repository") or {}).get("nameWithOwner"), issue.get("title"),
+                     issue.get("state"), (issue.get("comments") or {}).get("totalCount", 0),
+                     json.dumps([label.get("name") for label in (issue.get("labels") or {}).get("nodes") or []],
+                                ensure_ascii=False),
+                     issue.get("createdAt"), issue.get("closedAt"), issue.get("updatedAt"))
+                    for issue in data if issue.get("url")
+                ), ("url",), seen_at)
+                self._prune("issues", seen_at)
+
+            elif name == "starred_analysis":
+                starred = data.get("starred_repositories") or []
+                stored["stars"] = self._upsert("stars", (
+                    (repo.get("nameWithOwner"), repo.get("starredAt"), (repo.get("owner") or {}).get("login"),
+                     (repo.get("owner") or {}).get("__typename"), repo.get("description"),
+                     self._nested_name(repo.get("primaryLanguage")), repo.get("stargazerCount", 0), repo.get("forkCount", 0),
+                     self._topics(repo), repo.get("createdAt"), repo.get("updatedAt"))
+                    for repo in starred if repo.get("nameWithOwner")
+                ), ("name_with_owner",), seen_at)
+                self._prune("stars", seen_at)
+
+            elif name == "profile_stats":
+                # Дни активности накапливаются: старые годы не удаляются
+                calendar = ContributionCalendar.from_dict(data.get("contribution_days"))
+                stored["contribution_days"] = self._upsert("contribution_days", (
+                    (day["date"], day["count"]) for day in calendar.to_days()
+                ), ("date",), seen_at)
+
+            self._conn.commit()
+        return stored
+
+    def query(self, sql: str, params: Tuple = ()):
+        """
+        Выполнить запрос и отдавать строки (словари столбец -> значение) по мере чтения
+
+        Запрос выполняется на отдельном соединении (WAL допускает чтение во
+        время записи), строки читаются пачками по BATCH_SIZE.
+        """
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(self.BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(columns, row))
+        finally:
+            conn.close()
+
+    def top_repositories(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Репозитории с наибольшим количеством звезд"""
+        return list(self.query(
+            "SELECT name_with_owner, stargazer_count, fork_count, primary_language FROM repositories "
+            "ORDER BY stargazer_count DESC LIMIT ?", (limit,)
+        ))
+
+    def language_totals(self) -> List[Dict[str, Any]]:
+        """Объем кода по языкам во всех собственных репозиториях"""
+        return list(self.query(
+            "SELECT language, SUM(size) AS bytes, COUNT(*) AS repositories FROM languages "
+            "GROUP BY language ORDER BY bytes DESC"
+        ))
+
+    def forks_per_repository(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Собственные репозитории с наибольшим числом сохраненных форков"""
+        return list(self.query(
+            "SELECT parent AS repository, COUNT(*) AS forks FROM forks WHERE kind = 'fork_of_repo' "
+            "GROUP BY parent ORDER BY forks DESC LIMIT ?", (limit,)
+        ))
+
+    def issues_by_state(self) -> Dict[str, int]:
+        """Количество issues по состояниям"""
+        return {row["state"]: row["count"] for row in self.query(
+            "SELECT state, COUNT(*) AS count FROM issues GROUP BY state"
+        )}
+
+    def stars_by_language(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Языки starred репозиториев"""
+        return list(self.query(
+            "SELECT COALESCE(primary_language, 'Unknown') AS language, COUNT(*) AS stars FROM stars "
+            "GROUP BY primary_language ORDER BY stars DESC LIMIT ?", (limit,)
+        ))
+
+    def stars_since(self, since: str) -> int:
+        """Сколько звезд поставлено после даты (ISO 8601)"""
+        return next(self.query("SELECT COUNT(*) AS count FROM stars WHERE starred_at > ?", (since,)))["count"]
+
+    def contributions_by_month(self, since: str = "") -> List[Dict[str, Any]]:
+        """Активность по месяцам (YYYY-MM) начиная с даты"""
+        return list(self.query(
+            "SELECT substr(date, 1, 7) AS month, SUM(contribution_count) AS contributions FROM contribution_days "
+            "WHERE date >= ? GROUP BY month ORDER BY month", (since,)
+        ))
+
+    def summary(self) -> Dict[str, int]:
+        """Количество строк в каждой таблице"""
+        with self._lock:
+            return {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in self.SCHEMA}
+
+    def print_report(self, limit: int = 10):
+        """Напечатать отчеты по данным хранилища"""
+        print(f"\n🗄️ ХРАНИЛИЩЕ {self.path}:")
+        for table, count in self.summary().items():
+            print(f"  {table}: {count}")
+
+        print("\n⭐ Топ репозиториев по звездам:")
+        for row in self.top_repositories(limit):
+            print(f"  {row['name_with_owner']}: {row['stargazer_count']} звезд, {row['fork_count']} форков "
+                  f"({row['primary_language'] or '-'})")
+
+        print("\n💻 Языки (байт кода):")
+        for row in self.language_totals()[:limit]:
+            print(f"  {row['language']}: {row['bytes']} в {row['repositories']} репозиториях")
+
+        print("\n🍴 Больше всего форков:")
+        for row in self.forks_per_repository(limit):
+            print(f"  {row['repository']}: {row['forks']}")
+
+        print(f"\n📋 Issues по состояниям: {self.issues_by_state()}")
+
+        print("\n🌟 Starred репозитории по языкам:")
+        for row in self.stars_by_language(limit):
+            print(f"  {row['language']}: {row['stars']}")
+
+        since = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+        print("\n📅 Активность по месяцам за год:")
+        for row in self.contributions_by_month(since):
+            print(f"  {row['month']}: {row['contributions']}")
+
+    def export_parquet(self, directory: str = "github_parquet", tables: List[str] = None) -> Dict[str, Any]:
+        """
+        Выгрузить таблицы в Parquet файлы <directory>/<таблица>.parquet
+
+        Строки читаются и пишутся пачками по BATCH_SIZE, типы столбцов берутся
+        из схемы SQLite. Требует pyarrow (pip install pyarrow).
+
+        Returns:
+            Количество выгруженных строк по таблицам или {"error": ...}
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            print("Для выгрузки в Parquet установите pyarrow: pip install pyarrow")
+            return {"error": "pyarrow не установлен"}
+
+        os.makedirs(directory, exist_ok=True)
+        types = {"INTEGER": pyarrow.int64(), "REAL": pyarrow.float64()}
+        exported = {}
+
+        with self._lock:
+            for table in tables or list(self.SCHEMA):
+                columns = [(row[1], row[2]) for row in self._conn.execute(f"PRAGMA table_info({table})")]
+                schema = pyarrow.schema([(name, types.get(kind, pyarrow.string())) for name, kind in columns])
+                path = os.path.join(directory, f"{table}.parquet")
+                cursor = self._conn.execute(f"SELECT * FROM {table}")
+                exported[table] = 0
+                with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+                    while True:
+                        rows = cursor.fetchmany(self.BATCH_SIZE)
+                        if not rows:
+                            break
+                        writer.write_table(pyarrow.Table.from_pylist(
+                            [dict(zip(schema.names, row)) for row in rows], schema=schema
+                        ))
+                        exported[table] += len(rows)
+                print(f"{table}: {exported[table]} строк -> {path}")
+
+        return exported
+
+
+class GitHubGrowthHistory:
+    """
+    История роста аккаунта: изменения метрик между запусками
+
+    Вместо полных снимков хранятся только дельты: для каждого репозитория -
+    изменение звезд, форков, наблюдателей и открытых issues с прошлого
+    запуска (строка пишется, только если что-то изменилось), для профиля -
+    изменение подписчиков, подписок, репозиториев, звезд и вкладов. Первое
+    наблюдение записывается базовой строкой (baseline = 1) с абсолютными
+    значениями: сумма всех строк до момента t дает значение метрики в t,
+    а сумма небазовых строк за период - прирост за период.
+    """
+
+    REPO_METRICS = ("stars", "forks", "watchers", "issues")
+    PROFILE_METRICS = ("followers", "following", "repositories", "starred_repos", "contributed_to")
+
+    def __init__(self, path: str = "github_history.sqlite3"):
+        """
+        Args:
+            path: Путь к файлу базы SQLite
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        repo_columns = ", ".join(f"{metric} INTEGER NOT NULL" for metric in self.REPO_METRICS)
+        profile_columns = ", ".join(f"{metric} INTEGER NOT NULL" for metric in self.PROFILE_METRICS)
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS repo_state (
+                repository TEXT PRIMARY KEY, {repo_columns}, recorded_at TEXT NOT NULL
+            )
+        """)
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS repo_deltas (
+                repository TEXT NOT NULL, recorded_at TEXT NOT NULL, {repo_columns},
+                baseline INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (repository, recorded_at)
+            )
+        """)
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS profile_deltas (
+                login TEXT NOT NULL, recorded_at TEXT NOT NULL, {profile_columns},
+                baseline INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (login, recorded_at)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_repo_deltas_recorded ON repo_deltas (recorded_at, baseline)")
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _repo_metrics(repo: Dict[str, Any]) -> Tuple[int, ...]:
+        return (
+            repo.get("stargazerCount") or 0,
+            repo.get("forkCount") or 0,
+            (repo.get("watchers") or {}).get("totalCount") or 0,
+            (repo.get("issues") or {}).get("totalCount") or 0
+        )
+
+    def record(self, repositories, profile_stats: Optional[Dict[str, Any]] = None,
+               recorded_at: Optional[str] = None) -> Dict[str, int]:
+        """
+        Записать изменения метрик с предыдущего запуска
+
+        Args:
+            repositories: Собственные репозитории (узлы UserRepositories)
+            profile_stats: Результат get_user_profile_stats (None = не записывать профиль)
+            recorded_at: Время наблюдения ISO 8601 (по умолчанию - текущее, UTC)
+
+        Returns:
+            Количество новых, изменившихся и неизменных репозиториев
+        """
+        recorded_at = recorded_at or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        counts = {"new": 0, "changed": 0, "unchanged": 0}
+        metrics_sql = ", ".join(self.REPO_METRICS)
+        placeholders = ", ".join("?" * len(self.REPO_METRICS))
+
+        with self._lock:
+            previous = {
+                row[0]: tuple(row[1:])
+                for row in self._conn.execute(f"SELECT repository, {metrics_sql} FROM repo_state")
+            }
+            deltas = []
+            states = []
+            for repo in repositories:
+                name = repo.get("nameWithOwner")
+                if not name:
+                    continue
+                current = self._repo_metrics(repo)
+                before = previous.get(name)
+                if before is None:
+                    deltas.append((name, recorded_at) + current + (1,))
+                    counts["new"] += 1
+                elif before != current:
+                    deltas.append((name, recorded_at) + tuple(a - b for a, b in zip(current, before)) + (0,))
+                    counts["changed"] += 1
+                else:
+                    counts["unchanged"] += 1
+                    continue
+                states.append((name,) + current + (recorded_at,))
+
+            # Два наблюдения в одну секунду складываются, а не заменяют друг друга
+            self._conn.executemany(
+                f"INSERT INTO repo_deltas (repository, recorded_at, {metrics_sql}, baseline) "
+                f"VALUES (?, ?, {placeholders}, ?) ON CONFLICT (repository, recorded_at) DO UPDATE SET "
+                + ", ".join(f"{metric} = {metric} + excluded.{metric}" for metric in self.REPO_METRICS), deltas
+            )
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO repo_state (repository, {metrics_sql}, recorded_at) "
+                f"VALUES (?, {placeholders}, ?)", states
+            )
+
+            social = (profile_stats or {}).get("social_stats")
+            login = (profile_stats or {}).get("basic_info", {}).get("login")
+            if social and login:
+                current = tuple(social.get(metric) or 0 for metric in self.PROFILE_METRICS)
+                profile_sql = ", ".join(self.PROFILE_METRICS)
+                row = self._conn.execute(
+                    f"SELECT {', '.join(f'SUM({metric})' for metric in self.PROFILE_METRICS)}, COUNT(*) "
+                    f"FROM profile_deltas WHERE login = ?", (login,)
+                ).fetchone()
+                if not row[-1]:
+                    delta, baseline = current, 1
+                else:
+                    delta, baseline = tuple(a - b for a, b in zip(current, row[:-1])), 0
+                if baseline or any(delta):
+                    self._conn.execute(
+                        f"INSERT INTO profile_deltas (login, recorded_at, {profile_sql}, baseline) "
+                        f"VALUES (?, ?, {', '.join('?' * len(self.PROFILE_METRICS))}, ?) "
+                        f"ON CONFLICT (login, recorded_at) DO UPDATE SET "
+                        + ", ".join(f"{metric} = {metric} + excluded.{metric}" for metric in self.PROFILE_METRICS),
+                        (login, recorded_at) + delta + (baseline,)
+                    )
+
+            self._conn.commit()
+        return counts
+
+    def _since(self, days: int) -> str:
+        return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(time.time() - days * 86400))
+
+    def gains(self, metric: str = "stars", days: int = 90, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Прирост метрики по репозиториям за последние days дней (например, звезды за 90 дней)
+
+        Returns:
+            Список {"repository", "gained"} по убыванию прироста (без нулевых)
+        """
+        if metric not in self.REPO_METRICS:
+            raise ValueError(f"Неизвестная метрика: {metric}")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT repository, SUM({metric}) AS gained FROM repo_deltas "
+                f"WHERE recorded_at >= ? AND baseline = 0 GROUP BY repository HAVING gained != 0 "
+                f"ORDER BY gained DESC LIMIT ?", (self._since(days), limit if limit else -1)
+            ).fetchall()
+        return [{"repository": repository, "gained": gained} for repository, gained in rows]
+
+    def series(self, repository: str, metric: str = "stars") -> List[Tuple[str, int]]:
+        """Значения метрики репозитория в моменты изменений (накопленная сумма дельт)"""
+        if metric not in self.REPO_METRICS:
+            raise ValueError(f"Неизвестная метрика: {metric}")
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT recorded_at, SUM({metric}) OVER (ORDER BY recorded_at) FROM repo_deltas "
+                f"WHERE repository = ? ORDER BY recorded_at", (repository,)
+            ).fetchall()
+
+    def profile_gains(self, days: int = 90) -> Dict[str, Dict[str, int]]:
+        """Прирост метрик профиля за последние days дней по пользователям"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT login, {', '.join(f'SUM({metric})' for metric in self.PROFILE_METRICS)} "
+                f"FROM profile_deltas WHERE recorded_at >= ? AND baseline = 0 GROUP BY login", (self._since(days),)
+            ).fetchall()
+        return {row[0]: dict(zip(self.PROFILE_METRICS, row[1:])) for row in rows}
+
+    def print_report(self, days: int = 90, limit: int = 10):
+        """Напечатать прирост метрик за период"""
+        print(f"\n📈 РОСТ ЗА ПОСЛЕДНИЕ {days} ДНЕЙ ({self.path}):")
+        for login, gains in self.profile_gains(days).items():
+            print(f"  {login}: " + ", ".join(f"{metric} {value:+d}" for metric, value in gains.items()))
+
+        for metric in self.REPO_METRICS:
+            rows = self.gains(metric, days, limit)
+            if rows:
+                print(f"\n  {metric}:")
+                for row in rows:
+                    print(f"    {row['repository']}: {row['gained']:+d}")
+
+
+class ContributionCalendar:
+    """
+    Календарь вкладов: счетчики по дням в array('I') начиная с даты start
+
+    Дни календаря GitHub идут подряд, поэтому разбирается только дата первого
+    и последнего дня, а день определяется смещением от start. Сводки по
+    неделям, месяцам, годам и дням недели считаются суммами срезов массива
+    (counts[i::7], counts[a:b]) без разбора даты каждого дня.
+    """
+
+    def __init__(self, start: Optional[date] = None, counts: Optional[array] = None):
+        self.start = start
+        self.counts = counts if counts is not None else array("I")
+
+    @classmethod
+    def from_days(cls, days: List[Dict[str, Any]]) -> "ContributionCalendar":
+        """Календарь из списка contributionDays (date, contributionCount)"""
+        if not days:
+            return cls()
+        first = date.fromisoformat(days[0]["date"][:10])
+        last = date.fromisoformat(days[-1]["date"][:10])
+        if (last - first).days + 1 == len(days):
+            return cls(first, array("I", (day.get("contributionCount", 0) for day in days)))
+
+        # Дни с пропусками или не по порядку раскладываются по смещениям
+        calendar = cls()
+        for day in days:
+            calendar.merge(cls(date.fromisoformat(day["date"][:10]), array("I", [day.get("contributionCount", 0)])))
+        return calendar
+
+    @classmethod
+    def from_weeks(cls, weeks: List[Dict[str, Any]]) -> "ContributionCalendar":
+        """Календарь из contributionCalendar.weeks"""
+        return cls.from_days([day for week in weeks for day in week.get("contributionDays", [])])
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ContributionCalendar":
+        """Календарь из компактного представления to_dict()"""
+        if not data or not data.get("start"):
+            return cls()
+        return cls(date.fromisoformat(data["start"]), array("I", data.get("counts") or []))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Компактное представление: дата первого дня и счетчики по дням"""
+        return {"start": self.start.isoformat() if self.start else None, "counts": self.counts.tolist()}
+
+    def to_days(self) -> List[Dict[str, Any]]:
+        """Список {"date", "count"} по дням"""
+        if not self.start:
+            return []
+        base = self.start.toordinal()
+        return [{"date": date.fromordinal(base + i).isoformat(), "count": count} for i, count in enumerate(self.counts)]
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @property
+    def end(self) -> Optional[date]:
+        return self.start + timedelta(days=len(self.counts) - 1) if self.start and self.counts else None
+
+    def merge(self, other: "ContributionCalendar"):
+        """Добавить дни другого календаря (совпадающие дни заменяются)"""
+        if not other.start or not other.counts:
+            return
+        if not self.start:
+            self.start, self.counts = other.start, array("I", other.counts)
+            return
+        if other.start < self.start:
+            self.counts = array("I", bytes(4 * (self.start - other.start).days)) + self.counts
+            self.start = other.start
+        offset = (other.start - self.start).days
+        missing = offset + len(other.counts) - len(self.counts)
+        if missing > 0:
+            self.counts.extend(array("I", bytes(4 * missing)))
+        self.counts[offset:offset + len(other.counts)] = other.counts
+
+    def tail(self, days: int) -> "ContributionCalendar":
+        """Последние days дней"""
+        if days >= len(self.counts):
+            return ContributionCalendar(self.start, array("I", self.counts))
+        return ContributionCalendar(self.start + timedelta(days=len(self.counts) - days), self.counts[-days:])
+
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def active_days(self) -> int:
+        return len(self.counts) - self.counts.count(0)
+
+    def max_daily(self) -> int:
+        return max(self.counts, default=0)
+
+    def weekday_totals(self) -> List[int]:
+        """Суммы по дням недели (0 = Понедельник, 6 = Воскресенье)"""
+        if not self.start:
+            return [0] * 7
+        offset = self.start.weekday()
+        return [sum(self.counts[(weekday - offset) % 7::7]) for weekday in range(7)]
+
+    def weekly_totals(self) -> List[int]:
+        """Суммы по неделям с воскресенья, как в календаре GitHub (крайние недели - неполные)"""
+        if not self.start:
+            return []
+        first_week = (6 - self.start.weekday()) % 7 or 7
+        bounds = [0] + list(range(first_week, len(self.counts), 7)) + [len(self.counts)]
+        return [sum(self.counts[a:b]) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+    def _period_totals(self, next_period: Callable[[date], date], label: Callable[[date], str]) -> Dict[str, int]:
+        totals = {}
+        if not self.start:
+            return totals
+        base = self.start.toordinal()
+        period = self.start
+        while period.toordinal() - base < len(self.counts):
+            following = next_period(period)
+            totals[label(period)] = sum(self.counts[max(period.toordinal() - base, 0):following.toordinal() - base])
+            period = following
+        return totals
+
+    def monthly_totals(self) -> Dict[str, int]:
+        """Суммы по месяцам (YYYY-MM)"""
+        return self._period_totals(
+            lambda day: date(day.year + day.month // 12, day.month % 12 + 1, 1),
+            lambda day: f"{day.year:04d}-{day.month:02d}"
+        )
+
+    def yearly_totals(self) -> Dict[str, int]:
+        """Суммы по годам"""
+        return self._period_totals(lambda day: date(day.year + 1, 1, 1), lambda day: str(day.year))
+
+
+class StarredRepositoriesAggregator:
+    """
+    Однопроходная агрегация статистики starred репозиториев
+
+    Языки, типы владельцев, распределение по популярности и темы обновляются
+    по мере поступления страниц (add), поэтому для анализа не нужно держать
+    весь список в памяти и обходить его несколько раз. Для тем используется
+    алгоритм Space-Saving: хранится не больше topic_capacity счетчиков, при
+    переполнении новая тема вытесняет тему с наименьшим счетчиком (куча
+    минимумов). Пока различных тем не больше topic_capacity, счетчики точные.
+    """
+
+    # Диапазоны популярности: (название, верхняя граница звезд включительно)
+    POPULARITY_RANGES = (("0-10", 10), ("11-100", 100), ("101-1000", 1000), ("1001-10000", 10000), ("10000+", None))
+
+    def __init__(self, top_topics: int = 20, topic_capacity: int = 2000):
+        self.top_topics = top_topics
+        self.topic_capacity = topic_capacity
+        self.total = 0
+        self.languages: Dict[str, int] = {}
+        self.owner_types: Dict[str, int] = {}
+        self.popularity: Dict[str, int] = {name: 0 for name, _ in self.POPULARITY_RANGES}
+        self.topics: Dict[str, int] = {}
+        self.topics_evicted = 0
+        self._topic_heap: List[Tuple[int, str]] = []
+
+    def add(self, repos: List[Dict[str, Any]]):
+        """Учесть порцию репозиториев (страницу пагинации)"""
+        for repo in repos:
+            self.total += 1
+
+            lang = repo['primaryLanguage'].get('name', 'Unknown') if repo.get('primaryLanguage') else 'Unknown'
+            self.languages[lang] = self.languages.get(lang, 0) + 1
+
+            owner_type = repo.get('owner', {}).get('__typename', 'Unknown')
+            self.owner_types[owner_type] = self.owner_types.get(owner_type, 0) + 1
+
+            stars = repo.get('stargazerCount', 0)
+            for name, bound in self.POPULARITY_RANGES:
+                if bound is None or stars <= bound:
+                    self.popularity[name] += 1
+                    break
+
+            for topic_node in repo.get('repositoryTopics', {}).get('nodes', []):
+                topic_name = topic_node.get('topic', {}).get('name', '')
+                if topic_name:
+                    self._count_topic(topic_name)
+
+    def _count_topic(self, topic: str):
+        if topic in self.topics:
+            self.topics[topic] += 1
+        elif len(self.topics) < self.topic_capacity:
+            self.topics[topic] = 1
+        else:
+            # Space-Saving: новая тема наследует счетчик вытесненной (оценка сверху)
+            victim, count = self._pop_min_topic()
+            del self.topics[victim]
+            self.topics[topic] = count + 1
+            self.topics_evicted += 1
+            heapq.heappush(self._topic_heap, (count + 1, topic))
+
+    def _pop_min_topic(self) -> Tuple[str, int]:
+        """
+        Извлечь тему с наименьшим счетчиком
+
+        Куча строится при первом переполнении, а затем не обновляется при
+        каждом инкременте: записи в ней - нижние оценки счетчиков. Устаревшая
+        запись возвращается в кучу с текущим значением, поэтому первая
+        актуальная запись на вершине - настоящий минимум.
+        """
+        if not self._topic_heap:
+            self._topic_heap = [(count, topic) for topic, count in self.topics.items()]
+            heapq.heapify(self._topic_heap)
+        while True:
+            count, topic = heapq.heappop(self._topic_heap)
+            current = self.topics[topic]
+            if current == count:
+                return topic, count
+            heapq.heappush(self._topic_heap, (current, topic))
+
+    def result(self, all_starred_repos: Any = None) -> Dict[str, Any]:
+        """Итоговый анализ в формате starred_analysis["analysis"]"""
+        if not self.total:
+            return {"error": "Нет starred репозиториев для анализа"}
+
+        analysis = {
+            "total_starred": self.total,
+            "languages": dict(sorted(self.languages.items(), key=lambda x: x[1], reverse=True)),
+            "owner_types": dict(self.owner_types),
+            "popularity_distribution": dict(self.popularity),
+            "top_topics": dict(heapq.nlargest(self.top_topics, self.topics.items(), key=lambda x: x[1])),
+            "all_starred_repos": all_starred_repos if all_starred_repos is not None else []
+        }
+        if self.topics_evicted:
+            analysis["topics_approximate"] = True
+        return analysis
+
+
+@dataclass
+class QualityRule:
+    """
+    Правило проверки качества репозитория
+
+    check(repo, files) возвращает None, если проблемы нет, иначе словарь
+    дополнительных полей записи о проблеме ({} - только стандартные поля).
+    files() - ленивая проверка файлов корня (check_repository_files),
+    выполняется не больше одного раза на репозиторий и может бросить
+    исключение.
+    """
+    name: str
+    title: str
+    check: Callable[[Dict[str, Any], Callable[[], Dict[str, Any]]], Optional[Dict[str, Any]]]
+
+
+def _rule_missing_description(repo: Dict[str, Any], files: Callable[[], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not repo.get("description") or repo.get("description", "").strip() == "":
+        return {}
+    return None
+
+
+def _rule_missing_license(repo: Dict[str, Any], files: Callable[[], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # Лицензия из GraphQL, иначе - проверка файлов
+    if repo.get("licenseInfo"):
+        return None
+    try:
+        return None if files().get("has_license_file", False) else {}
+    except Exception:
+        # Если не можем проверить файлы, считаем что лицензии нет
+        return {}
+
+
+def _rule_missing_topics(repo: Dict[str, Any], files: Callable[[], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return None if repo.get("repositoryTopics", {}).get("nodes", []) else {}
+
+
+def _rule_missing_readme(repo: Dict[str, Any], files: Callable[[], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    size_kb = repo.get("diskUsage", 0)
+    try:
+        has_readme_file = files().get("has_readme_file", False)
+    except Exception:
+        # Если не можем проверить, используем размер как индикатор (менее 10KB - возможно нет README)
+        return {"size_kb": size_kb} if size_kb < 10 else None
+    return None if has_readme_file else {"size_kb": size_kb}
+
+
+DEFAULT_QUALITY_RULES = (
+    QualityRule("missing_description", "Без описания", _rule_missing_description),
+    QualityRule("missing_license", "Без лицензии", _rule_missing_license),
+    QualityRule("missing_topics", "Без тегов", _rule_missing_topics),
+    QualityRule("missing_readme", "Возможно без README", _rule_missing_readme),
+)
+
+
+class RepositoryQualityEngine:
+    """
+    Проверка качества репозиториев набором правил за один проход
+
+    Все правила вычисляются для репозитория сразу, и проблемы собираются в
+    индекс по репозиторию, поэтому число проблем репозитория (для
+    low_quality_score) известно без повторного просмотра списков. Проверка
+    файлов выполняется не больше одного раза на репозиторий. При workers > 1
+    репозитории проверяются пулом потоков (имеет смысл, если проверка файлов
+    идет в сеть), порядок результатов сохраняется.
+    """
+
+    # Репозиторий с таким числом проблем и больше попадает в low_quality_score
+    LOW_QUALITY_MIN_ISSUES = 2
+
+    def __init__(self, rules: List[QualityRule] = None,
+                 probe_files: Callable[[str, str], Dict[str, Any]] = None, workers: int = 1):
+        self.rules = list(rules if rules is not None else DEFAULT_QUALITY_RULES)
+        self.probe_files = probe_files
+        self.workers = workers
+        self._files: Dict[str, Dict[str, Any]] = {}
+
+    def add_rule(self, rule: QualityRule):
+        """Добавить правило (заменяет правило с тем же именем)"""
+        self.rules = [existing for existing in self.rules if existing.name != rule.name] + [rule]
+
+    def _files_probe(self, repo_name: str, files_checks: Optional[Dict[str, Dict[str, Any]]]) -> Callable[[], Dict[str, Any]]:
+        def files() -> Dict[str, Any]:
+            owner, name = repo_name.split('/', 1)
+            if files_checks and repo_name in files_checks:
+                return files_checks[repo_name]
+            if repo_name not in self._files:
+                if self.probe_files is None:
+                    raise ValueError("Проверка файлов недоступна")
+                self._files[repo_name] = self.probe_files(owner, name)
+            return self._files[repo_name]
+        return files
+
+    def evaluate_repository(self, repo: Dict[str, Any],
+                            files_checks: Dict[str, Dict[str, Any]] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """Проблемы репозитория: список (имя правила, запись о проблеме)"""
+        repo_name = repo.get("nameWithOwner", "")
+        files = self._files_probe(repo_name, files_checks)
+        problems = []
+        for rule in self.rules:
+            extra = rule.check(repo, files)
+            if extra is not None:
+                problems.append((rule.name, {
+                    "repo": repo_name,
+                    "url": repo.get("url", ""),
+                    "stars": repo.get("stargazerCount", 0),
+                    **extra,
+                    "updated": repo.get("updatedAt", "")
+                }))
+        return problems
+
+    def evaluate(self, repositories: List[Dict[str, Any]], files_checks: Dict[str, Dict[str, Any]] = None,
+                 on_repository: Callable[[int, Dict[str, Any]], None] = None) -> Dict[str, Any]:
+        """
+        Проверить репозитории всеми правилами
+
+        Args:
+            repositories: Репозитории (поля GraphQL запроса собственных репозиториев)
+            files_checks: Заранее полученные результаты проверки файлов по nameWithOwner
+            on_repository: Вызывается для каждого репозитория по порядку (номер с 1, репозиторий)
+
+        Returns:
+            {"statistics": ..., "quality_issues": ...} в формате analyze_repository_quality
+        """
+        quality_issues = {rule.name: [] for rule in self.rules}
+        low_quality = []
+
+        if self.workers > 1 and len(repositories) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(lambda repo: self.evaluate_repository(repo, files_checks), repositories))
+        else:
+            results = (self.evaluate_repository(repo, files_checks) for repo in repositories)
+
+        analyzed = 0
+        for repo, problems in zip(repositories, results):
+            analyzed += 1
+            if on_repository:
+                on_repository(analyzed, repo)
+            for rule_name, problem in problems:
+                quality_issues[rule_name].append(problem)
+            if len(problems) >= self.LOW_QUALITY_MIN_ISSUES:
+                low_quality.append({
+                    "repo": repo.get("nameWithOwner", ""),
+                    "url": repo.get("url", ""),
+                    "stars": repo.get("stargazerCount", 0),
+                    "issues_count": len(problems),
+                    "updated": repo.get("updatedAt", "")
+                })
+
+        total_repos = len(repositories)
+        problems_total = sum(len(problems) for problems in quality_issues.values())
+        stats = {
+            "total_repositories": total_repos,
+            "analyzed_repositories": analyzed,
+            "quality_score": round((1 - problems_total / (total_repos * max(1, len(self.rules)))) * 100, 1)
+            if total_repos else 100.0,
+            "issues_summary": {name: len(problems) for name, problems in quality_issues.items()}
+        }
+        quality_issues["low_quality_score"] = low_quality
+
+        return {
+            "statistics": stats,
+            "quality_issues": quality_issues
+        }
+
+
+class RepositoryFileIndex:
+    """
+    Индекс имен файлов в корне репозиториев
+
+    Вместо проверки каждого возможного имени README/LICENSE отдельным запросом
+    к Contents API список файлов корня берется один раз на репозиторий:
+    пакетом GraphQL запросов object(expression: "HEAD:") до 100 репозиториев
+    за запрос, а при ошибке GraphQL - через REST git/trees/HEAD.
+    """
+
+    def __init__(self, collector: "GitHubDataCollector"):
+        """
+        Args:
+            collector: Коллектор, через который выполняются GraphQL и REST запросы
+        """
+        self.collector = collector
+        self._entries: Dict[str, Optional[Set[str]]] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, repo_names: List[str]):
+        """Загрузить списки файлов для еще не проиндексированных репозиториев"""
+        with self._lock:
+            missing = list(dict.fromkeys(name for name in repo_names if name not in self._entries and '/' in name))
+
+        for i in range(0, len(missing), FILE_INDEX_MAX_ALIASES):
+            batch = missing[i:i + FILE_INDEX_MAX_ALIASES]
+            entries = self._fetch_batch(batch)
+            with self._lock:
+                self._entries.update(entries)
+
+    def get_root_files(self, repo_name: str) -> Optional[Set[str]]:
+        """
+        Имена файлов и каталогов в корне ветки по умолчанию
+
+        Returns:
+            Множество имен (пустое для пустого репозитория) или None, если
+            репозиторий не найден
+        """
+        if repo_name not in self._entries:
+            self.prefetch([repo_name])
+        return self._entries.get(repo_name)
+
+    def find_file(self, repo_name: str, candidates: List[str]) -> Optional[str]:
+        """Первое из имен candidates, которое есть в корне репозитория"""
+        root_files = self.get_root_files(repo_name) or set()
+        for candidate in candidates:
+            if candidate in root_files:
+                return candidate
+        return None
+
+    def invalidate(self, repo_name: str):
+        """Забыть список файлов (например, после добавления файла через API)"""
+        with self._lock:
+            self._entries.pop(repo_name, None)
+
+    def clear(self):
+        """Забыть все списки файлов (в начале каждого сбора данных)"""
+        with self._lock:
+            self._entries.clear()
+
+    def _fetch_batch(self, repo_names: List[str]) -> Dict[str, Optional[Set[str]]]:
+        """Списки файлов корня для нескольких репозиториев одним GraphQL запросом"""
+        declarations = []
+        selections = []
+        variables = {}
+
+        for i, repo_name in enumerate(repo_names):
+            owner, name = repo_name.split('/', 1)
+            declarations.append(f"$o{i}: String!, $n{i}: String!")
+            selections.append(
+                f'r{i}: repository(owner: $o{i}, name: $n{i}) {{ '
+                f'object(expression: "HEAD:") {{ ... on Tree {{ entries {{ name }} }} }} }}'
+            )
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+
+        query = (
+            f"query RepositoryRootFiles({', '.join(declarations)}) {{\n"
+            + "\n".join(selections)
+            + "\nrateLimit { cost remaining resetAt }\n}"
+        )
+
+        try:
+            data = self.collector._make_graphql_request(query, variables, allow_partial=True)
+        except Exception as e:
+            print(f"Ошибка GraphQL запроса списка файлов ({len(repo_names)} репозиториев): {e} - используем REST API")
+            return {repo_name: self._fetch_tree_rest(repo_name) for repo_name in repo_names}
+
+        entries = {}
+        for i, repo_name in enumerate(repo_names):
+            repository = data.get(f"r{i}")
+            if repository is None:
+                entries[repo_name] = None
+            else:
+                tree = repository.get("object") or {}
+                entries[repo_name] = {entry["name"] for entry in tree.get("entries") or []}
+        return entries
+
+    def _fetch_tree_rest(self, repo_name: str) -> Optional[Set[str]]:
+        """Список файлов корня через REST API (git/trees/HEAD без рекурсии)"""
+        response = self.collector._cached_get(f"{self.collector.base_url}/repos/{repo_name}/git/trees/HEAD")
+
+        if response.status_code == 409:  # пустой репозиторий
+            return set()
+        if response.status_code != 200:
+            return None
+
+        return {entry["path"] for entry in response.json().get("tree", [])}
+
+
+class RepositorySnapshotStore:
+    """
+    Общий снимок собственных репозиториев пользователя
+
+    Статистика, топ репозиториев, языки, сортировка по звездам, анализ качества
+    и проверка топиков раньше пагинировали repositories(ownerAffiliations: OWNER)
+    каждая своим запросом. Снимок загружается один раз с объединенным набором
+    полей и переиспользуется до вызова invalidate().
+    """
+
+    def __init__(self, collector: "GitHubDataCollector"):
+        """
+        Args:
+            collector: Коллектор, через который выполняется пагинация репозиториев
+        """
+        self.collector = collector
+        self._repos: Optional[List[Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> List[Dict[str, Any]]:
+        """Получить снимок (при первом обращении - загрузить)"""
+        with self._lock:
+            if self._repos is None:
+                self._repos = self.collector._fetch_user_repositories()
+            return self._repos
+
+    def invalidate(self):
+        """Сбросить снимок (следующее обращение загрузит репозитории заново)"""
+        with self._lock:
+            self._repos = None
 
 
 @dataclass
-class LicenseResult:
-    repo_name: str
-    success: bool
-    license_type: str
-    message: str
-    already_had_license: bool = False
-    error: Optional[str] = None
+class GraphQLPage:
+    """Страница GraphQL connection"""
+    records: List[Dict[str, Any]]
+    end_cursor: Optional[str]
+    has_next_page: bool
+    total_count: Optional[int] = None
+
+
+class GraphQLConnectionPaginator:
+    """
+    Ленивая пагинация GraphQL connection с предзагрузкой следующей страницы
+
+    Пока вызывающий код обрабатывает страницу N, страница N+1 уже
+    запрашивается в фоновом потоке (в async режиме - в пуле потоков цикла
+    событий). Итерация по объекту выдает записи по одной, pages() и
+    apages() - страницы целиком вместе с курсором для контрольной точки.
+    Прерванная итерация не запрашивает страниц дальше уже начатой.
+    """
+
+    def __init__(self, collector: 'GitHubDataCollector', key: str, query: str, variables: Dict[str, Any],
+                 path: Tuple[str, ...], after: Optional[str] = None, nested: Tuple[int, ...] = (),
+                 records: str = "nodes", prefetch: bool = True):
+        """
+        Args:
+            collector: Коллектор, через который выполняются запросы
+            key: Набор данных для планировщика размера страниц
+            query: GraphQL запрос с переменными $after: String и $first: Int!
+            variables: Остальные переменные запроса
+            path: Путь к connection в ответе, например ("user", "repositories")
+            after: Курсор, после которого начинать
+            nested: Значения first вложенных connection-полей каждого узла
+            records: Поле connection с записями ("nodes" или "edges")
+            prefetch: Запрашивать следующую страницу заранее (False - когда
+                      пагинация обычно останавливается на первой странице)
+        """
+        self.collector = collector
+        self.key = key
+        self.query = query
+        self.variables = variables
+        self.path = path
+        self.after = after
+        self.nested = nested
+        self.records = records
+        self.prefetch = prefetch
+
+    def _fetch(self, cursor: Optional[str], phase: Optional[str] = None) -> Dict[str, Any]:
+        # Фоновый поток наследует фазу сбора, чтобы запросы учитывались в ней
+        if phase:
+            self.collector._current_phase.name = phase
+        return self.collector._fetch_connection_page(self.key, self.query, dict(self.variables, after=cursor),
+                                                     nested=self.nested)
+
+    def _parse(self, result: Dict[str, Any], cursor: Optional[str]) -> Optional[GraphQLPage]:
+        connection = result
+        for field in self.path:
+            connection = (connection or {}).get(field)
+        if not connection:
+            return None
+        page_info = connection.get("pageInfo") or {}
+        return GraphQLPage(
+            records=connection.get(self.records) or [],
+            end_cursor=page_info.get("endCursor") or cursor,
+            has_next_page=bool(page_info.get("hasNextPage")),
+            total_count=connection.get("totalCount")
+        )
+
+    def pages(self):
+        """Генератор страниц (следующая запрашивается, пока обрабатывается текущая)"""
+        phase = getattr(self.collector._current_phase, "name", None)
+        executor = ThreadPoolExecutor(max_workers=1) if self.prefetch else None
+        cursor = self.after
+        pending = None
+        try:
+            result = self._fetch(cursor)
+            while True:
+                page = self._parse(result, cursor)
+                if page is None:
+                    return
+                cursor = page.end_cursor
+                if page.has_next_page and executor:
+                    pending = executor.submit(self._fetch, cursor, phase)
+
+                yield page
+
+                if not page.has_next_page:
+                    return
+                result = pending.result() if pending else self._fetch(cursor)
+                pending = None
+        finally:
+            if pending:
+                pending.cancel()
+            if executor:
+                executor.shutdown(wait=False)
+
+    def __iter__(self):
+        for page in self.pages():
+            yield from page.records
+
+    async def apages(self):
+        """Асинхронный генератор страниц (запросы выполняются в пуле потоков цикла событий)"""
+        loop = asyncio.get_running_loop()
+        phase = getattr(self.collector._current_phase, "name", None)
+        cursor = self.after
+        pending = loop.run_in_executor(None, self._fetch, cursor, phase)
+        try:
+            while True:
+                result = await pending
+                pending = None
+                page = self._parse(result, cursor)
+                if page is None:
+                    return
+                cursor = page.end_cursor
+                if page.has_next_page and self.prefetch:
+                    pending = loop.run_in_executor(None, self._fetch, cursor, phase)
+
+                yield page
+
+                if not page.has_next_page:
+                    return
+                if pending is None:
+                    pending = loop.run_in_executor(None, self._fetch, cursor, phase)
+        finally:
+            if pending:
+                pending.cancel()
+
+    async def __aiter__(self):
+        async for page in self.apages():
+            for record in page.records:
+                yield record
 
 
 class GitHubLicenseBatchManager:
     """Менеджер для массового добавления лицензий в GitHub репозитории"""
 
-    def __init__(self, token: str):
+    def __init__(self, token: str, response_cache: Optional[GitHubResponseCache] = None,
+                 base_url: Optional[str] = None, telemetry: Optional[GitHubTelemetry] = None):
         self.token = token
-        self.headers = {
-            'Authorization': f'token {token}',
-            'Accept': 'application/vnd.github.v3+json',
-            'Content-Type': 'application/json'
-        }
-        self.base_url = 'https://api.github.com'
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.response_cache = response_cache
+        self.transport = get_transport(token, base_url)
+        self.base_url = self.transport.base_url
+        self.rate_limiter = get_rate_limiter(token)
+        self.telemetry = telemetry
+
+        # Общий GitHubDataCollector (создается при первой проверке файлов или топиков)
+        self._collector: Optional["GitHubDataCollector"] = None
+
+        # Шаблоны лицензий по ключу (одинаковы для всех репозиториев)
+        self._license_templates: Dict[str, str] = {}
+        self._templates_lock = threading.Lock()
 
         # Доступные лицензии
         self.available_licenses = [
@@ -67,10 +3014,53 @@ class GitHubLicenseBatchManager:
             'BSD-2-Clause', 'ISC', 'LGPL-3.0', 'LGPL-2.1', 'Unlicense'
         ]
 
+    def _request(self, method: str, url: str, extra_headers: Dict[str, str] = None,
+                 **kwargs) -> requests.Response:
+        """Запрос к REST API с учетом общего лимита (повтор при превышении лимита)"""
+        while True:
+            wait = self.rate_limiter.acquire("core", write=method != 'GET')
+            started = time.perf_counter()
+            try:
+                response = self.transport.request(method, url, headers=extra_headers, **kwargs)
+            except requests.exceptions.RequestException:
+                if self.telemetry:
+                    self.telemetry.record_response(_endpoint_label(method, url, self.base_url), "license_manager",
+                                                   None, time.perf_counter() - started, wait)
+                raise
+            if self.telemetry:
+                self.telemetry.record_response(_endpoint_label(method, url, self.base_url), "license_manager",
+                                               response, time.perf_counter() - started, wait)
+            self.rate_limiter.update_from_response(response)
+
+            if not self.rate_limiter.is_rate_limited(response):
+                return response
+            print("Rate limit exceeded. Ожидаем восстановления лимита...")
+
+    def _cached_get(self, url: str, params: Dict = None) -> requests.Response:
+        """GET запрос через кэш ответов (условный запрос по ETag), если кэш включен"""
+        if not self.response_cache:
+            return self._request('GET', url, params=params)
+        return self.response_cache.fetch(
+            lambda conditional_headers: self._request('GET', url, params=params, extra_headers=conditional_headers),
+            url, params, scope=self.token
+        )
+
+    def _get_collector(self) -> "GitHubDataCollector":
+        """Общий GitHubDataCollector для GraphQL запросов (снимок репозиториев и индекс файлов)"""
+        if self._collector is None:
+            self._collector = GitHubDataCollector(self.token, username=self.get_authenticated_user(),
+                                                  response_cache=self.response_cache, base_url=self.base_url,
+                                                  telemetry=self.telemetry)
+        return self._collector
+
+    def _get_file_index(self) -> "RepositoryFileIndex":
+        """Индекс файлов корня репозиториев"""
+        return self._get_collector().file_index
+
     def get_authenticated_user(self) -> Optional[str]:
         """Получение имени текущего пользователя"""
         url = f'{self.base_url}/user'
-        response = requests.get(url, headers=self.headers)
+        response = self._request('GET', url)
 
         if response.status_code == 200:
             user_data = response.json()
@@ -80,7 +3070,7 @@ class GitHubLicenseBatchManager:
     def get_user_info(self) -> Optional[Dict]:
         """Получение информации о пользователе"""
         url = f'{self.base_url}/user'
-        response = requests.get(url, headers=self.headers)
+        response = self._request('GET', url)
 
         if response.status_code == 200:
             return response.json()
@@ -103,7 +3093,7 @@ class GitHubLicenseBatchManager:
 
         while True:
             params['page'] = page
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self._cached_get(url, params=params)
 
             if response.status_code != 200:
                 print(f"❌ Ошибка при получении репозиториев: {response.status_code}")
@@ -123,9 +3113,6 @@ class GitHubLicenseBatchManager:
             print(f"📄 Обработана страница {page}, найдено {len(repos)} репозиториев")
             page += 1
 
-            if page > 100:
-                break
-
         print(f"✅ Всего найдено {len(all_repos)} репозиториев")
         return all_repos
 
@@ -133,7 +3120,7 @@ class GitHubLicenseBatchManager:
         """Проверка наличия лицензии в репозитории"""
         # Проверка через API
         url = f'{self.base_url}/repos/{owner}/{repo}'
-        response = requests.get(url, headers=self.headers)
+        response = self._cached_get(url)
 
         if response.status_code == 200:
             repo_data = response.json()
@@ -145,30 +3132,32 @@ class GitHubLicenseBatchManager:
                     'key': api_license.get('key', '')
                 }
 
-        # Проверка файлов лицензий
+        # Проверка файлов лицензий по списку файлов корня репозитория
         license_files = ['LICENSE', 'LICENSE.txt', 'LICENSE.md', 'LICENCE', 'COPYING']
+        license_file = self._get_file_index().find_file(f"{owner}/{repo}", license_files)
 
-        for license_file in license_files:
-            file_url = f'{self.base_url}/repos/{owner}/{repo}/contents/{license_file}'
-            file_response = requests.get(file_url, headers=self.headers)
-
-            if file_response.status_code == 200:
-                return {
-                    'source': 'file',
-                    'license': 'Unknown (file exists)',
-                    'file': license_file
-                }
+        if license_file:
+            return {
+                'source': 'file',
+                'license': 'Unknown (file exists)',
+                'file': license_file
+            }
 
         return None
 
     def get_license_template(self, license_key: str) -> Optional[str]:
-        """Получение шаблона лицензии"""
-        url = f'{self.base_url}/licenses/{license_key}'
-        response = requests.get(url, headers=self.headers)
+        """Получение шаблона лицензии (запрашивается один раз на ключ)"""
+        with self._templates_lock:
+            if license_key in self._license_templates:
+                return self._license_templates[license_key]
 
-        if response.status_code == 200:
-            return response.json()['body']
-        return None
+            url = f'{self.base_url}/licenses/{license_key}'
+            response = self._request('GET', url)
+
+            if response.status_code == 200:
+                self._license_templates[license_key] = response.json()['body']
+                return self._license_templates[license_key]
+            return None
 
     def prepare_license_content(self, license_key: str, author_name: str = None,
                                author_email: str = None, year: int = None) -> Optional[str]:
@@ -195,8 +3184,13 @@ class GitHubLicenseBatchManager:
 
     def add_license_to_repo(self, owner: str, repo: str, license_key: str,
                            author_name: str = None, author_email: str = None,
-                           force: bool = False) -> LicenseResult:
-        """Добавление лицензии в репозиторий"""
+                           force: bool = False, dry_run: bool = False) -> LicenseResult:
+        """
+        Добавление лицензии в репозиторий
+
+        При dry_run=True выполняются все проверки и подготовка содержимого,
+        но файл LICENSE не создается.
+        """
         repo_full_name = f"{owner}/{repo}"
 
         # Проверка существующей лицензии
@@ -221,6 +3215,14 @@ class GitHubLicenseBatchManager:
                 error="Template not found"
             )
 
+        if dry_run:
+            return LicenseResult(
+                repo_name=repo_full_name,
+                success=True,
+                license_type=license_key,
+                message="Пробный запуск: лицензия была бы добавлена"
+            )
+
         # Создание файла LICENSE
         url = f'{self.base_url}/repos/{owner}/{repo}/contents/LICENSE'
 
@@ -235,9 +3237,16 @@ class GitHubLicenseBatchManager:
             }
         }
 
-        response = requests.put(url, headers=self.headers, json=data)
+        response = self._request('PUT', url, json=data)
 
         if response.status_code == 201:
+            if self.response_cache:
+                # Закэшированные проверки лицензии для этого репозитория устарели
+                self.response_cache.invalidate(url, scope=self.token)
+                self.response_cache.invalidate(f'{self.base_url}/repos/{owner}/{repo}', scope=self.token)
+            if self._collector:
+                self._collector.file_index.invalidate(repo_full_name)
+                self._collector.repository_snapshot.invalidate()
             return LicenseResult(
                 repo_name=repo_full_name,
                 success=True,
@@ -264,8 +3273,22 @@ class GitHubLicenseBatchManager:
     def batch_add_licenses(self, license_key: str, author_name: str = None,
                           author_email: str = None, include_forks: bool = False,
                           force: bool = False, exclude_repos: List[str] = None,
-                          include_only: List[str] = None) -> List[LicenseResult]:
-        """Массовое добавление лицензий во все репозитории"""
+                          include_only: List[str] = None, workers: int = 4,
+                          dry_run: bool = False) -> List[LicenseResult]:
+        """
+        Массовое добавление лицензий во все репозитории
+
+        Репозитории обрабатываются пулом из workers потоков. Проверки (чтение)
+        идут параллельно, а создание файлов разносится общим ограничителем
+        скорости в рамках вторичных лимитов GitHub на создание контента.
+
+        Args:
+            workers: Количество потоков обработки
+            dry_run: Пробный запуск без создания файлов (для оценки пропускной способности)
+
+        Returns:
+            Результаты в порядке списка репозиториев
+        """
 
         exclude_repos = exclude_repos or []
 
@@ -293,34 +3316,58 @@ class GitHubLicenseBatchManager:
         print(f"👤 Автор: {author_name}")
         print(f"📧 Email: {author_email}")
         print(f"🔄 Принудительное обновление: {'Да' if force else 'Нет'}")
+        print(f"🧵 Потоков: {workers}{' (пробный запуск)' if dry_run else ''}")
 
-        results = []
+        started = time.perf_counter()
 
-        for i, (owner, repo, repo_data) in enumerate(repos, 1):
-            print(f"\n[{i}/{len(repos)}] Обработка {owner}/{repo}...")
+        # Списки файлов корня всех репозиториев - пакетными запросами до начала обработки
+        self._get_file_index().prefetch([f"{o}/{r}" for o, r, d in repos])
 
-            # Задержка для избежания rate limiting
-            if i > 1:
-                time.sleep(1)
+        def process(repo_entry):
+            owner, repo, repo_data = repo_entry
+            try:
+                return self.add_license_to_repo(
+                    owner, repo, license_key, author_name, author_email, force, dry_run
+                )
+            except requests.exceptions.RequestException as e:
+                return LicenseResult(
+                    repo_name=f"{owner}/{repo}",
+                    success=False,
+                    license_type=license_key,
+                    message="Ошибка запроса к GitHub API",
+                    error=str(e)
+                )
 
-            result = self.add_license_to_repo(
-                owner, repo, license_key, author_name, author_email, force
-            )
+        results = []
 
-            results.append(result)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            # map возвращает результаты в порядке репозиториев
+            for i, result in enumerate(executor.map(process, repos), 1):
+                results.append(result)
+
+                # Вывод результата
+                print(f"\n[{i}/{len(repos)}] {result.repo_name}")
+                if result.success:
+                    print(f"✅ {result.message}")
+                elif result.already_had_license:
+                    print(f"⚠️ {result.message}")
+                else:
+                    print(f"❌ {result.message}")
 
-            # Вывод результата
-            if result.success:
-                print(f"✅ {result.message}")
-            elif result.already_had_license:
-                print(f"⚠️ {result.message}")
-            else:
-                print(f"❌ {result.message}")
+        elapsed = time.perf_counter() - started
+        throughput = len(results) / elapsed if elapsed > 0 else 0
+        print(f"\n⏱️ Обработано {len(results)} репозиториев за {elapsed:.1f} сек ({throughput:.1f} репозиториев/сек)")
 
         return results
 
-    def interactive_batch_setup(self):
-        """Интерактивная настройка batch добавления лицензий"""
+    def interactive_batch_setup(self, workers: int = 4, dry_run: bool = False):
+        """
+        Интерактивная настройка batch добавления лицензий
+
+        Args:
+            workers: Количество потоков обработки репозиториев
+            dry_run: Пробный запуск без создания файлов
+        """
         print("🎯 Интерактивная настройка добавления лицензий")
         print("=" * 50)
 
@@ -391,7 +3438,9 @@ class GitHubLicenseBatchManager:
             author_email=author_email,
             include_forks=include_forks,
             force=force,
-            exclude_repos=exclude_repos
+            exclude_repos=exclude_repos,
+            workers=workers,
+            dry_run=dry_run
         )
 
         # Отчет
@@ -467,9 +3516,8 @@ class GitHubLicenseBatchManager:
         """
         print("🏷️ Проверяем наличие тегов (топиков) во всех репозиториях...")
 
-        # Создаем экземпляр GitHubDataCollector для получения данных с топиками через GraphQL
-        collector = GitHubDataCollector(self.token)
-        repos = collector.get_user_repositories()
+        # Топики берутся из общего снимка репозиториев GitHubDataCollector (GraphQL)
+        repos = self._get_collector().get_user_repositories()
 
         if not repos:
             return {"error": "Не удалось получить репозитории"}
@@ -620,25 +3668,19 @@ class GitHubLicenseBatchManager:
 
         print(f"Анализируем {len(repos)} репозиториев...")
 
+        file_index = self._get_file_index()
+        file_index.prefetch([f"{owner}/{repo}" for owner, repo, repo_data in repos])
+
         for i, (owner, repo, repo_data) in enumerate(repos, 1):
             repo_full_name = f"{owner}/{repo}"
             print(f"  {i}/{len(repos)}: {repo_full_name}")
 
             try:
-                # Проверяем README файлы через API
+                # Проверяем README файлы по списку файлов корня репозитория
                 readme_files = ["README.md", "README.rst", "README.txt", "README", "readme.md", "Readme.md"]
-                has_readme = False
-                readme_found = None
-
-                for readme_file in readme_files:
-                    readme_url = f"https://api.github.com/repos/{owner}/{repo}/contents/{readme_file}"
-                    readme_response = self.session.get(readme_url)
-                    if readme_response.status_code == 200:
-                        has_readme = True
-                        readme_found = readme_file
-                        break
+                readme_found = file_index.find_file(repo_full_name, readme_files)
 
-                if has_readme:
+                if readme_found:
                     readme_status["with_readme"].append({
                         "repo": repo_full_name,
                         "readme_file": readme_found,
@@ -742,26 +3784,81 @@ class GitHubLicenseBatchManager:
 class GitHubDataCollector:
     """Класс для сбора данных из GitHub API"""
 
-    def __init__(self, token: str, username: str = None):
+    def __init__(self, token: str, username: str = None,
+                 response_cache: Optional[GitHubResponseCache] = None,
+                 base_url: Optional[str] = None, telemetry: Optional[GitHubTelemetry] = None,
+                 token_pool: Optional[GitHubTokenPool] = None):
         """
         Инициализация коллектора
 
         Args:
             token: GitHub Personal Access Token
             username: Имя пользователя GitHub (если None, будет получено автоматически)
+            response_cache: Кэш ответов REST API с условными запросами (None = без кэша)
+            base_url: Адрес API (None = GITHUB_API_URL или api.github.com)
+            telemetry: Телеметрия запросов (None = не собирать)
+            token_pool: Пул токенов для запросов на чтение (None = все запросы от token)
         """
         self.token = token
         self.username = username
-        self.base_url = "https://api.github.com"
-        self.session = requests.Session()
+        self.response_cache = response_cache
+        self.telemetry = telemetry
+        self.token_pool = token_pool
 
-        # Настройка сессии
-        self.session.headers.update({
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-            "User-Agent": "GitHub-Data-Collector-GraphQL/1.0"
-        })
+        # Каталог для github_data.json, CSV, контрольной точки и NDJSON файлов
+        self.output_dir = "."
+
+        # Выбор, сжатие и формат выходных файлов
+        self.exporter = GitHubDataExporter()
+
+        # Общая для токена сессия с пулом соединений и повтором 5xx
+        self.transport = get_transport(token, base_url)
+        self.base_url = self.transport.base_url
+
+        # Последние известные значения rateLimit из GraphQL ответов
+        self.graphql_rate_limit = {}
+
+        # Итоговые totalCount и endCursor последней пагинации по каждому набору данных
+        self.connection_state = {}
+
+        # Контрольная точка текущего запуска collect_all_data (None = не сохранять прогресс)
+        self.checkpoint: Optional[GitHubCollectionCheckpoint] = None
+
+        # Потоковая запись крупных наборов в NDJSON (None = держать наборы в памяти)
+        self.stream_sink: Optional[GitHubStreamSink] = None
+
+        # Локальное хранилище SQLite, куда фазы записывают свои наборы (None = не вести)
+        self.warehouse: Optional[GitHubDataWarehouse] = None
+        self._warehouse_stored: Set[str] = set()
+        # Репозитории, форки которых получены не полностью (их строки в хранилище не удаляются)
+        self._incomplete_fork_repos: Set[str] = set()
+
+        # История роста (дельты метрик между запусками, None = не записывать)
+        self.history: Optional[GitHubGrowthHistory] = None
+
+        # Запрашивать вклады за все годы с регистрации (иначе - только за последний год)
+        self.all_years_contributions = False
+
+        # Списки файлов в корне репозиториев для проверок README/LICENSE
+        self.file_index = RepositoryFileIndex(self)
+
+        # Общий снимок собственных репозиториев для всех анализов
+        self.repository_snapshot = RepositorySnapshotStore(self)
+
+        # Правила analyze_repository_quality и число потоков их проверки
+        self.quality_rules: List[QualityRule] = list(DEFAULT_QUALITY_RULES)
+        self.quality_workers = 1
+
+        # Размеры страниц пагинации по наборам данных (бюджет стоимости и адаптация к 502)
+        self.page_planner = GraphQLPagePlanner()
+
+        # Время и количество запросов по фазам последнего последовательного сбора
+        self.phase_stats: Dict[str, Dict[str, float]] = {}
+        self._current_phase = threading.local()
+        self._phase_lock = threading.Lock()
+
+        # Общий для всех экземпляров с этим токеном ограничитель скорости
+        self.rate_limiter = get_rate_limiter(token)
 
         # Получаем username если не указан
         if not self.username:
@@ -769,10 +3866,69 @@ class GitHubDataCollector:
 
     def _get_current_user(self) -> str:
         """Получить имя текущего пользователя"""
-        response = self.session.get(f"{self.base_url}/user")
+        response = self._request("GET", f"{self.base_url}/user")
         response.raise_for_status()
         return response.json()["login"]
 
+    def _request(self, method: str, url: str, endpoint: str = None, **kwargs) -> requests.Response:
+        """
+        Выполнить HTTP запрос через общий транспорт с учетом общего лимита
+
+        Args:
+            method: HTTP метод
+            url: URL для запроса
+            endpoint: Метка запроса для телеметрии (по умолчанию - шаблон REST эндпоинта)
+            **kwargs: Дополнительные параметры requests
+
+        Returns:
+            Ответ API (без проверки статуса)
+        """
+        resource = "graphql" if url.endswith("/graphql") else "core"
+        write = method in ("PUT", "PATCH", "DELETE") or (method == "POST" and resource == "core")
+        phase = getattr(self._current_phase, "name", None)
+
+        # Чтение - от токена пула с наибольшим запасом; изменения и /user - от своего токена
+        transport, rate_limiter = self.transport, self.rate_limiter
+        if self.token_pool and not write and not (url == f"{self.base_url}/user"
+                                                  or url.startswith(f"{self.base_url}/user/")):
+            token = self.token_pool.choose(resource)
+            transport, rate_limiter = get_transport(token, self.base_url), get_rate_limiter(token)
+        wait = rate_limiter.acquire(resource, write=write)
+
+        started = time.perf_counter()
+        try:
+            response = transport.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            if self.telemetry:
+                self.telemetry.record_response(endpoint or _endpoint_label(method, url, self.base_url), phase,
+                                               None, time.perf_counter() - started, wait)
+            raise
+        if self.telemetry:
+            self.telemetry.record_response(endpoint or _endpoint_label(method, url, self.base_url), phase,
+                                           response, time.perf_counter() - started, wait)
+        rate_limiter.update_from_response(response, resource)
+        response.rate_limiter = rate_limiter
+
+        if phase:
+            with self._phase_lock:
+                self.phase_stats[phase]["requests"] += 1
+        return response
+
+    def _output_path(self, filename: str) -> str:
+        """Путь к файлу в каталоге вывода"""
+        if self.output_dir in ("", "."):
+            return filename
+        return os.path.join(self.output_dir, filename)
+
+    def _cached_get(self, url: str, params: Dict = None) -> requests.Response:
+        """GET запрос через кэш ответов (условный запрос по ETag), если кэш включен"""
+        if not self.response_cache:
+            return self._request("GET", url, params=params)
+        return self.response_cache.fetch(
+            lambda conditional_headers: self._request("GET", url, params=params, headers=conditional_headers),
+            url, params, scope=self.token
+        )
+
     def _make_request(self, url: str, params: Dict = None) -> Dict:
         """
         Сделать запрос к API с обработкой ошибок и rate limiting
@@ -785,210 +3941,384 @@ class GitHubDataCollector:
             JSON ответ от API
         """
         while True:
-            response = self.session.get(url, params=params)
+            response = self._cached_get(url, params=params)
 
             if response.status_code == 200:
                 return response.json()
-            elif response.status_code == 403:
-                # Rate limit или другие ограничения
-                reset_time = int(response.headers.get("X-RateLimit-Reset", 0))
-                wait_time = max(reset_time - time.time(), 60)  # Минимум 60 секунд
-                print(f"Rate limit exceeded. Waiting {wait_time:.0f} seconds...")
-                time.sleep(wait_time)
+            elif self.rate_limiter.is_rate_limited(response):
+                # Ожидание выполнит ограничитель перед повторным запросом
+                print("Rate limit exceeded. Ожидаем восстановления лимита...")
                 continue
             else:
                 response.raise_for_status()
 
-    def _make_graphql_request(self, query: str, variables: Dict = None) -> Dict:
+    def _make_graphql_request(self, query: str, variables: Dict = None,
+                              allow_partial: bool = False, max_retries: Optional[int] = None) -> Dict:
         """
         Сделать GraphQL запрос с обработкой ошибок и rate limiting
 
         Args:
             query: GraphQL запрос
             variables: Переменные для запроса
+            allow_partial: Вернуть частичные данные, если ошибки относятся к отдельным полям
+                           (например, один из алиасов не найден)
+            max_retries: Число повторов 5xx и сетевых ошибок (None = значение транспорта)
 
         Returns:
             JSON ответ от GraphQL API
         """
+        query = _with_rate_limit_field(query)
+        endpoint = f"graphql {_graphql_operation_name(query)}"
+
         while True:
             payload = {"query": query}
             if variables:
                 payload["variables"] = variables
 
-            response = self.session.post(
-                f"{self.base_url}/graphql",
-                json=payload
-            )
+            response = self._request("POST", f"{self.base_url}/graphql", endpoint=endpoint,
+                                     json=payload, max_retries=max_retries)
 
+            # Бюджет токена, которым выполнен запрос (при пуле токенов - не обязательно своего)
+            rate_limiter = getattr(response, "rate_limiter", self.rate_limiter)
             if response.status_code == 200:
                 result = response.json()
+                if result.get("data") and isinstance(result["data"].get("rateLimit"), dict):
+                    rate_limiter.update_from_graphql(result["data"]["rateLimit"])
+                    if self.telemetry:
+                        self.telemetry.add_graphql_cost(endpoint, getattr(self._current_phase, "name", None),
+                                                        result["data"]["rateLimit"].get("cost") or 0)
                 if "errors" in result:
+                    if any(error.get("type") == "RATE_LIMITED" for error in result["errors"]):
+                        rate_limiter.mark_exhausted("graphql")
+                        print("Rate limit exceeded. Ожидаем восстановления лимита...")
+                        continue
+                    if allow_partial and result.get("data"):
+                        for error in result["errors"]:
+                            print(f"GraphQL warning: {error.get('message', error)}")
+                        return result["data"]
                     raise Exception(f"GraphQL errors: {result['errors']}")
                 return result["data"]
-            elif response.status_code == 403:
-                # Rate limit или другие ограничения
-                reset_time = int(response.headers.get("X-RateLimit-Reset", 0))
-                wait_time = max(reset_time - time.time(), 60)  # Минимум 60 секунд
-                print(f"Rate limit exceeded. Waiting {wait_time:.0f} seconds...")
-                time.sleep(wait_time)
+            elif self.rate_limiter.is_rate_limited(response):
+                # Ожидание выполнит ограничитель перед повторным запросом
+                print("Rate limit exceeded. Ожидаем восстановления лимита...")
                 continue
             else:
                 response.raise_for_status()
 
-    def get_all_forks(self) -> List[Dict[str, Any]]:
+    def _fetch_connection_page(self, key: str, query: str, variables: Dict,
+                               nested: Tuple[int, ...] = ()) -> Dict:
+        """
+        Запросить страницу connection с размером от планировщика ($first)
+
+        Если страница не уложилась по времени (502/504, таймаут, обрыв),
+        она запрашивается заново с того же курсора вдвое меньшим размером.
+        Записи не теряются: при отказе на минимальном размере исключение
+        пробрасывается вызывающему коду.
+
+        Args:
+            key: Набор данных (общий размер страниц для всех его пагинаций)
+            query: GraphQL запрос с переменной $first: Int!
+            variables: Переменные запроса без first
+            nested: Значения first вложенных connection-полей каждого узла
+        """
+        planner = self.page_planner
+        while True:
+            size = planner.page_size(key, nested)
+            try:
+                # Быстрый отказ вместо долгих повторов: меньшая страница вероятнее уложится
+                result = self._make_graphql_request(query, dict(variables, first=size),
+                                                    max_retries=1 if size > planner.min_page else None)
+            except (requests.exceptions.HTTPError, requests.exceptions.Timeout,
+                    requests.exceptions.ConnectionError) as e:
+                response = getattr(e, "response", None)
+                if response is not None and response.status_code not in GRAPHQL_PAGE_SHRINK_STATUSES:
+                    raise
+                if not planner.record_failure(key):
+                    raise
+                print(f"Страница {key} из {size} записей не получена ({e.__class__.__name__}), "
+                      f"повтор с размером {planner.page_size(key)}...")
+                continue
+
+            planner.record_success(key)
+            return result
+
+    def paginate(self, key: str, query: str, variables: Dict[str, Any], path: Tuple[str, ...],
+                 after: Optional[str] = None, nested: Tuple[int, ...] = (), records: str = "nodes",
+                 prefetch: bool = True) -> GraphQLConnectionPaginator:
+        """
+        Ленивая пагинация connection с предзагрузкой (см. GraphQLConnectionPaginator)
+
+        Пример:
+            for repo in collector.paginate("starred", query, {"username": name},
+                                           ("user", "starredRepositories"), records="edges"):
+                ...
+        """
+        return GraphQLConnectionPaginator(self, key, query, variables, path, after=after, nested=nested,
+                                          records=records, prefetch=prefetch)
+
+    def _resume_connection(self, key: str, dataset: str = None) -> Tuple[List[Dict[str, Any]], Optional[str], bool]:
+        """
+        Получить сохраненный прогресс пагинации из контрольной точки
+
+        Returns:
+            Кортеж (уже полученные записи, курсор для продолжения, пагинация завершена)
+        """
+        if not self.checkpoint:
+            return [], None, False
+
+        items, entry = self.checkpoint.load_connection(key)
+        if not entry:
+            return [], None, False
+
+        print(f"Контрольная точка {key}: уже получено {len(items)} записей"
+              f"{' (завершено)' if entry.get('done') else ''}")
+        if dataset and entry.get("done"):
+            self.connection_state[dataset] = {"end_cursor": entry.get("cursor"), "total_count": entry.get("total_count")}
+
+        return items, entry.get("cursor"), entry.get("done", False)
+
+    def _new_records(self, dataset: str, records: List[Dict[str, Any]] = None):
+        """
+        Создать накопитель записей набора данных
+
+        В потоковом режиме это NDJSONDataset, куда страницы пишутся сразу по
+        получении, иначе обычный список.
+        """
+        records = records or []
+        if not self.stream_sink:
+            return records
+
+        stream = self.stream_sink.dataset(dataset)
+        stream.extend(records)
+        return stream
+
+    def _checkpoint_page(self, key: str, nodes: List[Dict[str, Any]], cursor: Optional[str],
+                         total_count: Optional[int] = None):
+        """Сохранить страницу пагинации в контрольную точку"""
+        if self.checkpoint:
+            self.checkpoint.save_page(key, nodes, cursor, total_count)
+
+    def _checkpoint_done(self, key: str):
+        """Отметить пагинацию завершенной в контрольной точке"""
+        if self.checkpoint:
+            self.checkpoint.finish_connection(key)
+
+    def _track_phase(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        """Выполнить фазу сбора, записав ее время и количество запросов в phase_stats"""
+        self.phase_stats[name] = {"seconds": 0.0, "requests": 0}
+        self._current_phase.name = name
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            self._store_in_warehouse(name, result)
+            return result
+        finally:
+            self.phase_stats[name]["seconds"] = round(time.perf_counter() - started, 3)
+            self._current_phase.name = None
+
+    def _store_in_warehouse(self, name: str, data: Any):
+        """Записать набор данных фазы в хранилище (один раз за запуск)"""
+        if not self.warehouse or name not in GitHubDataWarehouse.DATASETS or name in self._warehouse_stored:
+            return
+        keep_parents = self._incomplete_fork_repos if name == "forks_of_user_repos" else None
+        stored = self.warehouse.store_dataset(name, data, keep_parents=keep_parents)
+        self._warehouse_stored.add(name)
+        if stored:
+            print(f"Хранилище: {name} -> " + ", ".join(f"{table}: {count}" for table, count in stored.items()))
+
+    def _run_phase(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Выполнить фазу сбора или взять ее результат из контрольной точки
+
+        Результат с ошибками (словарь или элементы списка с ключом "error") не
+        сохраняется, чтобы при продолжении фаза выполнилась заново.
+        """
+        if self.checkpoint:
+            found, result = self.checkpoint.load_phase(name)
+            if found:
+                print(f"Контрольная точка: фаза {name} уже выполнена")
+                return result
+
+        result = func(*args, **kwargs)
+
+        items = result if isinstance(result, list) else [result]
+        has_errors = any(isinstance(item, dict) and "error" in item for item in items)
+        if self.checkpoint and not has_errors:
+            self.checkpoint.save_phase(name, result)
+        return result
+
+    def _get_analytics_batch_checkpointed(self, repo_names: List[str]) -> List[Dict[str, Any]]:
+        """Пакетная аналитика с сохранением результата пакета в контрольную точку"""
+        phase_name = "analytics:" + hashlib.sha1("\n".join(repo_names).encode("utf-8")).hexdigest()
+        return self._run_phase(phase_name, self.get_repositories_analytics_batch, repo_names)
+
+    def get_all_forks(self, after_cursor: str = None) -> List[Dict[str, Any]]:
         """
         Получить все форки пользователя через GraphQL
 
+        Args:
+            after_cursor: Курсор, после которого начинать (для инкрементального режима
+                возвращаются только форки, созданные после предыдущего запуска)
+
         Returns:
             Список форков с информацией о каждом
         """
         print("Получение списка форков через GraphQL...")
 
-        forks = []
-        cursor = None
+        checkpoint_key = f"forks:{after_cursor or ''}"
+        resumed, resume_cursor, done = self._resume_connection(checkpoint_key, "forks")
+        forks = self._new_records("forks", resumed)
+        if done:
+            return forks
 
-        while True:
-            query = """
-            query($username: String!, $after: String) {
-              user(login: $username) {
-                repositories(
-                  first: 100,
-                  isFork: true,
-                  orderBy: {field: CREATED_AT, direction: ASC},
-                  after: $after
-                ) {
-                  nodes {
-                    name
-                    nameWithOwner
-                    url
-                    createdAt
-                    pushedAt
-                    updatedAt
-                    description
-                    primaryLanguage {
-                      name
-                    }
-                    forkCount
-                    stargazerCount
-                    parent {
-                      nameWithOwner
-                      url
-                    }
-                  }
-                  pageInfo {
-                    hasNextPage
-                    endCursor
-                  }
+        cursor = resume_cursor or after_cursor
+        total_count = None
+
+        query = """
+        query UserForks($username: String!, $after: String, $first: Int!) {
+          user(login: $username) {
+            repositories(
+              first: $first,
+              isFork: true,
+              orderBy: {field: CREATED_AT, direction: ASC},
+              after: $after
+            ) {
+              totalCount
+              nodes {
+                name
+                nameWithOwner
+                url
+                createdAt
+                pushedAt
+                updatedAt
+                description
+                primaryLanguage {
+                  name
+                }
+                forkCount
+                stargazerCount
+                parent {
+                  nameWithOwner
+                  url
                 }
               }
+              pageInfo {
+                hasNextPage
+                endCursor
+              }
             }
-            """
-
-            variables = {
-                "username": self.username,
-                "after": cursor
-            }
-
-            result = self._make_graphql_request(query, variables)
-
-            if not result.get("user") or not result["user"].get("repositories"):
-                break
+          }
+        }
+        """
 
-            repos = result["user"]["repositories"]
-            page_forks = repos["nodes"]
-            forks.extend(page_forks)
+        pages = self.paginate("forks", query, {"username": self.username}, ("user", "repositories"), after=cursor)
+        for page in pages.pages():
+            forks.extend(page.records)
+            total_count = page.total_count
 
-            print(f"Порция: найдено {len(page_forks)} форков (всего: {len(forks)})")
+            print(f"Порция: найдено {len(page.records)} форков (всего: {len(forks)})")
 
-            # Проверяем, есть ли еще страницы
-            if not repos["pageInfo"]["hasNextPage"]:
-                break
+            # Курсор последней полученной страницы нужен следующему инкрементальному запуску
+            cursor = page.end_cursor or cursor
+            self._checkpoint_page(checkpoint_key, page.records, cursor, total_count)
 
-            cursor = repos["pageInfo"]["endCursor"]
+        self._checkpoint_done(checkpoint_key)
+        self.connection_state["forks"] = {"end_cursor": cursor, "total_count": total_count}
 
         print(f"Всего найдено форков: {len(forks)}")
         return forks
 
-    def get_all_issues(self) -> List[Dict[str, Any]]:
+    def get_all_issues(self, updated_since: str = None) -> List[Dict[str, Any]]:
         """
         Получить все issues пользователя через GraphQL (включая закрытые)
 
+        Args:
+            updated_since: Вернуть только issues, созданные или измененные после этой
+                даты (ISO 8601) - используется инкрементальным режимом
+
         Returns:
             Список issues с информацией о каждом
         """
         print("Получение списка issues через GraphQL...")
 
-        issues = []
-        cursor = None
+        checkpoint_key = f"issues:{updated_since or ''}"
+        resumed, cursor, done = self._resume_connection(checkpoint_key, "issues")
+        issues = self._new_records("issues", resumed)
+        if done:
+            return issues
 
-        while True:
-            query = """
-            query($username: String!, $after: String) {
-              user(login: $username) {
-                issues(
-                  first: 100,
-                  orderBy: {field: CREATED_AT, direction: ASC},
-                  states: [OPEN, CLOSED],
-                  after: $after
-                ) {
-                  nodes {
-                    title
-                    url
-                    state
-                    createdAt
-                    closedAt
-                    updatedAt
-                    comments {
-                      totalCount
-                    }
-                    labels(first: 10) {
-                      nodes {
-                        name
-                      }
-                    }
-                    repository {
-                      nameWithOwner
-                      url
-                    }
-                  }
-                  pageInfo {
-                    hasNextPage
-                    endCursor
+        total_count = None
+
+        query = """
+        query UserIssues($username: String!, $after: String, $since: DateTime, $first: Int!) {
+          user(login: $username) {
+            issues(
+              first: $first,
+              orderBy: {field: CREATED_AT, direction: ASC},
+              states: [OPEN, CLOSED],
+              filterBy: {since: $since},
+              after: $after
+            ) {
+              totalCount
+              nodes {
+                title
+                url
+                state
+                createdAt
+                closedAt
+                updatedAt
+                comments {
+                  totalCount
+                }
+                labels(first: 100) {
+                  nodes {
+                    name
                   }
                 }
+                repository {
+                  nameWithOwner
+                  url
+                }
+              }
+              pageInfo {
+                hasNextPage
+                endCursor
               }
             }
-            """
-
-            variables = {
-                "username": self.username,
-                "after": cursor
-            }
-
-            result = self._make_graphql_request(query, variables)
+          }
+        }
+        """
 
-            if not result.get("user") or not result["user"].get("issues"):
-                break
+        variables = {
+            "username": self.username,
+            "since": updated_since
+        }
 
-            user_issues = result["user"]["issues"]
-            page_issues = user_issues["nodes"]
-            issues.extend(page_issues)
+        pages = self.paginate("issues", query, variables, ("user", "issues"), after=cursor, nested=(100,))
+        for page in pages.pages():
+            issues.extend(page.records)
+            total_count = page.total_count
 
-            print(f"Порция: найдено {len(page_issues)} issues (всего: {len(issues)})")
+            print(f"Порция: найдено {len(page.records)} issues (всего: {len(issues)})")
 
-            # Проверяем, есть ли еще страницы
-            if not user_issues["pageInfo"]["hasNextPage"]:
-                break
+            cursor = page.end_cursor or cursor
+            self._checkpoint_page(checkpoint_key, page.records, cursor, total_count)
 
-            cursor = user_issues["pageInfo"]["endCursor"]
+        self._checkpoint_done(checkpoint_key)
+        self.connection_state["issues"] = {"end_cursor": cursor, "total_count": total_count}
 
         print(f"Всего найдено issues: {len(issues)}")
         return issues
 
-    def save_to_json(self, data: Dict[str, Any], filename: str):
-        """Сохранить данные в JSON файл"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+    def save_to_json(self, data: Dict[str, Any], filename: str, compact: bool = False):
+        """Сохранить данные в JSON файл (.gz/.zst - со сжатием, compact - без отступов)"""
+        # json.dumps кодирует на C (json.dump всегда идет через Python кодировщик)
+        if compact:
+            text = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+        else:
+            text = json.dumps(data, indent=2, ensure_ascii=False, default=_json_default)
+        with open_output_file(filename) as f:
+            f.write(text)
         print(f"Данные сохранены в {filename}")
 
     def save_forks_to_csv(self, forks: List[Dict[str, Any]], filename: str):
@@ -1003,7 +4333,7 @@ class GitHubDataCollector:
             'parent_nameWithOwner', 'parent_url'
         ]
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_output_file(filename) as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             writer.writeheader()
 
@@ -1041,7 +4371,7 @@ class GitHubDataCollector:
             'comments_totalCount', 'labels'
         ]
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_output_file(filename) as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             writer.writeheader()
 
@@ -1077,7 +4407,7 @@ class GitHubDataCollector:
         print("Получение статистики профиля...")
 
         query = """
-        query($username: String!) {
+        query UserProfileStats($username: String!) {
           user(login: $username) {
             login
             name
@@ -1184,55 +4514,40 @@ class GitHubDataCollector:
             "activity_trends": activity_trends
         }
 
+        # Календарь вкладов по дням: за все годы с регистрации или за последний год
+        if self.all_years_contributions and user.get("createdAt"):
+            calendar = self.get_contribution_history(user["createdAt"])
+            activity_trends["history"] = self._summarize_contribution_history(calendar)
+        else:
+            calendar = ContributionCalendar.from_weeks(
+                user.get("contributionsCollection", {}).get("contributionCalendar", {}).get("weeks", [])
+            )
+        profile_stats["contribution_days"] = calendar.to_dict()
+
         print("Статистика профиля получена")
         return profile_stats
 
     def _get_user_languages(self) -> Dict[str, Any]:
-        """Получить статистику языков программирования пользователя"""
+        """Получить статистику языков программирования пользователя (100 самых популярных репозиториев)"""
         print("Анализ языков программирования...")
 
-        query = """
-        query($username: String!) {
-          user(login: $username) {
-            repositories(first: 100, isFork: false, orderBy: {field: STARGAZERS, direction: DESC}) {
-              nodes {
-                primaryLanguage {
-                  name
-                }
-                languages(first: 10, orderBy: {field: SIZE, direction: DESC}) {
-                  edges {
-                    size
-                    node {
-                      name
-                    }
-                  }
-                  totalSize
-                }
-              }
-            }
-          }
-        }
-        """
-
-        variables = {"username": self.username}
-        result = self._make_graphql_request(query, variables)
+        top_repos = [repo for repo in self.get_repositories_stars_sorted() if not repo.get("isFork")][:100]
 
         languages_stats = {}
         total_size = 0
 
-        if result.get("user") and result["user"].get("repositories"):
-            for repo in result["user"]["repositories"]["nodes"]:
-                if repo.get("languages"):
-                    for lang in repo["languages"]["edges"]:
-                        lang_name = lang["node"]["name"]
-                        lang_size = lang["size"]
+        for repo in top_repos:
+            if repo.get("languages"):
+                for lang in repo["languages"]["edges"]:
+                    lang_name = lang["node"]["name"]
+                    lang_size = lang["size"]
 
-                        if lang_name in languages_stats:
-                            languages_stats[lang_name] += lang_size
-                        else:
-                            languages_stats[lang_name] = lang_size
+                    if lang_name in languages_stats:
+                        languages_stats[lang_name] += lang_size
+                    else:
+                        languages_stats[lang_name] = lang_size
 
-                        total_size += lang_size
+                    total_size += lang_size
 
         # Преобразуем в проценты и сортируем
         languages_percent = {}
@@ -1251,106 +4566,41 @@ class GitHubDataCollector:
         """Получить топ репозиториев по звездам и форкам"""
         print("Получение топ репозиториев...")
 
-        query = """
-        query($username: String!) {
-          user(login: $username) {
-            topRepositories(first: 10, orderBy: {field: STARGAZERS, direction: DESC}) {
-              nodes {
-                nameWithOwner
-                description
-                url
-                stargazerCount
-                forkCount
-                primaryLanguage {
-                  name
-                }
-                createdAt
-                updatedAt
-                isArchived
-                isFork
-              }
-            }
-          }
-        }
-        """
-
-        variables = {"username": self.username}
-        result = self._make_graphql_request(query, variables)
-
         top_repos = []
-        if result.get("user") and result["user"].get("topRepositories"):
-            for repo in result["user"]["topRepositories"]["nodes"]:
-                if not repo.get("isFork"):  # Только собственные репозитории
-                    top_repos.append({
-                        "name": repo.get("nameWithOwner"),
-                        "description": repo.get("description"),
-                        "url": repo.get("url"),
-                        "stars": repo.get("stargazerCount", 0),
-                        "forks": repo.get("forkCount", 0),
-                        "language": repo.get("primaryLanguage", {}).get("name") if repo.get("primaryLanguage") else None,
-                        "created_at": repo.get("createdAt"),
-                        "updated_at": repo.get("updatedAt"),
-                        "is_archived": repo.get("isArchived", False)
-                    })
+        for repo in self.get_repositories_stars_sorted()[:10]:
+            if not repo.get("isFork"):  # Только собственные репозитории
+                top_repos.append({
+                    "name": repo.get("nameWithOwner"),
+                    "description": repo.get("description"),
+                    "url": repo.get("url"),
+                    "stars": repo.get("stargazerCount", 0),
+                    "forks": repo.get("forkCount", 0),
+                    "language": repo.get("primaryLanguage", {}).get("name") if repo.get("primaryLanguage") else None,
+                    "created_at": repo.get("createdAt"),
+                    "updated_at": repo.get("updatedAt"),
+                    "is_archived": repo.get("isArchived", False)
+                })
 
         return top_repos
 
     def _analyze_activity_trends(self, contributions: Dict[str, Any]) -> Dict[str, Any]:
         """Анализ трендов активности"""
-        calendar = contributions.get("contributionCalendar", {})
-        weeks = calendar.get("weeks", [])
+        weeks = contributions.get("contributionCalendar", {}).get("weeks", [])
 
         # Анализ последних 52 недель (год)
         recent_weeks = weeks[-52:] if len(weeks) > 52 else weeks
+        calendar = ContributionCalendar.from_weeks(recent_weeks)
 
-        weekly_contributions = []
-        monthly_contributions = {}
-        daily_patterns = {i: 0 for i in range(7)}  # 0-6: Понедельник-Воскресенье
-
-        total_contributions = 0
-        active_days = 0
-        max_daily = 0
+        total_contributions = calendar.total()
+        active_days = calendar.active_days()
 
-        for week in recent_weeks:
-            week_total = 0
-            for day in week.get("contributionDays", []):
-                count = day.get("contributionCount", 0)
-                date_str = day.get("date", "")
-
-                if count > 0:
-                    active_days += 1
-                    total_contributions += count
-                    week_total += count
-                    max_daily = max(max_daily, count)
-
-                # Анализ по дням недели (0 = Понедельник, 6 = Воскресенье)
-                if date_str:
-                    try:
-                        date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                        weekday = date_obj.weekday()  # 0 = Понедельник
-                        daily_patterns[weekday] += count
-                    except:
-                        pass
-
-                # Анализ по месяцам
-                if date_str:
-                    try:
-                        month_key = date_str[:7]  # YYYY-MM
-                        if month_key in monthly_contributions:
-                            monthly_contributions[month_key] += count
-                        else:
-                            monthly_contributions[month_key] = count
-                    except:
-                        pass
-
-            weekly_contributions.append(week_total)
-
-        # Находим самый активный день недели
-        most_active_day = max(daily_patterns.items(), key=lambda x: x[1])[0]
+        # Находим самый активный день недели (0 = Понедельник, 6 = Воскресенье)
+        daily_patterns = calendar.weekday_totals()
+        most_active_day = max(range(7), key=lambda weekday: daily_patterns[weekday])
         day_names = ["Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресенье"]
 
         # Средняя активность
-        avg_weekly = sum(weekly_contributions) / len(weekly_contributions) if weekly_contributions else 0
+        avg_weekly = total_contributions / len(recent_weeks) if recent_weeks else 0
         avg_daily = total_contributions / len(recent_weeks) / 7 if recent_weeks else 0
 
         return {
@@ -1358,80 +4608,193 @@ class GitHubDataCollector:
             "active_days_last_year": active_days,
             "average_weekly_contributions": round(avg_weekly, 1),
             "average_daily_contributions": round(avg_daily, 1),
-            "max_daily_contributions": max_daily,
-            "most_active_day": day_names[most_active_day] if most_active_day < len(day_names) else "Unknown",
-            "monthly_contributions": dict(sorted(monthly_contributions.items())),
+            "max_daily_contributions": calendar.max_daily(),
+            "most_active_day": day_names[most_active_day],
+            "monthly_contributions": calendar.monthly_totals(),
             "consistency_score": round((active_days / (len(recent_weeks) * 7)) * 100, 1) if recent_weeks else 0
         }
 
-    def get_user_repositories(self) -> List[Dict[str, Any]]:
+    def get_contribution_history(self, created_at: str) -> ContributionCalendar:
+        """
+        Получить вклады за все годы с регистрации одним GraphQL запросом
+
+        contributionsCollection охватывает не больше года, поэтому каждый год
+        запрашивается отдельным алиасом (y2018: contributionsCollection(from:, to:)),
+        а дни всех лет объединяются в один календарь.
+
+        Args:
+            created_at: Дата регистрации пользователя (ISO 8601)
+        """
+        first_year = int(created_at[:4])
+        now = datetime(*time.gmtime()[:6])
+        print(f"Получение истории вкладов за {now.year - first_year + 1} лет...")
+
+        declarations = []
+        selections = []
+        variables = {"username": self.username}
+        for year in range(first_year, now.year + 1):
+            declarations.append(f"$from{year}: DateTime!, $to{year}: DateTime!")
+            selections.append(
+                f"y{year}: contributionsCollection(from: $from{year}, to: $to{year}) {{ "
+                f"contributionCalendar {{ weeks {{ contributionDays {{ contributionCount date }} }} }} }}"
+            )
+            variables[f"from{year}"] = created_at if year == first_year else f"{year}-01-01T00:00:00Z"
+            variables[f"to{year}"] = now.isoformat() + "Z" if year == now.year else f"{year}-12-31T23:59:59Z"
+
+        query = (
+            f"query UserContributionHistory($username: String!, {', '.join(declarations)}) {{\n"
+            f"  user(login: $username) {{\n    " + "\n    ".join(selections) + "\n  }\n}"
+        )
+        result = self._make_graphql_request(query, variables)
+
+        calendar = ContributionCalendar()
+        for year in range(first_year, now.year + 1):
+            collection = (result.get("user") or {}).get(f"y{year}") or {}
+            calendar.merge(ContributionCalendar.from_weeks(collection.get("contributionCalendar", {}).get("weeks", [])))
+        return calendar
+
+    @staticmethod
+    def _summarize_contribution_history(calendar: ContributionCalendar) -> Dict[str, Any]:
+        """Сводка многолетнего календаря вкладов по годам, месяцам и дням недели"""
+        day_names = ["Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресенье"]
+        weekly = calendar.weekly_totals()
+        return {
+            "since": calendar.start.isoformat() if calendar.start else None,
+            "until": calendar.end.isoformat() if calendar.end else None,
+            "total_contributions": calendar.total(),
+            "active_days": calendar.active_days(),
+            "max_daily_contributions": calendar.max_daily(),
+            "max_weekly_contributions": max(weekly, default=0),
+            "average_weekly_contributions": round(sum(weekly) / len(weekly), 1) if weekly else 0,
+            "yearly_contributions": calendar.yearly_totals(),
+            "monthly_contributions": calendar.monthly_totals(),
+            "weekday_contributions": dict(zip(day_names, calendar.weekday_totals()))
+        }
+
+    def get_user_repositories(self, updated_after: str = None) -> List[Dict[str, Any]]:
         """
         Получить все собственные репозитории пользователя (не форки)
 
+        Полный список берется из снимка repository_snapshot: он запрашивается
+        один раз (со всеми полями, нужными анализам) и переиспользуется до
+        явного сброса.
+
+        Args:
+            updated_after: Вернуть только репозитории, измененные после этой даты
+                (ISO 8601). Запрашиваются напрямую по убыванию updatedAt, и
+                пагинация останавливается на первом неизмененном
+
         Returns:
             Список собственных репозиториев
         """
+        if updated_after:
+            return self._fetch_user_repositories(updated_after)
+        return list(self.repository_snapshot.get())
+
+    def _fetch_user_repositories(self, updated_after: str = None) -> List[Dict[str, Any]]:
+        """Постраничный запрос собственных репозиториев со всеми полями снимка"""
         print("Получение собственных репозиториев пользователя...")
 
-        repositories = []
-        cursor = None
+        checkpoint_key = f"user_repos:{updated_after or ''}"
+        repositories, cursor, done = self._resume_connection(checkpoint_key, "user_repos")
+        if done:
+            return repositories
 
-        while True:
-            query = """
-            query($username: String!, $after: String) {
-              user(login: $username) {
-                repositories(
-                  first: 100,
-                  isFork: false,
-                  orderBy: {field: CREATED_AT, direction: DESC},
-                  after: $after
-                ) {
+        total_count = None
+        order_by = {"field": "UPDATED_AT" if updated_after else "CREATED_AT", "direction": "DESC"}
+
+        query = """
+        query UserRepositories($username: String!, $after: String, $orderBy: RepositoryOrder, $first: Int!) {
+          user(login: $username) {
+            repositories(
+              first: $first,
+              isFork: false,
+              orderBy: $orderBy,
+              after: $after
+            ) {
+              totalCount
+              nodes {
+                name
+                nameWithOwner
+                url
+                createdAt
+                updatedAt
+                pushedAt
+                description
+                primaryLanguage {
+                  name
+                }
+                forkCount
+                stargazerCount
+                watchers {
+                  totalCount
+                }
+                issues(states: OPEN) {
+                  totalCount
+                }
+                isArchived
+                isFork
+                diskUsage
+                licenseInfo {
+                  name
+                }
+                repositoryTopics(first: 20) {
                   nodes {
-                    name
-                    nameWithOwner
-                    url
-                    createdAt
-                    description
-                    forkCount
-                    stargazerCount
-                    repositoryTopics(first: 10) {
-                      nodes {
-                        topic {
-                          name
-                        }
-                      }
+                    topic {
+                      name
                     }
                   }
-                  pageInfo {
-                    hasNextPage
-                    endCursor
+                }
+                languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+                  edges {
+                    size
+                    node {
+                      name
+                    }
                   }
+                  totalSize
                 }
               }
+              pageInfo {
+                hasNextPage
+                endCursor
+              }
             }
-            """
-
-            variables = {
-                "username": self.username,
-                "after": cursor
-            }
+          }
+        }
+        """
 
-            result = self._make_graphql_request(query, variables)
+        variables = {
+            "username": self.username,
+            "orderBy": order_by
+        }
 
-            if not result.get("user") or not result["user"].get("repositories"):
-                break
+        # Инкрементальный запуск обычно заканчивается на первой странице - без предзагрузки
+        pages = self.paginate("user_repos", query, variables, ("user", "repositories"), after=cursor,
+                              nested=(20, 100), prefetch=not updated_after)
+        for page in pages.pages():
+            page_repos = page.records
+            total_count = page.total_count
+
+            if updated_after:
+                changed = [repo for repo in page_repos if (repo.get("updatedAt") or "") > updated_after]
+                reached_watermark = len(changed) < len(page_repos)
+                page_repos = changed
+            else:
+                reached_watermark = False
 
-            repos = result["user"]["repositories"]
-            page_repos = repos["nodes"]
             repositories.extend(page_repos)
 
             print(f"Порция: найдено {len(page_repos)} репозиториев (всего: {len(repositories)})")
 
-            # Проверяем, есть ли еще страницы
-            if not repos["pageInfo"]["hasNextPage"]:
+            cursor = page.end_cursor or cursor
+            self._checkpoint_page(checkpoint_key, page_repos, cursor, total_count)
+
+            if reached_watermark:
                 break
 
-            cursor = repos["pageInfo"]["endCursor"]
+        self._checkpoint_done(checkpoint_key)
+        self.connection_state["user_repos"] = {"end_cursor": cursor, "total_count": total_count}
 
         print(f"Всего найдено собственных репозиториев: {len(repositories)}")
         return repositories
@@ -1445,91 +4808,24 @@ class GitHubDataCollector:
         """
         print("Получение репозиториев отсортированных по звездам...")
 
-        repositories = []
-        cursor = None
-
-        max_pages = 5  # Ограничение для избежания перегрузки API
-        page_count = 0
-
-        while page_count < max_pages:
-            # Упрощенный запрос для избежания 502 ошибки
-            query = """
-            query($username: String!, $after: String) {
-              user(login: $username) {
-                repositories(
-                  first: 30,  # Уменьшили размер страницы
-                  isFork: false,
-                  orderBy: {field: STARGAZERS, direction: DESC},
-                  after: $after
-                ) {
-                  nodes {
-                    name
-                    nameWithOwner
-                    url
-                    createdAt
-                    description
-                    primaryLanguage {
-                      name
-                    }
-                    forkCount
-                    stargazerCount
-                    isArchived
-                    diskUsage
-                  }
-                  pageInfo {
-                    hasNextPage
-                    endCursor
-                  }
-                }
-              }
-            }
-            """
-
-            variables = {
-                "username": self.username,
-                "after": cursor
-            }
-
-            try:
-                result = self._make_graphql_request(query, variables)
-
-                if not result.get("user") or not result["user"].get("repositories"):
-                    break
-
-                repos = result["user"]["repositories"]
-                page_repos = repos["nodes"]
-                repositories.extend(page_repos)
-
-                print(f"Порция {page_count + 1}: найдено {len(page_repos)} репозиториев (всего: {len(repositories)})")
-
-                # Проверяем, есть ли еще страницы
-                if not repos["pageInfo"]["hasNextPage"]:
-                    break
-
-                cursor = repos["pageInfo"]["endCursor"]
-                page_count += 1
-
-                # Небольшая пауза между запросами
-                time.sleep(0.5)
-
-            except Exception as e:
-                print(f"Ошибка при получении страницы {page_count + 1}: {e}")
-                break
+        repositories = self.get_user_repositories()
 
         print(f"Всего найдено репозиториев: {len(repositories)}")
 
-        # Сортируем по количеству звезд (на всякий случай, хотя GraphQL уже сортирует)
         repositories.sort(key=lambda x: x.get('stargazerCount', 0), reverse=True)
 
         return repositories
 
-    def save_repositories_stars_to_csv(self, repositories: List[Dict[str, Any]], filename: str):
-        """Сохранить репозитории отсортированные по звездам в CSV"""
+    def save_repositories_stars_to_csv(self, repositories: List[Dict[str, Any]], filename: str,
+                                       summary: Optional[Dict[str, Any]] = None):
+        """Сохранить репозитории отсортированные по звездам в CSV (summary - итоги summarize_repositories)"""
         if not repositories:
             print("Нет репозиториев для сохранения")
             return
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        summary = summary or summarize_repositories(repositories)
+
+        with open_output_file(filename) as csvfile:
             writer = csv.writer(csvfile)
 
             writer.writerow(["Репозитории отсортированные по звездам (⭐)"])
@@ -1567,31 +4863,25 @@ class GitHubDataCollector:
             writer.writerow([])
             writer.writerow(["=== СТАТИСТИКА ==="])
 
-            total_stars = sum(repo.get('stargazerCount', 0) for repo in repositories)
-            total_forks = sum(repo.get('forkCount', 0) for repo in repositories)
-            total_size = sum(repo.get('diskUsage', 0) for repo in repositories) / 1024 / 1024  # в MB
+            total_stars = summary["total_stars"]
+            total_size = summary["total_disk_usage"] / 1024 / 1024  # в MB
 
-            writer.writerow(["Всего репозиториев", len(repositories)])
+            writer.writerow(["Всего репозиториев", summary["count"]])
             writer.writerow(["Всего звезд", total_stars])
-            writer.writerow(["Всего форков", total_forks])
-            writer.writerow(["Среднее звезд на репозиторий", round(total_stars / len(repositories), 2) if repositories else 0])
+            writer.writerow(["Всего форков", summary["total_forks"]])
+            writer.writerow(["Среднее звезд на репозиторий", round(total_stars / summary["count"], 2) if summary["count"] else 0])
             writer.writerow(["Общий размер репозиториев", f"{round(total_size, 2)} MB"])
 
             # Топ по звездам
-            if repositories:
-                top_repo = repositories[0]
+            top_repo = summary["top_repo"]
+            if top_repo:
                 writer.writerow(["Топ репозиторий по звездам", f"{top_repo.get('nameWithOwner')} ({top_repo.get('stargazerCount', 0)} ⭐)"])
 
             # Распределение по языкам
             writer.writerow([])
             writer.writerow(["=== РАСПРЕДЕЛЕНИЕ ПО ЯЗЫКАМ ==="])
 
-            languages = {}
-            for repo in repositories:
-                lang = repo.get('primaryLanguage', {}).get('name', 'Unknown') if repo.get('primaryLanguage') else 'Unknown'
-                languages[lang] = languages.get(lang, 0) + 1
-
-            sorted_languages = sorted(languages.items(), key=lambda x: x[1], reverse=True)
+            sorted_languages = sorted(summary["languages"].items(), key=lambda x: x[1], reverse=True)
             for lang, count in sorted_languages[:10]:  # Топ 10 языков
                 writer.writerow([lang, count])
 
@@ -1615,58 +4905,13 @@ class GitHubDataCollector:
         except ValueError:
             return {"error": f"Неверный формат репозитория: {repo_name}"}
 
-        # Упрощенный запрос для избежания перегрузки API
         query = """
-        query($owner: String!, $name: String!) {
+        query RepositoryAnalytics($owner: String!, $name: String!) {
           repository(owner: $owner, name: $name) {
-            nameWithOwner
-            description
-            createdAt
-            updatedAt
-            pushedAt
-            isArchived
-            isPrivate
-            isFork
-            forkCount
-            stargazerCount
-            watchers {
-              totalCount
-            }
-            primaryLanguage {
-              name
-            }
-            languages(first: 5, orderBy: {field: SIZE, direction: DESC}) {
-              totalSize
-              edges {
-                size
-                node {
-                  name
-                }
-              }
-            }
-            diskUsage
-            issues(states: [OPEN, CLOSED]) {
-              totalCount
-            }
-            pullRequests(states: [OPEN, CLOSED, MERGED]) {
-              totalCount
-            }
-            releases {
-              totalCount
-            }
-            licenseInfo {
-              name
-            }
-            repositoryTopics(first: 5) {
-              nodes {
-                topic {
-                  name
-                }
-              }
-            }
+            ...RepositoryAnalyticsFields
           }
         }
-        """
+        """ + REPOSITORY_ANALYTICS_FRAGMENT
 
         variables = {"owner": owner, "name": name}
 
@@ -1676,66 +4921,148 @@ class GitHubDataCollector:
             if not result.get("repository"):
                 return {"error": f"Репозиторий {repo_name} не найден"}
 
-            repo = result["repository"]
+            return self._build_repository_analytics(result["repository"])
 
-            # Расчет дополнительных метрик
-            analytics = {
-                "basic_info": {
-                    "name": repo.get("nameWithOwner"),
-                    "description": repo.get("description"),
-                    "created_at": repo.get("createdAt"),
-                    "updated_at": repo.get("updatedAt"),
-                    "pushed_at": repo.get("pushedAt"),
-                    "is_archived": repo.get("isArchived"),
-                    "is_private": repo.get("isPrivate"),
-                    "is_fork": repo.get("isFork")
-                },
-                "popularity": {
-                    "stars": repo.get("stargazerCount", 0),
-                    "forks": repo.get("forkCount", 0),
-                    "watchers": repo.get("watchers", {}).get("totalCount", 0)
-                },
-                "activity": {
-                    "total_commits": repo.get("defaultBranchRef", {}).get("target", {}).get("history", {}).get("totalCount", 0),
-                    "issues_total": repo.get("issues", {}).get("totalCount", 0),
-                    "pull_requests_total": repo.get("pullRequests", {}).get("totalCount", 0),
-                    "releases_total": repo.get("releases", {}).get("totalCount", 0),
-                    "tags_total": repo.get("tags", {}).get("totalCount", 0)
-                },
-                "technical": {
-                    "primary_language": repo.get("primaryLanguage", {}).get("name") if repo.get("primaryLanguage") else None,
-                    "disk_usage_kb": round(repo.get("diskUsage", 0) / 1024, 1) if repo.get("diskUsage") else 0,
-                    "license": repo.get("licenseInfo", {}).get("name") if repo.get("licenseInfo") else None,
-                    "collaborators": repo.get("collaborators", {}).get("totalCount", 0),
-                    "contributors": repo.get("mentionableUsers", {}).get("totalCount", 0),
-                    "vulnerabilities": repo.get("vulnerabilityAlerts", {}).get("totalCount", 0)
-                },
-                "topics": [node["topic"]["name"] for node in repo.get("repositoryTopics", {}).get("nodes", [])],
-                "languages": self._analyze_repo_languages(repo.get("languages", {}))
-            }
+        except Exception as e:
+            return {"error": f"Ошибка при получении аналитики для {repo_name}: {str(e)}"}
+
+    def get_repositories_analytics_batch(self, repo_names: List[str]) -> List[Dict[str, Any]]:
+        """
+        Получить детальную аналитику по нескольким репозиториям одним GraphQL запросом
+
+        Каждый репозиторий запрашивается через отдельный алиас
+        (r0: repository(...), r1: repository(...), ...).
+
+        Args:
+            repo_names: Полные имена репозиториев (owner/name)
+
+        Returns:
+            Аналитика в том же порядке, что и repo_names
+            (для ненайденных репозиториев - словарь с ключом "error")
+        """
+        declarations = []
+        selections = []
+        variables = {}
+        aliases = {}
+
+        for i, repo_name in enumerate(repo_names):
+            try:
+                owner, name = repo_name.split('/', 1)
+            except ValueError:
+                continue
+            declarations.append(f"$o{i}: String!, $n{i}: String!")
+            selections.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepositoryAnalyticsFields }}")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+            aliases[repo_name] = f"r{i}"
+
+        results = []
+
+        if aliases:
+            query = (
+                f"query RepositoryAnalyticsBatch({', '.join(declarations)}) {{\n"
+                + "\n".join(selections)
+                + "\nrateLimit { cost remaining resetAt }\n}\n"
+                + REPOSITORY_ANALYTICS_FRAGMENT
+            )
+
+            try:
+                data = self._make_graphql_request(query, variables, allow_partial=True)
+            except Exception as e:
+                return [{"error": f"Ошибка при получении аналитики для {repo_name}: {str(e)}"} for repo_name in repo_names]
+
+            if data.get("rateLimit"):
+                self.graphql_rate_limit = data["rateLimit"]
+        else:
+            data = {}
+
+        for repo_name in repo_names:
+            alias = aliases.get(repo_name)
+            if alias is None:
+                results.append({"error": f"Неверный формат репозитория: {repo_name}"})
+            elif not data.get(alias):
+                results.append({"error": f"Репозиторий {repo_name} не найден"})
+            else:
+                results.append(self._build_repository_analytics(data[alias]))
+
+        return results
+
+    def _plan_analytics_batch_size(self, requested: int = None) -> int:
+        """
+        Подобрать количество алиасов в пакетном запросе по бюджету стоимости GraphQL
+
+        Args:
+            requested: Желаемый размер пакета (None = максимальный в рамках бюджета)
 
-            # Расчет производных метрик
-            analytics["ratios"] = {
-                "forks_to_stars_ratio": round(repo.get("forkCount", 0) / max(repo.get("stargazerCount", 1), 1), 2),
-                "issues_to_stars_ratio": round(repo.get("issues", {}).get("totalCount", 0) / max(repo.get("stargazerCount", 1), 1), 2),
-                "activity_score": round((repo.get("stargazerCount", 0) + repo.get("forkCount", 0) + repo.get("watchers", {}).get("totalCount", 0)) / max(repo.get("diskUsage", 1), 1) * 1000, 2)
-            }
+        Returns:
+            Количество репозиториев в одном запросе
+        """
+        by_cost = max(1, ANALYTICS_MAX_QUERY_COST * 100 // ANALYTICS_CONNECTIONS_PER_REPO)
+        batch_size = min(requested or by_cost, by_cost, ANALYTICS_MAX_ALIASES)
 
-            # Возраст проекта
-            if repo.get("createdAt"):
-                created_date = datetime.fromisoformat(repo["createdAt"].replace('Z', '+00:00'))
-                now = datetime.now(created_date.tzinfo)
-                age_days = (now - created_date).days
-                analytics["age"] = {
-                    "days": age_days,
-                    "months": round(age_days / 30, 1),
-                    "years": round(age_days / 365, 1)
-                }
+        # При исчерпании бюджета уменьшаем пакет, чтобы стоимость запроса в него уложилась
+        remaining = self.graphql_rate_limit.get("remaining")
+        if remaining is not None:
+            batch_size = min(batch_size, max(1, remaining * 100 // ANALYTICS_CONNECTIONS_PER_REPO))
 
-            return analytics
+        return batch_size
 
-        except Exception as e:
-            return {"error": f"Ошибка при получении аналитики для {repo_name}: {str(e)}"}
+    def _build_repository_analytics(self, repo: Dict[str, Any]) -> Dict[str, Any]:
+        """Рассчитать аналитику по данным репозитория из GraphQL ответа"""
+        analytics = {
+            "basic_info": {
+                "name": repo.get("nameWithOwner"),
+                "description": repo.get("description"),
+                "created_at": repo.get("createdAt"),
+                "updated_at": repo.get("updatedAt"),
+                "pushed_at": repo.get("pushedAt"),
+                "is_archived": repo.get("isArchived"),
+                "is_private": repo.get("isPrivate"),
+                "is_fork": repo.get("isFork")
+            },
+            "popularity": {
+                "stars": repo.get("stargazerCount", 0),
+                "forks": repo.get("forkCount", 0),
+                "watchers": repo.get("watchers", {}).get("totalCount", 0)
+            },
+            "activity": {
+                "total_commits": repo.get("defaultBranchRef", {}).get("target", {}).get("history", {}).get("totalCount", 0),
+                "issues_total": repo.get("issues", {}).get("totalCount", 0),
+                "pull_requests_total": repo.get("pullRequests", {}).get("totalCount", 0),
+                "releases_total": repo.get("releases", {}).get("totalCount", 0),
+                "tags_total": repo.get("tags", {}).get("totalCount", 0)
+            },
+            "technical": {
+                "primary_language": repo.get("primaryLanguage", {}).get("name") if repo.get("primaryLanguage") else None,
+                "disk_usage_kb": round(repo.get("diskUsage", 0) / 1024, 1) if repo.get("diskUsage") else 0,
+                "license": repo.get("licenseInfo", {}).get("name") if repo.get("licenseInfo") else None,
+                "collaborators": repo.get("collaborators", {}).get("totalCount", 0),
+                "contributors": repo.get("mentionableUsers", {}).get("totalCount", 0),
+                "vulnerabilities": repo.get("vulnerabilityAlerts", {}).get("totalCount", 0)
+            },
+            "topics": [node["topic"]["name"] for node in repo.get("repositoryTopics", {}).get("nodes", [])],
+            "languages": self._analyze_repo_languages(repo.get("languages", {}))
+        }
+
+        # Расчет производных метрик
+        analytics["ratios"] = {
+            "forks_to_stars_ratio": round(repo.get("forkCount", 0) / max(repo.get("stargazerCount", 1), 1), 2),
+            "issues_to_stars_ratio": round(repo.get("issues", {}).get("totalCount", 0) / max(repo.get("stargazerCount", 1), 1), 2),
+            "activity_score": round((repo.get("stargazerCount", 0) + repo.get("forkCount", 0) + repo.get("watchers", {}).get("totalCount", 0)) / max(repo.get("diskUsage", 1), 1) * 1000, 2)
+        }
+
+        # Возраст проекта
+        if repo.get("createdAt"):
+            created_date = datetime.fromisoformat(repo["createdAt"].replace('Z', '+00:00'))
+            now = datetime.now(created_date.tzinfo)
+            age_days = (now - created_date).days
+            analytics["age"] = {
+                "days": age_days,
+                "months": round(age_days / 30, 1),
+                "years": round(age_days / 365, 1)
+            }
+
+        return analytics
 
     def _analyze_repo_languages(self, languages_data: Dict[str, Any]) -> Dict[str, Any]:
         """Анализ языков для конкретного репозитория"""
@@ -1759,14 +5086,15 @@ class GitHubDataCollector:
             "total_size_kb": round(total_size / 1024, 1)
         }
 
-    def get_top_repositories_analytics(self, repos_list: List[Dict[str, Any]], limit: int = None, batch_size: int = 3) -> List[Dict[str, Any]]:
+    def get_top_repositories_analytics(self, repos_list: List[Dict[str, Any]], limit: int = None, batch_size: int = None) -> List[Dict[str, Any]]:
         """
         Получить детальную аналитику для списка репозиториев
 
         Args:
             repos_list: Список репозиториев для анализа
             limit: Максимальное количество репозиториев (None = все из списка)
-            batch_size: Размер батча для обработки (меньше = меньше нагрузки на API)
+            batch_size: Количество репозиториев в одном GraphQL запросе
+                        (None = подобрать по бюджету стоимости запроса)
 
         Returns:
             Список с детальной аналитикой репозиториев
@@ -1777,48 +5105,37 @@ class GitHubDataCollector:
         else:
             repos_to_analyze = repos_list[:limit]
 
-        total_to_analyze = len(repos_to_analyze)
+        repo_names = [repo.get("nameWithOwner") for repo in repos_to_analyze if repo.get("nameWithOwner")]
+        total_to_analyze = len(repo_names)
 
         if total_to_analyze == 0:
             print("Нет репозиториев для анализа")
             return []
 
-        print(f"Получение детальной аналитики для {total_to_analyze} репозиториев (батчами по {batch_size})...")
+        print(f"Получение детальной аналитики для {total_to_analyze} репозиториев (пакетные GraphQL запросы)...")
 
         analytics = []
+        batch_start = 0
+        batch_number = 0
 
-        # Обрабатываем батчами для контроля нагрузки на API
-        for batch_start in range(0, total_to_analyze, batch_size):
-            batch_end = min(batch_start + batch_size, total_to_analyze)
-            batch_repos = repos_to_analyze[batch_start:batch_end]
-
-            print(f"Обработка батча {batch_start//batch_size + 1}/{(total_to_analyze + batch_size - 1)//batch_size}: {batch_start+1}-{batch_end}")
-
-            batch_analytics = []
-            for i, repo in enumerate(batch_repos):
-                repo_name = repo.get("nameWithOwner")
-                stars = repo.get("stargazerCount", 0)
-                if repo_name:
-                    print(f"  Анализ {batch_start + i + 1}/{total_to_analyze}: {repo_name} ({stars}⭐)")
-                    repo_analytics = self.get_repository_analytics(repo_name)
-                    if "error" not in repo_analytics:
-                        batch_analytics.append(repo_analytics)
-                    else:
-                        print(f"  Пропускаем {repo_name}: {repo_analytics.get('error', 'Unknown error')}")
+        while batch_start < total_to_analyze:
+            # Размер пакета пересчитывается по оставшемуся бюджету после каждого запроса
+            current_batch_size = self._plan_analytics_batch_size(batch_size)
+            batch_end = min(batch_start + current_batch_size, total_to_analyze)
+            batch_names = repo_names[batch_start:batch_end]
+            batch_number += 1
 
-                    # Пауза между запросами в батче
-                    if i < len(batch_repos) - 1:
-                        time.sleep(2.5)  # Увеличенная пауза для надежности
+            print(f"Пакет {batch_number}: репозитории {batch_start + 1}-{batch_end} из {total_to_analyze}")
 
-            analytics.extend(batch_analytics)
+            for repo_name, repo_analytics in zip(batch_names, self._get_analytics_batch_checkpointed(batch_names)):
+                if "error" not in repo_analytics:
+                    analytics.append(repo_analytics)
+                else:
+                    print(f"  Пропускаем {repo_name}: {repo_analytics.get('error', 'Unknown error')}")
 
-            # Пауза между батчами
-            if batch_end < total_to_analyze:
-                batch_pause = min(batch_size * 3, 15)  # Максимум 15 секунд между батчами
-                print(f"Пауза между батчами... ({batch_pause} сек)")
-                time.sleep(batch_pause)
+            batch_start = batch_end
 
-        print(f"Полный анализ завершен: {len(analytics)}/{total_to_analyze} репозиториев")
+        print(f"Полный анализ завершен: {len(analytics)}/{total_to_analyze} репозиториев за {batch_number} запросов")
         return analytics
 
     def save_repository_analytics_to_csv(self, analytics: List[Dict[str, Any]], filename: str):
@@ -1827,7 +5144,7 @@ class GitHubDataCollector:
             print("Нет данных аналитики для сохранения")
             return
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_output_file(filename) as csvfile:
             writer = csv.writer(csvfile)
 
             writer.writerow(["Детальная аналитика репозиториев"])
@@ -1918,149 +5235,127 @@ class GitHubDataCollector:
         """
         print("Анализ starred репозиториев...")
 
-        starred = []
-        cursor = None
+        # Статистика считается по страницам по мере их получения
+        aggregator = StarredRepositoriesAggregator()
+        starred = self.get_starred_repositories(on_page=aggregator.add)
 
-        while True:
-            query = """
-            query($username: String!, $after: String) {
-              user(login: $username) {
-                starredRepositories(first: 100, after: $after, orderBy: {field: STARRED_AT, direction: DESC}) {
-                  nodes {
-                    nameWithOwner
-                    description
-                    stargazerCount
-                    forkCount
-                    primaryLanguage {
-                      name
-                    }
-                    createdAt
-                    updatedAt
-                    owner {
-                      login
-                      __typename
-                    }
-                    repositoryTopics(first: 5) {
-                      nodes {
-                        topic {
-                          name
-                        }
+        print(f"Всего starred репозиториев: {len(starred)}")
+
+        analysis = aggregator.result(NDJSONDatasetView(starred, self._summarize_starred_repository))
+
+        return {
+            "starred_repositories": starred,
+            "analysis": analysis
+        }
+
+    def get_starred_repositories(self, starred_after: str = None,
+                                 on_page: Callable[[List[Dict[str, Any]]], None] = None) -> List[Dict[str, Any]]:
+        """
+        Получить репозитории, отмеченные звездочкой, от новых к старым
+
+        Каждый репозиторий дополняется полем starredAt - датой установки звезды.
+
+        Args:
+            starred_after: Вернуть только звезды, поставленные после этой даты (ISO 8601)
+            on_page: Вызывается для каждой полученной порции (и для восстановленных из чекпоинта записей)
+        """
+        checkpoint_key = f"starred:{starred_after or ''}"
+        resumed, cursor, done = self._resume_connection(checkpoint_key, "starred")
+        starred = self._new_records("starred", resumed)
+        if on_page and resumed:
+            on_page(resumed)
+        if done:
+            return starred
+
+        total_count = None
+
+        query = """
+        query UserStarredRepositories($username: String!, $after: String, $first: Int!) {
+          user(login: $username) {
+            starredRepositories(first: $first, after: $after, orderBy: {field: STARRED_AT, direction: DESC}) {
+              totalCount
+              edges {
+                starredAt
+                node {
+                  nameWithOwner
+                  description
+                  stargazerCount
+                  forkCount
+                  primaryLanguage {
+                    name
+                  }
+                  createdAt
+                  updatedAt
+                  owner {
+                    login
+                    __typename
+                  }
+                  repositoryTopics(first: 20) {
+                    nodes {
+                      topic {
+                        name
                       }
                     }
                   }
-                  pageInfo {
-                    hasNextPage
-                    endCursor
-                  }
                 }
               }
+              pageInfo {
+                hasNextPage
+                endCursor
+              }
             }
-            """
-
-            variables = {
-                "username": self.username,
-                "after": cursor
-            }
+          }
+        }
+        """
 
-            result = self._make_graphql_request(query, variables)
+        pages = self.paginate("starred", query, {"username": self.username}, ("user", "starredRepositories"),
+                              after=cursor, nested=(20,), records="edges", prefetch=not starred_after)
+        for page in pages.pages():
+            total_count = page.total_count
+            page_repos = []
+            reached_watermark = False
 
-            if not result.get("user") or not result["user"].get("starredRepositories"):
-                break
+            for edge in page.records:
+                if starred_after and (edge.get("starredAt") or "") <= starred_after:
+                    reached_watermark = True
+                    break
+                page_repos.append({**edge["node"], "starredAt": edge.get("starredAt")})
 
-            repos = result["user"]["starredRepositories"]
-            page_repos = repos["nodes"]
             starred.extend(page_repos)
+            if on_page:
+                on_page(page_repos)
 
             print(f"Порция: найдено {len(page_repos)} starred репозиториев (всего: {len(starred)})")
 
-            # Убираем ограничение, собираем все starred репозитории
-            if not repos["pageInfo"]["hasNextPage"]:
-                break
-
-            cursor = repos["pageInfo"]["endCursor"]
-
-            # Небольшая пауза между запросами
-            time.sleep(0.5)
+            cursor = page.end_cursor or cursor
+            self._checkpoint_page(checkpoint_key, page_repos, cursor, total_count)
 
-        print(f"Всего starred репозиториев: {len(starred)}")
-
-        # Анализ starred репозиториев
-        analysis = self._analyze_starred_repositories(starred)
+            if reached_watermark:
+                break
 
-        return {
-            "starred_repositories": starred,
-            "analysis": analysis
-        }
+        self._checkpoint_done(checkpoint_key)
+        self.connection_state["starred"] = {"end_cursor": cursor, "total_count": total_count}
+        return starred
 
     def _analyze_starred_repositories(self, starred: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Анализ starred репозиториев для понимания интересов пользователя"""
-
-        if not starred:
-            return {"error": "Нет starred репозиториев для анализа"}
-
-        # Анализ по языкам
-        languages = {}
-        for repo in starred:
-            lang = repo.get('primaryLanguage', {}).get('name', 'Unknown') if repo.get('primaryLanguage') else 'Unknown'
-            languages[lang] = languages.get(lang, 0) + 1
-
-        # Анализ по типам владельцев
-        owner_types = {}
-        for repo in starred:
-            owner_type = repo.get('owner', {}).get('__typename', 'Unknown')
-            owner_types[owner_type] = owner_types.get(owner_type, 0) + 1
-
-        # Анализ по популярности (звезды)
-        popularity_ranges = {
-            "0-10": 0,
-            "11-100": 0,
-            "101-1000": 0,
-            "1001-10000": 0,
-            "10000+": 0
-        }
-
-        for repo in starred:
-            stars = repo.get('stargazerCount', 0)
-            if stars <= 10:
-                popularity_ranges["0-10"] += 1
-            elif stars <= 100:
-                popularity_ranges["11-100"] += 1
-            elif stars <= 1000:
-                popularity_ranges["101-1000"] += 1
-            elif stars <= 10000:
-                popularity_ranges["1001-10000"] += 1
-            else:
-                popularity_ranges["10000+"] += 1
-
-        # Топ тем
-        topics = {}
-        for repo in starred:
-            repo_topics = repo.get('repositoryTopics', {}).get('nodes', [])
-            for topic_node in repo_topics:
-                topic_name = topic_node.get('topic', {}).get('name', '')
-                if topic_name:
-                    topics[topic_name] = topics.get(topic_name, 0) + 1
+        """Анализ starred репозиториев для понимания интересов пользователя (один проход по записям)"""
+        aggregator = StarredRepositoriesAggregator()
+        aggregator.add(starred)
 
-        # Все starred репозитории отсортированные по дате (уже отсортированы в запросе)
-        all_starred_sorted = starred
+        # Все starred репозитории отсортированные по дате (уже отсортированы в запросе);
+        # краткие записи строятся лениво при обходе, а не копируются
+        return aggregator.result(NDJSONDatasetView(starred, self._summarize_starred_repository))
 
+    @staticmethod
+    def _summarize_starred_repository(repo: Dict[str, Any]) -> Dict[str, Any]:
+        """Краткая запись о starred репозитории для отчета"""
         return {
-            "total_starred": len(starred),
-            "languages": dict(sorted(languages.items(), key=lambda x: x[1], reverse=True)),
-            "owner_types": owner_types,
-            "popularity_distribution": popularity_ranges,
-            "top_topics": dict(sorted(topics.items(), key=lambda x: x[1], reverse=True)[:20]),
-            "all_starred_repos": [
-                {
-                    "name": repo.get('nameWithOwner', ''),
-                    "stars": repo.get('stargazerCount', 0),
-                    "language": repo.get('primaryLanguage', {}).get('name') if repo.get('primaryLanguage') else None,
-                    "description": repo.get('description', '')[:150] if repo.get('description') else '',
-                    "created_at": repo.get('createdAt', ''),
-                    "owner_type": repo.get('owner', {}).get('__typename', 'Unknown') if repo.get('owner') else 'Unknown'
-                }
-                for repo in all_starred_sorted
-            ]
+            "name": repo.get('nameWithOwner', ''),
+            "stars": repo.get('stargazerCount', 0),
+            "language": repo.get('primaryLanguage', {}).get('name') if repo.get('primaryLanguage') else None,
+            "description": repo.get('description', '')[:150] if repo.get('description') else '',
+            "created_at": repo.get('createdAt', ''),
+            "owner_type": repo.get('owner', {}).get('__typename', 'Unknown') if repo.get('owner') else 'Unknown'
         }
 
     def get_repository_contributors_analysis(self, repo_name: str) -> Dict[str, Any]:
@@ -2075,7 +5370,7 @@ class GitHubDataCollector:
             return {"error": f"Неверный формат репозитория: {repo_name}"}
 
         query = """
-        query($owner: String!, $name: String!) {
+        query RepositoryContributors($owner: String!, $name: String!) {
           repository(owner: $owner, name: $name) {
             collaborators(first: 20) {
               nodes {
@@ -2144,6 +5439,189 @@ class GitHubDataCollector:
         except Exception as e:
             return {"error": f"Ошибка при анализе контрибьюторов {repo_name}: {str(e)}"}
 
+    def get_contributors_analysis_bulk(self, repo_names: List[str] = None) -> Dict[str, Any]:
+        """
+        Анализ контрибьюторов многих репозиториев пакетными запросами
+
+        Коллабораторы и mentionable пользователи запрашиваются для
+        CONTRIBUTORS_BATCH_MAX_ALIASES репозиториев в одном GraphQL запросе
+        (алиасы r0, r1, ...). Записи пользователей объединяются по логину,
+        компании и локации считаются один раз по уникальным пользователям.
+
+        Args:
+            repo_names: Репозитории owner/name (None = все собственные репозитории)
+
+        Returns:
+            Сводка по уникальным пользователям, компаниям, локациям и репозиториям
+        """
+        if repo_names is None:
+            repo_names = [repo.get("nameWithOwner", "") for repo in self.get_user_repositories()]
+        repo_names = [name for name in dict.fromkeys(repo_names) if '/' in name]
+        if not repo_names:
+            return {"error": "Нет репозиториев для анализа контрибьюторов"}
+
+        batches = [
+            repo_names[i:i + CONTRIBUTORS_BATCH_MAX_ALIASES]
+            for i in range(0, len(repo_names), CONTRIBUTORS_BATCH_MAX_ALIASES)
+        ]
+        print(f"Анализ контрибьюторов {len(repo_names)} репозиториев ({len(batches)} пакетных запросов)...")
+
+        users: Dict[str, Dict[str, Any]] = {}
+        per_repository = {}
+        not_found = []
+        errors = []
+
+        for batch in batches:
+            repositories = self._fetch_contributors_batch(batch)
+            if "error" in repositories:
+                print(repositories["error"])
+                errors.append(repositories["error"])
+                continue
+
+            for repo_name in batch:
+                repo = repositories.get(repo_name)
+                if repo is None:
+                    not_found.append(repo_name)
+                    continue
+
+                collaborators = (repo.get("collaborators") or {}).get("nodes") or []
+                contributors = (repo.get("mentionableUsers") or {}).get("nodes") or []
+                per_repository[repo_name] = {
+                    "collaborators_count": len(collaborators),
+                    "contributors_count": len(contributors)
+                }
+
+                for role, nodes in (("collaborator", collaborators), ("contributor", contributors)):
+                    for node in nodes:
+                        if not node or not node.get("login"):
+                            continue
+                        user = users.get(node["login"])
+                        if user is None:
+                            user = users[node["login"]] = {
+                                "login": node["login"],
+                                "name": node.get("name") or "",
+                                "company": (node.get("company") or "").strip(),
+                                "location": (node.get("location") or "").strip(),
+                                "roles": [],
+                                "repositories": []
+                            }
+                        if role not in user["roles"]:
+                            user["roles"].append(role)
+                        if repo_name not in user["repositories"]:
+                            user["repositories"].append(repo_name)
+
+        # Компании и локации - по уникальным пользователям
+        companies = {}
+        locations = {}
+        for user in users.values():
+            company = user["company"] or "Unknown"
+            location = user["location"] or "Unknown"
+            companies[company] = companies.get(company, 0) + 1
+            locations[location] = locations.get(location, 0) + 1
+
+        ranked = sorted(users.values(), key=lambda user: (-len(user["repositories"]), user["login"]))
+        result = {
+            "repositories_analyzed": len(per_repository),
+            "repositories_not_found": not_found,
+            "unique_users": len(users),
+            "collaborators_count": sum(1 for user in users.values() if "collaborator" in user["roles"]),
+            "contributors_count": sum(1 for user in users.values() if "contributor" in user["roles"]),
+            "companies": dict(sorted(companies.items(), key=lambda x: x[1], reverse=True)),
+            "locations": dict(sorted(locations.items(), key=lambda x: x[1], reverse=True)),
+            "top_contributors": [
+                {
+                    "login": user["login"],
+                    "name": user["name"],
+                    "company": user["company"],
+                    "location": user["location"],
+                    "repositories_count": len(user["repositories"])
+                }
+                for user in ranked[:10]
+            ],
+            "users": ranked,
+            "per_repository": per_repository
+        }
+        if errors:
+            result["errors"] = errors
+
+        print(f"Уникальных пользователей: {len(users)} в {len(per_repository)} репозиториях "
+              f"(компаний: {len(companies)}, локаций: {len(locations)})")
+        return result
+
+    def _fetch_contributors_batch(self, repo_names: List[str]) -> Dict[str, Any]:
+        """
+        Коллабораторы и mentionable пользователи нескольких репозиториев одним запросом
+
+        Returns:
+            Словарь nameWithOwner -> repository (None для ненайденных репозиториев)
+            или словарь с ключом "error" при ошибке запроса
+        """
+        declarations = []
+        selections = []
+        variables = {}
+
+        for i, repo_name in enumerate(repo_names):
+            owner, name = repo_name.split('/', 1)
+            declarations.append(f"$o{i}: String!, $n{i}: String!")
+            selections.append(
+                f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ "
+                f"collaborators(first: 20) {{ nodes {{ ...ContributorFields }} }} "
+                f"mentionableUsers(first: 50) {{ nodes {{ ...ContributorFields }} }} }}"
+            )
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+
+        query = (
+            f"query RepositoryContributorsBatch({', '.join(declarations)}) {{\n"
+            + "\n".join(selections)
+            + "\nrateLimit { cost remaining resetAt }\n}\n"
+            + CONTRIBUTOR_FIELDS_FRAGMENT
+        )
+
+        try:
+            # Коллабораторы доступны только с правом записи - такие ошибки полей не прерывают пакет
+            data = self._make_graphql_request(query, variables, allow_partial=True)
+        except Exception as e:
+            return {"error": f"Ошибка пакетного запроса контрибьюторов ({len(repo_names)} репозиториев): {e}"}
+
+        return {repo_name: data.get(f"r{i}") for i, repo_name in enumerate(repo_names)}
+
+    def save_contributors_analysis_to_csv(self, analysis: Dict[str, Any], filename: str):
+        """Сохранить сводный анализ контрибьюторов в CSV"""
+        if not analysis or "users" not in analysis:
+            print("Нет данных для анализа контрибьюторов")
+            return
+
+        with open_output_file(filename) as csvfile:
+            writer = csv.writer(csvfile)
+
+            writer.writerow(["Контрибьюторы репозиториев"])
+            writer.writerow(["Репозиториев", analysis.get("repositories_analyzed", 0)])
+            writer.writerow(["Уникальных пользователей", analysis.get("unique_users", 0)])
+            writer.writerow([])
+
+            writer.writerow(["Компании"])
+            writer.writerow(["Компания", "Пользователей"])
+            for company, count in analysis.get("companies", {}).items():
+                writer.writerow([company, count])
+            writer.writerow([])
+
+            writer.writerow(["Локации"])
+            writer.writerow(["Локация", "Пользователей"])
+            for location, count in analysis.get("locations", {}).items():
+                writer.writerow([location, count])
+            writer.writerow([])
+
+            writer.writerow(["Пользователи"])
+            writer.writerow(["Логин", "Имя", "Компания", "Локация", "Роли", "Репозиториев", "Репозитории"])
+            for user in analysis["users"]:
+                writer.writerow([
+                    user["login"], user["name"], user["company"], user["location"],
+                    ", ".join(user["roles"]), len(user["repositories"]), ", ".join(user["repositories"])
+                ])
+
+        print(f"Анализ контрибьюторов сохранен в {filename}")
+
     def save_starred_analysis_to_csv(self, starred_data: Dict[str, Any], filename: str):
         """Сохранить анализ starred репозиториев в CSV"""
         if not starred_data or "analysis" not in starred_data:
@@ -2152,7 +5630,7 @@ class GitHubDataCollector:
 
         analysis = starred_data["analysis"]
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_output_file(filename) as csvfile:
             writer = csv.writer(csvfile)
 
             writer.writerow(["Анализ Starred Репозиториев"])
@@ -2204,51 +5682,25 @@ class GitHubDataCollector:
 
         print(f"Анализ starred репозиториев сохранен в {filename}")
 
-    def save_stars_distribution_to_csv(self, repositories: List[Dict[str, Any]], filename: str):
-        """Сохранить распределение звезд по диапазонам в CSV"""
+    def save_stars_distribution_to_csv(self, repositories: List[Dict[str, Any]], filename: str,
+                                       summary: Optional[Dict[str, Any]] = None):
+        """Сохранить распределение звезд по диапазонам в CSV (summary - итоги summarize_repositories)"""
         if not repositories:
             print("Нет данных для анализа распределения звезд")
             return
 
         # Группируем по диапазонам звезд
-        ranges = {
-            "0 звезд": 0,
-            "1-5 звезд": 0,
-            "6-10 звезд": 0,
-            "11-25 звезд": 0,
-            "26-50 звезд": 0,
-            "51-100 звезд": 0,
-            "101-500 звезд": 0,
-            "501+ звезд": 0
-        }
+        summary = summary or summarize_repositories(repositories)
+        ranges = summary["star_ranges"]
 
-        for repo in repositories:
-            stars = repo.get('stargazerCount', 0)
-            if stars == 0:
-                ranges["0 звезд"] += 1
-            elif stars <= 5:
-                ranges["1-5 звезд"] += 1
-            elif stars <= 10:
-                ranges["6-10 звезд"] += 1
-            elif stars <= 25:
-                ranges["11-25 звезд"] += 1
-            elif stars <= 50:
-                ranges["26-50 звезд"] += 1
-            elif stars <= 100:
-                ranges["51-100 звезд"] += 1
-            elif stars <= 500:
-                ranges["101-500 звезд"] += 1
-            else:
-                ranges["501+ звезд"] += 1
-
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_output_file(filename) as csvfile:
             writer = csv.writer(csvfile)
 
             writer.writerow(["Распределение звезд по диапазонам"])
             writer.writerow([])
             writer.writerow(["Диапазон", "Количество репозиториев", "Процент"])
 
-            total_repos = len(repositories)
+            total_repos = summary["count"]
             for range_name, count in ranges.items():
                 percentage = round((count / total_repos * 100), 1) if total_repos > 0 else 0
                 writer.writerow([range_name, count, f"{percentage}%"])
@@ -2280,93 +5732,185 @@ class GitHubDataCollector:
         """
         print("Получение форков от собственных репозиториев...")
 
-        all_forks = []
+        all_forks = self._new_records("forks_of_user_repos")
+        batches = self._plan_forks_batches(repositories)
+
+        print(f"Репозиториев с форками: {sum(len(batch) for batch in batches)} ({len(batches)} пакетных запросов)")
+
+        for batch in batches:
+            for repo_forks in self._get_forks_of_repos_batch(batch):
+                all_forks.extend(repo_forks)
+
+        print(f"Всего найдено форков от собственных репозиториев: {len(all_forks)}")
+        return all_forks
+
+    @staticmethod
+    def _plan_forks_batches(repositories: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Разбить репозитории с форками на пакеты для _get_forks_of_repos_batch"""
+        repos_with_forks = [
+            repo for repo in repositories
+            if repo.get('forkCount', 0) > 0 and '/' in repo.get('nameWithOwner', '')
+        ]
+        return [
+            repos_with_forks[i:i + FORKS_BATCH_MAX_ALIASES]
+            for i in range(0, len(repos_with_forks), FORKS_BATCH_MAX_ALIASES)
+        ]
+
+    def _get_forks_of_repos_batch(self, repositories: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Получить форки нескольких собственных репозиториев
+
+        Первая страница форков всех репозиториев запрашивается одним GraphQL
+        запросом (алиасы r0, r1, ...). Отдельные запросы выполняются только
+        для репозиториев, у которых форков больше одной страницы.
 
+        Returns:
+            Списки форков в том же порядке, что и repositories
+        """
+        repo_names = [repo['nameWithOwner'] for repo in repositories]
+        phase_name = "forks_batch:" + hashlib.sha1("\n".join(repo_names).encode("utf-8")).hexdigest()
+        first_pages = self._run_phase(phase_name, self._fetch_forks_first_pages, repo_names)
+
+        if "error" in first_pages:
+            print(f"{first_pages['error']} - запрашиваем форки по одному репозиторию")
+            return [self._get_forks_of_repo(repo) for repo in repositories]
+
+        results = []
         for repo in repositories:
-            repo_name = repo.get('nameWithOwner', '')
-            fork_count = repo.get('forkCount', 0)
+            repo_name = repo['nameWithOwner']
+            forks_data = first_pages.get(repo_name)
 
-            if fork_count == 0:
+            if not forks_data:
+                # Репозиторий из списка собственных, но алиас вернул null - ошибка запроса
+                self._incomplete_fork_repos.add(repo_name)
+                results.append([])
                 continue
 
-            print(f"Получение форков для {repo_name} ({fork_count} форков)...")
+            repo_forks = forks_data["nodes"]
+            for fork in repo_forks:
+                fork['_original_repo'] = repo_name
+                fork['_original_url'] = repo.get('url', '')
 
-            repo_forks = []
-            cursor = None
+            if forks_data["pageInfo"]["hasNextPage"]:
+                repo_forks = repo_forks + self._get_forks_of_repo(repo, after_cursor=forks_data["pageInfo"]["endCursor"])
 
-            while True:
-                query = """
-                query($owner: String!, $name: String!, $after: String) {
-                  repository(owner: $owner, name: $name) {
-                    forks(first: 100, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {
-                      nodes {
-                        name
-                        nameWithOwner
-                        url
-                        createdAt
-                        pushedAt
-                        updatedAt
-                        description
-                        primaryLanguage {
-                          name
-                        }
-                        stargazerCount
-                        owner {
-                          login
-                        }
-                      }
-                      pageInfo {
-                        hasNextPage
-                        endCursor
-                      }
-                    }
-                  }
-                }
-                """
+            print(f"Найдено {len(repo_forks)} форков для {repo_name}")
+            results.append(repo_forks)
 
-                # Разбираем owner/name из nameWithOwner
-                try:
-                    owner, name = repo_name.split('/', 1)
-                except ValueError:
-                    continue
+        return results
 
-                variables = {
-                    "owner": owner,
-                    "name": name,
-                    "after": cursor
-                }
+    def _fetch_forks_first_pages(self, repo_names: List[str]) -> Dict[str, Any]:
+        """
+        Первая страница форков для нескольких репозиториев одним запросом
 
-                try:
-                    result = self._make_graphql_request(query, variables)
+        Returns:
+            Словарь nameWithOwner -> connection forks (None для ненайденных
+            репозиториев) или словарь с ключом "error" при ошибке запроса
+        """
+        declarations = []
+        selections = []
+        variables = {}
 
-                    if not result.get("repository") or not result["repository"].get("forks"):
-                        break
+        for i, repo_name in enumerate(repo_names):
+            owner, name = repo_name.split('/', 1)
+            declarations.append(f"$o{i}: String!, $n{i}: String!")
+            selections.append(
+                f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ "
+                f"forks(first: 100, orderBy: {{field: CREATED_AT, direction: DESC}}) {{ "
+                f"nodes {{ ...ForkFields }} pageInfo {{ hasNextPage endCursor }} }} }}"
+            )
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+
+        query = (
+            f"query RepositoryForksBatch({', '.join(declarations)}) {{\n"
+            + "\n".join(selections)
+            + "\nrateLimit { cost remaining resetAt }\n}\n"
+            + FORK_FIELDS_FRAGMENT
+        )
+
+        try:
+            data = self._make_graphql_request(query, variables, allow_partial=True)
+        except Exception as e:
+            return {"error": f"Ошибка пакетного запроса форков ({len(repo_names)} репозиториев): {e}"}
+
+        return {
+            repo_name: (data.get(f"r{i}") or {}).get("forks")
+            for i, repo_name in enumerate(repo_names)
+        }
 
-                    forks_data = result["repository"]["forks"]
-                    page_forks = forks_data["nodes"]
+    def _get_forks_of_repo(self, repo: Dict[str, Any], after_cursor: str = None) -> List[Dict[str, Any]]:
+        """
+        Получить все форки одного собственного репозитория
+
+        Args:
+            repo: Собственный репозиторий
+            after_cursor: Курсор, после которого продолжать (страницы до него уже получены)
+        """
+        repo_name = repo.get('nameWithOwner', '')
+        fork_count = repo.get('forkCount', 0)
+
+        if fork_count == 0:
+            return []
+
+        # Разбираем owner/name из nameWithOwner
+        try:
+            owner, name = repo_name.split('/', 1)
+        except ValueError:
+            return []
+
+        print(f"Получение форков для {repo_name} ({fork_count} форков)...")
+
+        checkpoint_key = f"forks_of:{repo_name}:{after_cursor or ''}"
+        repo_forks, resume_cursor, complete = self._resume_connection(checkpoint_key)
+        cursor = resume_cursor or after_cursor
+
+        if not complete:
+            query = """
+            query RepositoryForks($owner: String!, $name: String!, $after: String, $first: Int!) {
+              repository(owner: $owner, name: $name) {
+                forks(first: $first, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {
+                  nodes {
+                    ...ForkFields
+                  }
+                  pageInfo {
+                    hasNextPage
+                    endCursor
+                  }
+                }
+              }
+            }
+            """ + FORK_FIELDS_FRAGMENT
 
+            variables = {
+                "owner": owner,
+                "name": name
+            }
+
+            try:
+                pages = self.paginate("forks_of_repo", query, variables, ("repository", "forks"), after=cursor)
+                for page in pages.pages():
                     # Добавляем информацию об оригинальном репозитории
-                    for fork in page_forks:
+                    for fork in page.records:
                         fork['_original_repo'] = repo_name
                         fork['_original_url'] = repo.get('url', '')
 
-                    repo_forks.extend(page_forks)
+                    repo_forks.extend(page.records)
 
-                    # Проверяем, есть ли еще страницы
-                    if not forks_data["pageInfo"]["hasNextPage"]:
-                        break
+                    cursor = page.end_cursor or cursor
+                    self._checkpoint_page(checkpoint_key, page.records, cursor)
 
-                    cursor = forks_data["pageInfo"]["endCursor"]
+                complete = True
 
-                except Exception as e:
-                    print(f"Ошибка при получении форков для {repo_name}: {e}")
-                    break
+            except Exception as e:
+                print(f"Ошибка при получении форков для {repo_name}: {e}")
+                self._incomplete_fork_repos.add(repo_name)
 
-            all_forks.extend(repo_forks)
-            print(f"Найдено {len(repo_forks)} форков для {repo_name}")
+        if complete:
+            self._checkpoint_done(checkpoint_key)
 
-        print(f"Всего найдено форков от собственных репозиториев: {len(all_forks)}")
-        return all_forks
+        print(f"Найдено {len(repo_forks)} форков для {repo_name}")
+        return repo_forks
 
     def save_forks_of_user_repos_to_csv(self, forks: List[Dict[str, Any]], filename: str):
         """Сохранить форки собственных репозиториев в CSV файл"""
@@ -2380,7 +5924,7 @@ class GitHubDataCollector:
             'fork_owner_login', 'original_repo', 'original_url'
         ]
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_output_file(filename) as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
             writer.writeheader()
 
@@ -2417,7 +5961,7 @@ class GitHubDataCollector:
         social_stats = profile_stats.get("social_stats", {})
         contribution_stats = profile_stats.get("contribution_stats", {})
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_output_file(filename) as csvfile:
             writer = csv.writer(csvfile)
 
             # Заголовок
@@ -2470,7 +6014,7 @@ class GitHubDataCollector:
             print("Нет данных о языках для сохранения")
             return
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_output_file(filename) as csvfile:
             writer = csv.writer(csvfile)
 
             writer.writerow(["Programming Languages Statistics"])
@@ -2497,7 +6041,7 @@ class GitHubDataCollector:
             print("Нет топ репозиториев для сохранения")
             return
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_output_file(filename) as csvfile:
             writer = csv.writer(csvfile)
 
             writer.writerow(["Top Repositories by Stars"])
@@ -2523,7 +6067,7 @@ class GitHubDataCollector:
             print("Нет данных об активности для сохранения")
             return
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_output_file(filename) as csvfile:
             writer = csv.writer(csvfile)
 
             writer.writerow(["Activity Trends & Growth Analytics"])
@@ -2545,15 +6089,37 @@ class GitHubDataCollector:
             for month, count in monthly.items():
                 writer.writerow([month, count])
 
+            # История за все годы (--all-years)
+            history = activity_trends.get("history")
+            if history:
+                writer.writerow([])
+                writer.writerow([f"Contributions History ({history.get('since')} - {history.get('until')})"])
+                writer.writerow(["Year", "Contributions"])
+                for year, count in history.get("yearly_contributions", {}).items():
+                    writer.writerow([year, count])
+                writer.writerow([])
+                writer.writerow(["Weekday", "Contributions"])
+                for weekday, count in history.get("weekday_contributions", {}).items():
+                    writer.writerow([weekday, count])
+
         print(f"Тренды активности сохранены в {filename}")
 
-    def unstar_all_repositories(self, confirm: bool = False, batch_size: int = 10) -> Dict[str, Any]:
+    def unstar_all_repositories(self, confirm: bool = False, workers: int = 4, resume: bool = True,
+                                journal_file: str = "starred_unstar_journal.jsonl") -> Dict[str, Any]:
         """
         Удалить звезды со ВСЕХ starred репозиториев
 
+        Звезды снимаются пулом из workers потоков в пределах общего лимита
+        запросов. Каждый завершенный репозиторий дописывается в журнал, и
+        прерванная операция продолжается с того же места по журналу и
+        резервной копии (без повторного запроса списка звезд). После
+        завершения без ошибок журнал удаляется.
+
         Args:
             confirm: Подтверждение операции (для безопасности)
-            batch_size: Количество репозиториев для обработки за раз
+            workers: Количество одновременных запросов
+            resume: Продолжить незавершенную операцию из журнала
+            journal_file: Файл журнала операции
 
         Returns:
             Результат операции
@@ -2567,148 +6133,219 @@ class GitHubDataCollector:
             print("Пример: collector.unstar_all_repositories(confirm=True)")
             return {"error": "Требуется подтверждение", "unstarred": 0}
 
-        print("⚠️  НАЧИНАЕМ ОПЕРАЦИЮ УДАЛЕНИЯ ВСЕХ ЗВЕЗД!")
-        print("Это действие нельзя отменить!")
+        print("⚠️  НАЧИНАЕМ ОПЕРАЦИЮ УДАЛЕНИЯ ВСЕХ ЗВЕЗД!")
+        print("Это действие нельзя отменить!")
+
+        journal = StarOperationJournal(journal_file)
+        backup_file = journal.header.get("backup_file", "") if journal.matches("unstar") else ""
+
+        if resume and backup_file and os.path.exists(backup_file):
+            with open(backup_file, 'r', encoding='utf-8') as f:
+                starred_repos = json.load(f)
+            print(f"Продолжаем операцию по журналу {journal_file}: "
+                  f"выполнено {len(journal.completed)} из {len(starred_repos)}")
+        else:
+            # Получаем все starred репозитории
+            starred_analysis = self.get_starred_repositories_analysis()
+            starred_repos = list(starred_analysis.get("analysis", {}).get("all_starred_repos", []))
+
+            if not starred_repos:
+                return {"message": "Нет starred репозиториев для удаления", "unstarred": 0}
+
+            print(f"Найдено {len(starred_repos)} starred репозиториев для удаления")
+
+            # Создаем резервную копию перед удалением
+            backup_file = f"starred_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            with open(backup_file, 'w', encoding='utf-8') as f:
+                json.dump(starred_repos, f, indent=2, ensure_ascii=False)
+            print(f"📁 Резервная копия сохранена в {backup_file}")
+            journal.start("unstar", backup_file, len(starred_repos))
+
+        total_to_unstar = len(starred_repos)
+        outcome = self._run_star_operations("DELETE", [repo.get("name", "") for repo in starred_repos],
+                                            journal, workers)
+
+        result = {
+            "total_attempted": total_to_unstar,
+            "successfully_unstarred": outcome["done"],
+            "errors_count": len(outcome["errors"]),
+            "errors": outcome["errors"][:10],  # Показываем только первые 10 ошибок
+            "backup_file": backup_file,
+            "journal_file": journal_file if outcome["pending"] else None,
+            "success_rate": round((outcome["done"] / total_to_unstar) * 100, 1) if total_to_unstar > 0 else 0
+        }
+
+        print("\n🎯 ОПЕРАЦИЯ ЗАВЕРШЕНА!")
+        print(f"✅ Успешно удалено звезд: {outcome['done']}/{total_to_unstar}")
+        print(f"❌ Ошибок: {len(outcome['errors'])}")
+        print(f"📁 Резервная копия: {backup_file}")
+        if outcome["pending"]:
+            print(f"📓 Не завершено: {outcome['pending']} - повторный запуск продолжит по журналу {journal_file}")
+
+        return result
+
+    def restar_from_backup(self, backup_file: str, workers: int = 4, resume: bool = True,
+                           journal_file: str = None) -> Dict[str, Any]:
+        """
+        Восстановить звезды по резервной копии unstar_all_repositories
 
-        # Получаем все starred репозитории
-        starred_analysis = self.get_starred_repositories_analysis()
-        starred_repos = starred_analysis.get("analysis", {}).get("all_starred_repos", [])
+        Звезды ставятся от старых к новым (в копии они от новых к старым),
+        чтобы сохранить их относительный порядок (при workers > 1 - примерно).
+        Выполнение и продолжение после прерывания - как в unstar_all_repositories.
 
-        if not starred_repos:
-            return {"message": "Нет starred репозиториев для удаления", "unstarred": 0}
+        Args:
+            backup_file: Файл резервной копии (starred_backup_*.json)
+            workers: Количество одновременных запросов
+            resume: Продолжить незавершенное восстановление из журнала
+            journal_file: Файл журнала (по умолчанию <копия>_restar_journal.jsonl)
 
-        total_to_unstar = len(starred_repos)
-        print(f"Найдено {total_to_unstar} starred репозиториев для удаления")
+        Returns:
+            Результат операции
+        """
+        try:
+            with open(backup_file, 'r', encoding='utf-8') as f:
+                backup = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Не удалось прочитать резервную копию {backup_file}: {e}")
+            return {"error": f"Не удалось прочитать резервную копию: {e}", "starred": 0}
+
+        names = [repo.get("name") or repo.get("nameWithOwner", "") for repo in reversed(backup)]
+        journal_file = journal_file or os.path.splitext(backup_file)[0] + "_restar_journal.jsonl"
+        journal = StarOperationJournal(journal_file)
+
+        if resume and journal.matches("star", backup_file):
+            print(f"Продолжаем восстановление по журналу {journal_file}: "
+                  f"выполнено {len(journal.completed)} из {len(names)}")
+        else:
+            journal.start("star", backup_file, len(names))
 
-        # Создаем резервную копию перед удалением
-        backup_file = f"starred_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump(starred_repos, f, indent=2, ensure_ascii=False)
-        print(f"📁 Резервная копия сохранена в {backup_file}")
+        print(f"⭐ Восстановление {len(names)} звезд из {backup_file}")
+        outcome = self._run_star_operations("PUT", names, journal, workers)
 
-        unstarred_count = 0
-        errors = []
+        result = {
+            "total_attempted": len(names),
+            "successfully_starred": outcome["done"],
+            "errors_count": len(outcome["errors"]),
+            "errors": outcome["errors"][:10],
+            "backup_file": backup_file,
+            "journal_file": journal_file if outcome["pending"] else None,
+            "success_rate": round((outcome["done"] / len(names)) * 100, 1) if names else 0
+        }
 
-        # Обрабатываем батчами
-        for i in range(0, total_to_unstar, batch_size):
-            batch_end = min(i + batch_size, total_to_unstar)
-            batch_repos = starred_repos[i:batch_end]
+        print("\n🎯 ВОССТАНОВЛЕНИЕ ЗАВЕРШЕНО!")
+        print(f"✅ Восстановлено звезд: {outcome['done']}/{len(names)}")
+        print(f"❌ Ошибок: {len(outcome['errors'])}")
+        if outcome["pending"]:
+            print(f"📓 Не завершено: {outcome['pending']} - повторный запуск продолжит по журналу {journal_file}")
 
-            print(f"Обработка батча {i//batch_size + 1}/{(total_to_unstar + batch_size - 1)//batch_size}: {i+1}-{batch_end}")
+        return result
 
-            for j, repo in enumerate(batch_repos):
-                repo_name = repo.get("name", "")
-                try:
-                    # Используем REST API для unstar
-                    owner, name = repo_name.split('/', 1)
-                    url = f"{self.base_url}/user/starred/{owner}/{name}"
+    def _run_star_operations(self, method: str, repo_names: List[str], journal: StarOperationJournal,
+                             workers: int) -> Dict[str, Any]:
+        """
+        Поставить (PUT) или снять (DELETE) звезды пулом потоков с записью в журнал
+
+        Репозитории, уже отмеченные в журнале, пропускаются. Темп запросов
+        задает общий ограничитель скорости (вторичный лимит на запросы,
+        изменяющие данные), при превышении лимита запрос повторяется после
+        ожидания. Ответ 403 без признаков лимита означает недостаток прав
+        токена - оставшиеся репозитории не отправляются.
+
+        Returns:
+            {"done": выполнено (включая прошлые запуски), "errors": [...], "pending": не завершено}
+        """
+        total = len(repo_names)
+        done = sum(1 for name in repo_names if journal.completed.get(name) == "done")
+        todo = [(index, name) for index, name in enumerate(repo_names, 1) if name not in journal.completed]
+        errors = []
+        stop = threading.Event()
 
-                    response = self.session.delete(url)
+        if done:
+            print(f"Пропущено по журналу: {total - len(todo)}")
+
+        def apply(repo_name: str) -> Optional[requests.Response]:
+            if stop.is_set():
+                return None
+            owner, name = repo_name.split('/', 1)
+            url = f"{self.base_url}/user/starred/{owner}/{name}"
+            response = self._request(method, url)
+
+            # При превышении лимита ограничитель дождется его восстановления
+            while self.rate_limiter.is_rate_limited(response):
+                print(f"  ⏳ Rate limit! Ожидаем восстановления лимита для {repo_name}...")
+                response = self._request(method, url)
+            return response
+
+        self.transport.ensure_pool_size(workers)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = {executor.submit(apply, name): (index, name) for index, name in todo}
+            try:
+                for future in as_completed(futures):
+                    index, repo_name = futures[future]
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        error_msg = f"Ошибка при обработке {repo_name}: {str(e)}"
+                        errors.append(error_msg)
+                        print(f"  ❌ {index}/{total}: {repo_name} - {error_msg}")
+                        continue
+                    if response is None:
+                        continue
 
                     if response.status_code == 204:
-                        unstarred_count += 1
-                        print(f"  ✅ {i + j + 1}/{total_to_unstar}: {repo_name}")
+                        journal.record(repo_name, "done")
+                        done += 1
+                        print(f"  ✅ {index}/{total}: {repo_name}")
                     elif response.status_code == 403:
-                        # Проверяем на rate limit
-                        remaining = response.headers.get("X-RateLimit-Remaining", "unknown")
-                        reset_time = response.headers.get("X-RateLimit-Reset", "unknown")
-
-                        if remaining == "0":
-                            # Rate limit exceeded
-                            reset_timestamp = int(reset_time) if reset_time.isdigit() else 0
-                            wait_time = max(reset_timestamp - int(time.time()), 60)
-                            print(f"  ⏳ Rate limit! Ждем {wait_time} сек до {time.strftime('%H:%M:%S', time.localtime(reset_timestamp))}")
-                            time.sleep(wait_time)
-                            # Повторяем попытку после ожидания
-                            response = self.session.delete(url)
-                            if response.status_code == 204:
-                                unstarred_count += 1
-                                print(f"  ✅ {i + j + 1}/{total_to_unstar}: {repo_name} (после ожидания)")
-                                continue
-
-                        # Если не rate limit, то проблема с правами токена
-                        error_msg = f"403 Forbidden - проверьте права токена. Требуется scope 'user' для управления starred репозиториями"
+                        # Не rate limit, значит проблема с правами токена
+                        error_msg = "403 Forbidden - проверьте права токена. Требуется scope 'user' для управления starred репозиториями"
                         errors.append(f"{repo_name}: {error_msg}")
-                        print(f"  ❌ {i + j + 1}/{total_to_unstar}: {repo_name} - {error_msg}")
-
-                        # Показываем детали для отладки
-                        print(f"      Осталось запросов: {remaining}")
-                        print(f"      Сброс лимита: {reset_time}")
+                        print(f"  ❌ {index}/{total}: {repo_name} - {error_msg}")
                         if response.text:
                             print(f"      Ответ сервера: {response.text[:200]}")
-
+                        stop.set()
                     elif response.status_code == 404:
-                        error_msg = f"404 Not Found - репозиторий {repo_name} не найден или уже не starred"
+                        journal.record(repo_name, "not_found")
+                        error_msg = (f"404 Not Found - репозиторий {repo_name} не найден"
+                                     + (" или уже не starred" if method == "DELETE" else ""))
                         errors.append(f"{repo_name}: {error_msg}")
-                        print(f"  ⚠️  {i + j + 1}/{total_to_unstar}: {repo_name} - {error_msg}")
-
+                        print(f"  ⚠️  {index}/{total}: {repo_name} - {error_msg}")
                     else:
                         error_msg = f"HTTP {response.status_code}: {response.text[:100] if response.text else 'Неизвестная ошибка'}"
                         errors.append(f"{repo_name}: {error_msg}")
-                        print(f"  ❌ {i + j + 1}/{total_to_unstar}: {repo_name} - {error_msg}")
-
-                except Exception as e:
-                    error_msg = f"Ошибка при обработке {repo_name}: {str(e)}"
-                    errors.append(error_msg)
-                    print(f"  ❌ {i + j + 1}/{total_to_unstar}: {repo_name} - {error_msg}")
-
-            # Пауза между батчами
-            if batch_end < total_to_unstar:
-                pause_time = min(batch_size, 30)  # Максимум 30 секунд
-                print(f"Пауза между батчами... ({pause_time} сек)")
-                time.sleep(pause_time)
-
-        result = {
-            "total_attempted": total_to_unstar,
-            "successfully_unstarred": unstarred_count,
-            "errors_count": len(errors),
-            "errors": errors[:10],  # Показываем только первые 10 ошибок
-            "backup_file": backup_file,
-            "success_rate": round((unstarred_count / total_to_unstar) * 100, 1) if total_to_unstar > 0 else 0
-        }
-
-        print("\n🎯 ОПЕРАЦИЯ ЗАВЕРШЕНА!")
-        print(f"✅ Успешно удалено звезд: {unstarred_count}/{total_to_unstar}")
-        print(f"❌ Ошибок: {len(errors)}")
-        print(f"📁 Резервная копия: {backup_file}")
-
-        return result
+                        print(f"  ❌ {index}/{total}: {repo_name} - {error_msg}")
+            except KeyboardInterrupt:
+                stop.set()
+                for future in futures:
+                    future.cancel()
+                raise
+            finally:
+                journal.close()
+
+        pending = sum(1 for name in repo_names if name not in journal.completed)
+        if not pending:
+            journal.remove()
+        return {"done": done, "errors": errors, "pending": pending}
 
     def check_repository_files(self, repo_owner: str, repo_name: str) -> Dict[str, Any]:
         """
-        Проверяем наличие файлов LICENSE и README через GitHub Contents API
+        Проверяем наличие файлов LICENSE и README по списку файлов корня репозитория
         """
         try:
+            full_name = f"{repo_owner}/{repo_name}"
+
             # Проверяем различные варианты файлов лицензии
             license_files = ["LICENSE", "LICENSE.md", "LICENSE.txt", "LICENCE", "COPYING", "COPYING.md"]
-            has_license = False
-            license_found = None
-
-            for license_file in license_files:
-                license_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{license_file}"
-                license_response = self.session.get(license_url)
-                if license_response.status_code == 200:
-                    has_license = True
-                    license_found = license_file
-                    break
+            license_found = self.file_index.find_file(full_name, license_files)
 
             # Проверяем различные варианты README файлов
             readme_files = ["README.md", "README.rst", "README.txt", "README", "readme.md", "Readme.md"]
-            has_readme = False
-            readme_found = None
-
-            for readme_file in readme_files:
-                readme_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/contents/{readme_file}"
-                readme_response = self.session.get(readme_url)
-                if readme_response.status_code == 200:
-                    has_readme = True
-                    readme_found = readme_file
-                    break
+            readme_found = self.file_index.find_file(full_name, readme_files)
 
             return {
-                "has_license_file": has_license,
+                "has_license_file": license_found is not None,
                 "license_file": license_found,
-                "has_readme_file": has_readme,
+                "has_readme_file": readme_found is not None,
                 "readme_file": readme_found
             }
         except Exception as e:
@@ -2718,150 +6355,47 @@ class GitHubDataCollector:
                 "error": str(e)
             }
 
-    def analyze_repository_quality(self) -> Dict[str, Any]:
+    def analyze_repository_quality(self, files_checks: Dict[str, Dict[str, Any]] = None,
+                                   repositories: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Анализ качества репозиториев - проверка на отсутствие важных элементов
+
+        Args:
+            files_checks: Заранее полученные результаты check_repository_files по nameWithOwner
+            repositories: Уже полученные собственные репозитории (None = запросить заново)
         """
         print("🔍 Анализируем качество репозиториев...")
 
         # Получаем все репозитории пользователя
-        user_repos = self.get_user_repositories()
+        user_repos = repositories if repositories is not None else self.get_user_repositories()
 
         if not user_repos:
             return {"error": "Не удалось получить репозитории пользователя"}
 
-        quality_issues = {
-            "missing_description": [],
-            "missing_license": [],
-            "missing_topics": [],
-            "missing_readme": [],
-            "low_quality_score": []
-        }
-
         total_repos = len(user_repos)
-        analyzed = 0
 
         print(f"Анализируем {total_repos} репозиториев...")
 
-        for repo in user_repos:
-            repo_name = repo.get("nameWithOwner", "")
-            analyzed += 1
-
-            print(f"  {analyzed}/{total_repos}: {repo_name}")
-
-            # Проверяем описание
-            if not repo.get("description") or repo.get("description", "").strip() == "":
-                quality_issues["missing_description"].append({
-                    "repo": repo_name,
-                    "url": repo.get("url", ""),
-                    "stars": repo.get("stargazerCount", 0),
-                    "updated": repo.get("updatedAt", "")
-                })
-
-            # Проверяем лицензию (GraphQL + проверка файлов)
-            has_license_graphql = bool(repo.get("licenseInfo"))
-
-            if not has_license_graphql:
-                # Дополнительная проверка через Contents API
-                try:
-                    owner, name = repo_name.split('/', 1)
-                    files_check = self.check_repository_files(owner, name)
-                    has_license_file = files_check.get("has_license_file", False)
-
-                    if not has_license_file:
-                        quality_issues["missing_license"].append({
-                            "repo": repo_name,
-                            "url": repo.get("url", ""),
-                            "stars": repo.get("stargazerCount", 0),
-                            "updated": repo.get("updatedAt", "")
-                        })
-                except Exception as e:
-                    # Если не можем проверить файлы, считаем что лицензии нет
-                    quality_issues["missing_license"].append({
-                        "repo": repo_name,
-                        "url": repo.get("url", ""),
-                        "stars": repo.get("stargazerCount", 0),
-                        "updated": repo.get("updatedAt", "")
-                    })
-
-            # Проверяем топики/теги (GraphQL)
-            repository_topics = repo.get("repositoryTopics", {}).get("nodes", [])
-            has_topics_graphql = bool(repository_topics and len(repository_topics) > 0)
-
-            if not has_topics_graphql:
-                quality_issues["missing_topics"].append({
-                    "repo": repo_name,
-                    "url": repo.get("url", ""),
-                    "stars": repo.get("stargazerCount", 0),
-                    "updated": repo.get("updatedAt", "")
-                })
-
-            # Проверяем README (через Contents API)
-            try:
-                owner, name = repo_name.split('/', 1)
-                files_check = self.check_repository_files(owner, name)
-                has_readme_file = files_check.get("has_readme_file", False)
-
-                if not has_readme_file:
-                    quality_issues["missing_readme"].append({
-                        "repo": repo_name,
-                        "url": repo.get("url", ""),
-                        "stars": repo.get("stargazerCount", 0),
-                        "size_kb": repo.get("diskUsage", 0),
-                        "updated": repo.get("updatedAt", "")
-                    })
-            except Exception as e:
-                # Если не можем проверить, используем размер как индикатор
-                size_kb = repo.get("diskUsage", 0)
-                if size_kb < 10:  # Менее 10KB - возможно нет README
-                    quality_issues["missing_readme"].append({
-                        "repo": repo_name,
-                        "url": repo.get("url", ""),
-                        "stars": repo.get("stargazerCount", 0),
-                        "size_kb": size_kb,
-                        "updated": repo.get("updatedAt", "")
-                    })
-
-        # Вычисляем общую статистику
-        stats = {
-            "total_repositories": total_repos,
-            "analyzed_repositories": analyzed,
-            "quality_score": round((1 - sum(len(v) for v in quality_issues.values()) / (total_repos * 4)) * 100, 1),
-            "issues_summary": {
-                "missing_description": len(quality_issues["missing_description"]),
-                "missing_license": len(quality_issues["missing_license"]),
-                "missing_topics": len(quality_issues["missing_topics"]),
-                "missing_readme": len(quality_issues["missing_readme"])
-            }
-        }
-
-        # Определяем репозитории с низким качеством (более 2 проблем)
-        for repo in user_repos:
-            repo_name = repo.get("nameWithOwner", "")
-            issues_count = sum(1 for issue_list in quality_issues.values()
-                             for issue in issue_list if issue["repo"] == repo_name)
-
-            if issues_count >= 2:
-                quality_issues["low_quality_score"].append({
-                    "repo": repo_name,
-                    "url": repo.get("url", ""),
-                    "stars": repo.get("stargazerCount", 0),
-                    "issues_count": issues_count,
-                    "updated": repo.get("updatedAt", "")
-                })
-
-        result = {
-            "statistics": stats,
-            "quality_issues": quality_issues
-        }
+        # Списки файлов корня для всех репозиториев - пакетными запросами
+        self.file_index.prefetch([
+            repo.get("nameWithOwner", "") for repo in user_repos
+            if not (files_checks and repo.get("nameWithOwner") in files_checks)
+        ])
+
+        # Все правила - за один проход, проверка файлов - не больше раза на репозиторий
+        engine = RepositoryQualityEngine(self.quality_rules, self.check_repository_files, self.quality_workers)
+        result = engine.evaluate(
+            user_repos, files_checks,
+            on_repository=lambda index, repo: print(f"  {index}/{total_repos}: {repo.get('nameWithOwner', '')}")
+        )
+        stats = result["statistics"]
+        quality_issues = result["quality_issues"]
 
         print("\n📊 РЕЗУЛЬТАТЫ АНАЛИЗА КАЧЕСТВА:")
         print(f"Всего репозиториев: {stats['total_repositories']}")
         print(".1f")
-        print(f"Без описания: {stats['issues_summary']['missing_description']}")
-        print(f"Без лицензии: {stats['issues_summary']['missing_license']}")
-        print(f"Без тегов: {stats['issues_summary']['missing_topics']}")
-        print(f"Возможно без README: {stats['issues_summary']['missing_readme']}")
+        for rule in engine.rules:
+            print(f"{rule.title}: {stats['issues_summary'][rule.name]}")
         print(f"Низкое качество (2+ проблем): {len(quality_issues['low_quality_score'])}")
 
         return result
@@ -2875,7 +6409,7 @@ class GitHubDataCollector:
         stats = quality_data.get("statistics", {})
         issues = quality_data.get("quality_issues", {})
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        with open_output_file(filename) as csvfile:
             writer = csv.writer(csvfile)
 
             # Заголовок
@@ -2972,37 +6506,387 @@ class GitHubDataCollector:
 
         print(f"Анализ качества сохранен в {filename}")
 
-    def collect_all_data(self):
-        """Собрать все данные и сохранить в файлы"""
-        print(f"Начинаем сбор данных для пользователя: {self.username}")
+    def _collect_datasets(self) -> Dict[str, Any]:
+        """Последовательно выполнить все фазы сбора данных (время фаз - в phase_stats)"""
+        self.repository_snapshot.invalidate()
+        self.file_index.clear()
+        self.phase_stats = {}
 
         # Получаем статистику профиля для роста аккаунта
-        profile_stats = self.get_user_profile_stats()
+        profile_stats = self._track_phase("profile_stats", self._run_phase, "profile_stats", self.get_user_profile_stats)
 
         # Получаем форки (форки других репозиториев)
-        forks = self.get_all_forks()
+        forks = self._track_phase("forks", self.get_all_forks)
 
         # Получаем собственные репозитории
-        user_repos = self.get_user_repositories()
+        user_repos = self._track_phase("user_repos", self.get_user_repositories)
 
         # Получаем репозитории отсортированные по звездам
-        repos_stars_sorted = self.get_repositories_stars_sorted()
+        repos_stars_sorted = self._track_phase("repos_stars_sorted", self.get_repositories_stars_sorted)
 
         # Получаем анализ starred репозиториев
-        starred_analysis = self.get_starred_repositories_analysis()
+        starred_analysis = self._track_phase("starred_analysis", self.get_starred_repositories_analysis)
 
         # Получаем детальную аналитику по всем репозиториям с звездами
         repos_with_stars = [repo for repo in repos_stars_sorted if repo.get('stargazerCount', 0) > 0]
-        all_repos_analytics = self.get_top_repositories_analytics(repos_with_stars, limit=None, batch_size=3)
+        all_repos_analytics = self._track_phase("all_repos_analytics", self.get_top_repositories_analytics,
+                                                repos_with_stars, limit=None)
 
         # Получаем форки собственных репозиториев
-        forks_of_user_repos = self.get_forks_of_user_repos(user_repos)
+        forks_of_user_repos = self._track_phase("forks_of_user_repos", self.get_forks_of_user_repos, user_repos)
 
         # Получаем issues
-        issues = self.get_all_issues()
+        issues = self._track_phase("issues", self.get_all_issues)
 
         # Анализируем качество репозиториев
-        quality_analysis = self.analyze_repository_quality()
+        quality_analysis = self._track_phase("quality_analysis", self._run_phase, "quality_analysis",
+                                             self.analyze_repository_quality)
+
+        return {
+            "profile_stats": profile_stats,
+            "forks": forks,
+            "user_repos": user_repos,
+            "repos_stars_sorted": repos_stars_sorted,
+            "starred_analysis": starred_analysis,
+            "all_repos_analytics": all_repos_analytics,
+            "forks_of_user_repos": forks_of_user_repos,
+            "issues": issues,
+            "quality_analysis": quality_analysis
+        }
+
+    def _collect_datasets_incremental(self, previous: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Догрузить изменения с момента предыдущего запуска и объединить их со снимком
+
+        Водяные знаки берутся из предыдущего github_data.json: курсор для форков,
+        updatedAt для issues, starredAt для звезд. Собственные репозитории
+        загружаются одним свежим снимком - он нужен сортировке по звездам и
+        анализу качества в любом случае, поэтому отдельная дельта не нужна.
+        Если после объединения количество записей не совпадает с totalCount на
+        GitHub (что-то удалено или переименовано), набор загружается полностью.
+
+        Args:
+            previous: Содержимое предыдущего github_data.json
+        """
+        watermarks = previous.get("sync_watermarks", {})
+        self.repository_snapshot.invalidate()
+        self.file_index.clear()
+        self.phase_stats = {}
+
+        # Статистика профиля - один запрос, обновляем всегда
+        profile_stats = self._track_phase("profile_stats", self._run_phase, "profile_stats", self.get_user_profile_stats)
+
+        # Форки других репозиториев: продолжаем с курсора последней страницы
+        def forks_phase():
+            forks = None
+            if watermarks.get("forks_cursor"):
+                forks = self._merge_delta(
+                    "forks", previous.get("forks", []),
+                    self.get_all_forks(after_cursor=watermarks["forks_cursor"]),
+                    key="nameWithOwner"
+                )
+            return self.get_all_forks() if forks is None else forks
+
+        forks = self._track_phase("forks", forks_phase)
+
+        # Собственные репозитории и сортировка по звездам - из общего снимка
+        user_repos = self._track_phase("user_repos", self.get_user_repositories)
+        repos_stars_sorted = self._track_phase("repos_stars_sorted", self.get_repositories_stars_sorted)
+
+        # Starred: новые звезды добавляются в начало списка
+        def starred_phase():
+            previous_starred = previous.get("starred_analysis", {}).get("starred_repositories", [])
+            starred = None
+            if watermarks.get("starred_at"):
+                starred = self._merge_delta(
+                    "starred", previous_starred,
+                    self.get_starred_repositories(starred_after=watermarks["starred_at"]),
+                    key="nameWithOwner", prepend=True
+                )
+            if starred is None:
+                starred = self.get_starred_repositories()
+            return {
+                "starred_repositories": starred,
+                "analysis": self._analyze_starred_repositories(starred)
+            }
+
+        starred_analysis = self._track_phase("starred_analysis", starred_phase)
+
+        # Аналитика: запрашиваем только репозитории, изменившиеся с прошлого запуска
+        def analytics_phase():
+            previous_analytics = {
+                item.get("basic_info", {}).get("name"): item
+                for item in previous.get("all_repositories_analytics", [])
+            }
+            repos_with_stars = [repo for repo in repos_stars_sorted if repo.get('stargazerCount', 0) > 0]
+            changed_repos = [
+                repo for repo in repos_with_stars
+                if not self._analytics_is_current(previous_analytics.get(repo.get("nameWithOwner")), repo)
+            ]
+            fresh_analytics = {
+                item["basic_info"]["name"]: item
+                for item in self.get_top_repositories_analytics(changed_repos)
+            }
+            all_repos_analytics = []
+            for repo in repos_with_stars:
+                name = repo.get("nameWithOwner")
+                item = fresh_analytics.get(name) or previous_analytics.get(name)
+                if item:
+                    all_repos_analytics.append(item)
+            print(f"Аналитика: обновлено {len(fresh_analytics)}, из снимка {len(all_repos_analytics) - len(fresh_analytics)}")
+            return all_repos_analytics
+
+        all_repos_analytics = self._track_phase("all_repos_analytics", analytics_phase)
+
+        # Форки собственных репозиториев: перезапрашиваем, только если изменился forkCount
+        def forks_of_user_repos_phase():
+            previous_fork_counts = {
+                repo.get("nameWithOwner"): repo.get("forkCount", 0)
+                for repo in previous.get("user_repositories", [])
+            }
+            previous_forks_by_repo = {}
+            for fork in previous.get("forks_of_user_repos", []):
+                previous_forks_by_repo.setdefault(fork.get("_original_repo"), []).append(fork)
+
+            changed_fork_repos = [
+                repo for repo in user_repos
+                if previous_fork_counts.get(repo.get("nameWithOwner")) != repo.get("forkCount", 0)
+            ]
+            fresh_forks = {}
+            for batch in self._plan_forks_batches(changed_fork_repos):
+                for repo, repo_forks in zip(batch, self._get_forks_of_repos_batch(batch)):
+                    fresh_forks[repo["nameWithOwner"]] = repo_forks
+
+            forks_of_user_repos = []
+            for repo in user_repos:
+                name = repo.get("nameWithOwner")
+                if name in fresh_forks:
+                    forks_of_user_repos.extend(fresh_forks[name])
+                elif previous_fork_counts.get(name) == repo.get("forkCount", 0):
+                    forks_of_user_repos.extend(previous_forks_by_repo.get(name, []))
+            return forks_of_user_repos
+
+        forks_of_user_repos = self._track_phase("forks_of_user_repos", forks_of_user_repos_phase)
+
+        # Issues: созданные или измененные после водяного знака
+        def issues_phase():
+            issues = None
+            if watermarks.get("issues_updated_at"):
+                issues = self._merge_delta(
+                    "issues", previous.get("issues", []),
+                    self.get_all_issues(updated_since=watermarks["issues_updated_at"]),
+                    key="url",
+                    expected_total=profile_stats.get("contribution_stats", {}).get("total_issues")
+                )
+            return self.get_all_issues() if issues is None else issues
+
+        issues = self._track_phase("issues", issues_phase)
+
+        # Анализ качества по уже объединенному списку репозиториев
+        quality_analysis = self._track_phase("quality_analysis", self._run_phase, "quality_analysis",
+                                             self.analyze_repository_quality, repositories=user_repos)
+
+        return {
+            "profile_stats": profile_stats,
+            "forks": forks,
+            "user_repos": user_repos,
+            "repos_stars_sorted": repos_stars_sorted,
+            "starred_analysis": starred_analysis,
+            "all_repos_analytics": all_repos_analytics,
+            "forks_of_user_repos": forks_of_user_repos,
+            "issues": issues,
+            "quality_analysis": quality_analysis
+        }
+
+    def _merge_delta(self, dataset: str, previous: List[Dict[str, Any]], delta: List[Dict[str, Any]],
+                     key: str, prepend: bool = False,
+                     expected_total: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Объединить изменения с предыдущим снимком набора данных
+
+        Измененные записи заменяются на месте, новые добавляются в конец (или в
+        начало при prepend=True).
+
+        Returns:
+            Объединенный список или None, если количество записей не совпало с
+            totalCount и набор нужно загрузить полностью
+        """
+        delta_by_key = {item.get(key): item for item in delta}
+        merged = [delta_by_key.pop(item.get(key), item) for item in previous]
+        added = [item for item in delta if item.get(key) in delta_by_key]
+        merged = added + merged if prepend else merged + added
+
+        if expected_total is None:
+            expected_total = self.connection_state.get(dataset, {}).get("total_count")
+
+        if expected_total is not None and expected_total != len(merged):
+            print(f"⚠️ {dataset}: в снимке {len(merged)} записей, на GitHub {expected_total} - загружаем полностью")
+            return None
+
+        print(f"{dataset}: изменено {len(delta) - len(added)}, добавлено {len(added)}")
+        return merged
+
+    @staticmethod
+    def _analytics_is_current(analytics: Optional[Dict[str, Any]], repo: Dict[str, Any]) -> bool:
+        """Проверить, что сохраненная аналитика соответствует текущему состоянию репозитория"""
+        if not analytics:
+            return False
+
+        basic_info = analytics.get("basic_info", {})
+        popularity = analytics.get("popularity", {})
+        return (
+            basic_info.get("updated_at") == repo.get("updatedAt")
+            and basic_info.get("pushed_at") == repo.get("pushedAt")
+            and popularity.get("stars") == repo.get("stargazerCount")
+            and popularity.get("forks") == repo.get("forkCount")
+        )
+
+    def _compute_sync_watermarks(self, datasets: Dict[str, Any]) -> Dict[str, Any]:
+        """Вычислить водяные знаки для следующего инкрементального запуска"""
+        starred = datasets["starred_analysis"].get("starred_repositories", [])
+        return {
+            "forks_cursor": self.connection_state.get("forks", {}).get("end_cursor"),
+            "issues_updated_at": max((issue.get("updatedAt") or "" for issue in datasets["issues"]), default=None),
+            "starred_at": max((repo.get("starredAt") or "" for repo in starred), default=None)
+        }
+
+    async def _collect_datasets_async(self, concurrency: int) -> Dict[str, Any]:
+        """
+        Выполнить фазы сбора данных конкурентно
+
+        Независимые фазы (профиль, форки, issues, starred) запускаются
+        одновременно, а запросы по отдельным репозиториям (аналитика, форки
+        собственных репозиториев, проверка файлов для анализа качества)
+        раздаются в общий пул потоков.
+
+        Args:
+            concurrency: Максимальное количество одновременных запросов к API
+        """
+        loop = asyncio.get_running_loop()
+        self.repository_snapshot.invalidate()
+        self.file_index.clear()
+        self.phase_stats = {}
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            def run(phase, func, *args):
+                """Выполнить func в пуле; фаза задается в потоке пула, где уходят запросы"""
+                with self._phase_lock:
+                    self.phase_stats.setdefault(phase, {"seconds": 0.0, "requests": 0})
+
+                def call():
+                    self._current_phase.name = phase
+                    started = time.perf_counter()
+                    try:
+                        return func(*args)
+                    finally:
+                        self._current_phase.name = None
+                        with self._phase_lock:
+                            self.phase_stats[phase]["seconds"] = round(
+                                self.phase_stats[phase]["seconds"] + time.perf_counter() - started, 3)
+
+                return loop.run_in_executor(executor, call)
+
+            async def analytics_phase():
+                repos_stars_sorted = await run("repos_stars_sorted", self.get_repositories_stars_sorted)
+                repo_names = [
+                    repo["nameWithOwner"] for repo in repos_stars_sorted
+                    if repo.get('stargazerCount', 0) > 0 and repo.get("nameWithOwner")
+                ]
+                batch_size = self._plan_analytics_batch_size()
+                batches = [repo_names[i:i + batch_size] for i in range(0, len(repo_names), batch_size)]
+                print(f"Получение детальной аналитики для {len(repo_names)} репозиториев "
+                      f"({len(batches)} пакетных запросов, параллельно: {concurrency})...")
+                results = await asyncio.gather(*(run("all_repos_analytics", self._get_analytics_batch_checkpointed, batch) for batch in batches))
+                analytics = []
+                for batch_results in results:
+                    for repo_analytics in batch_results:
+                        if "error" not in repo_analytics:
+                            analytics.append(repo_analytics)
+                        else:
+                            print(f"  Пропускаем: {repo_analytics.get('error', 'Unknown error')}")
+                print(f"Полный анализ завершен: {len(analytics)}/{len(repo_names)} репозиториев")
+                return repos_stars_sorted, analytics
+
+            async def user_repos_phase():
+                user_repos = await run("user_repos", self.get_user_repositories)
+                repo_names = [repo["nameWithOwner"] for repo in user_repos if "/" in repo.get("nameWithOwner", "")]
+                forks_batches = self._plan_forks_batches(user_repos)
+                index_batches = [
+                    repo_names[i:i + FILE_INDEX_MAX_ALIASES]
+                    for i in range(0, len(repo_names), FILE_INDEX_MAX_ALIASES)
+                ]
+                per_batch_forks, _ = await asyncio.gather(
+                    asyncio.gather(*(run("forks_of_user_repos", self._get_forks_of_repos_batch, batch) for batch in forks_batches)),
+                    asyncio.gather(*(run("quality_analysis", self.file_index.prefetch, batch) for batch in index_batches))
+                )
+                forks_of_user_repos = self._new_records("forks_of_user_repos")
+                for batch_forks in per_batch_forks:
+                    for repo_forks in batch_forks:
+                        forks_of_user_repos.extend(repo_forks)
+                print(f"Всего найдено форков от собственных репозиториев: {len(forks_of_user_repos)}")
+
+                files_checks = await run("quality_analysis", lambda: {
+                    name: self.check_repository_files(*name.split('/', 1)) for name in repo_names
+                })
+                quality_analysis = await run("quality_analysis", self._run_phase, "quality_analysis",
+                                             self.analyze_repository_quality, files_checks)
+                return user_repos, forks_of_user_repos, quality_analysis
+
+            (
+                profile_stats,
+                forks,
+                (user_repos, forks_of_user_repos, quality_analysis),
+                (repos_stars_sorted, all_repos_analytics),
+                starred_analysis,
+                issues
+            ) = await asyncio.gather(
+                run("profile_stats", self._run_phase, "profile_stats", self.get_user_profile_stats),
+                run("forks", self.get_all_forks),
+                user_repos_phase(),
+                analytics_phase(),
+                run("starred_analysis", self.get_starred_repositories_analysis),
+                run("issues", self.get_all_issues)
+            )
+
+        return {
+            "profile_stats": profile_stats,
+            "forks": forks,
+            "user_repos": user_repos,
+            "repos_stars_sorted": repos_stars_sorted,
+            "starred_analysis": starred_analysis,
+            "all_repos_analytics": all_repos_analytics,
+            "forks_of_user_repos": forks_of_user_repos,
+            "issues": issues,
+            "quality_analysis": quality_analysis
+        }
+
+    def _configure_connection_pool(self, pool_size: int):
+        """Увеличить пул соединений транспорта под количество параллельных запросов"""
+        self.transport.ensure_pool_size(pool_size)
+        if self.token_pool:
+            self.token_pool.ensure_pool_size(pool_size)
+
+    def _save_collected_data(self, datasets: Dict[str, Any]):
+        """Сохранить собранные данные в JSON и CSV файлы (и в хранилище, если оно включено)"""
+        # Наборы, которые не были записаны по завершении фазы (инкрементальный и асинхронный режимы)
+        for name, data in datasets.items():
+            self._store_in_warehouse(name, data)
+
+        profile_stats = datasets["profile_stats"]
+        forks = datasets["forks"]
+        user_repos = datasets["user_repos"]
+        repos_stars_sorted = datasets["repos_stars_sorted"]
+        starred_analysis = datasets["starred_analysis"]
+        all_repos_analytics = datasets["all_repos_analytics"]
+        forks_of_user_repos = datasets["forks_of_user_repos"]
+        issues = datasets["issues"]
+        quality_analysis = datasets["quality_analysis"]
+
+        # Итоги считаются одним проходом по каждому набору и общие для всех выводов
+        summary = self.exporter.summarize(datasets)
+        total_stars = summary["repositories"]["total_stars"]
+        issue_states = summary["issues"]["states"]
+        issues_count = summary["issues"]["count"]
 
         # Готовим данные для сохранения
         data = {
@@ -3017,67 +6901,416 @@ class GitHubDataCollector:
             "all_repositories_analytics": all_repos_analytics,  # детальная аналитика всех репозиториев с звездами
             "forks_of_user_repos": forks_of_user_repos,  # форки собственных репозиториев
             "issues": issues,
+            "sync_watermarks": self._compute_sync_watermarks(datasets),  # для инкрементального режима
             "summary": {
                 "total_forks": len(forks),  # форки других репозиториев
                 "total_user_repos": len(user_repos),  # собственные репозитории
                 "total_repos_stars_sorted": len(repos_stars_sorted),  # репозитории по звездам
                 "total_forks_of_user_repos": len(forks_of_user_repos),  # форки собственных репозиториев
-                "total_issues": len(issues),
-                "open_issues": len([i for i in issues if i.get('state') == 'OPEN']),
-                "closed_issues": len([i for i in issues if i.get('state') == 'CLOSED']),
-                "total_stars_all_repos": sum(repo.get('stargazerCount', 0) for repo in repos_stars_sorted),
-                "average_stars_per_repo": round(sum(repo.get('stargazerCount', 0) for repo in repos_stars_sorted) / len(repos_stars_sorted), 2) if repos_stars_sorted else 0,
+                "total_issues": issues_count,
+                "open_issues": issue_states.get('OPEN', 0),
+                "closed_issues": issue_states.get('CLOSED', 0),
+                "total_stars_all_repos": total_stars,
+                "average_stars_per_repo": round(total_stars / len(repos_stars_sorted), 2) if repos_stars_sorted else 0,
                 "all_repos_analyzed": len(all_repos_analytics)  # количество проанализированных репозиториев
             }
         }
 
-        # Сохраняем в JSON
-        self.save_to_json(data, "github_data.json")
-
-        # Сохраняем статистику профиля для роста аккаунта
-        self.save_profile_stats_to_csv(profile_stats, "github_profile_growth.csv")
-        self.save_languages_to_csv(profile_stats.get("languages", {}), "github_languages.csv")
-        self.save_top_repos_to_csv(profile_stats.get("top_repositories", []), "github_top_repos.csv")
-        self.save_activity_trends_to_csv(profile_stats.get("activity_trends", {}), "github_activity_trends.csv")
-
-        # Сохраняем анализ starred репозиториев
-        self.save_starred_analysis_to_csv(starred_analysis, "github_starred_analysis.csv")
-
-        # Сохраняем форки в CSV
-        self.save_forks_to_csv(forks, "github_forks.csv")
-
-        # Сохраняем репозитории отсортированные по звездам
-        self.save_repositories_stars_to_csv(repos_stars_sorted, "github_repos_stars_sorted.csv")
-
-        # Сохраняем распределение звезд
-        self.save_stars_distribution_to_csv(repos_stars_sorted, "github_stars_distribution.csv")
-
-        # Сохраняем детальную аналитику всех репозиториев с звездами
-        self.save_repository_analytics_to_csv(all_repos_analytics, "github_top_repos_detailed_analytics.csv")
-
-        # Сохраняем форки собственных репозиториев в CSV
-        self.save_forks_of_user_repos_to_csv(forks_of_user_repos, "github_forks_of_user_repos.csv")
-
-        # Сохраняем issues в CSV
-        self.save_issues_to_csv(issues, "github_issues.csv")
+        # JSON и CSV отчеты (выбранные выводы, общие итоги посчитаны выше)
+        self.exporter.export(self, data, datasets, summary)
 
-        # Сохраняем анализ качества репозиториев
-        self.save_quality_analysis_to_csv(quality_analysis, "github_quality_analysis.csv")
+        # Записываем изменения метрик с прошлого запуска
+        if self.history:
+            counts = self.history.record(user_repos, profile_stats)
+            print(f"История роста: новых репозиториев {counts['new']}, изменилось {counts['changed']}, "
+                  f"без изменений {counts['unchanged']}")
 
         print("Сбор данных завершен!")
         print(f"Форков других репозиториев: {len(forks)}")
         print(f"Собственных репозиториев: {len(user_repos)}")
         print(f"Репозиториев по звездам: {len(repos_stars_sorted)}")
-        print(f"Всего звезд на всех репозиториях: {sum(repo.get('stargazerCount', 0) for repo in repos_stars_sorted)}")
+        print(f"Всего звезд на всех репозиториях: {total_stars}")
         print(f"Starred репозиториев: {starred_analysis.get('analysis', {}).get('total_starred', 0)}")
         print(f"Детальная аналитика всех репозиториев с звездами: {len(all_repos_analytics)}")
         print(f"Форков собственных репозиториев: {len(forks_of_user_repos)}")
-        print(f"Issues: {len(issues)}")
+        print(f"Issues: {issues_count}")
         print(f"Статистика профиля для роста аккаунта собрана!")
 
+    def collect_all_data(self, incremental: bool = False, resume: bool = False, stream: bool = False,
+                         warehouse: bool = False, history: bool = False):
+        """
+        Собрать все данные и сохранить в файлы
+
+        Прогресс сохраняется в контрольную точку после каждой страницы; после
+        успешного сохранения файлов контрольная точка удаляется.
+
+        Args:
+            incremental: Догрузить только изменения с момента предыдущего запуска
+                и объединить их с существующим github_data.json
+            resume: Продолжить прерванный запуск с контрольной точки
+            stream: Писать форки, issues и starred репозитории в NDJSON файлы по мере
+                получения страниц (в github_data.json попадают ссылки на файлы)
+            warehouse: Записывать наборы данных в github_warehouse.sqlite3 по завершении фаз
+            history: Записать изменения метрик репозиториев и профиля в github_history.sqlite3
+        """
+        print(f"Начинаем сбор данных для пользователя: {self.username}")
+
+        previous = self._load_previous_snapshot(self._output_path(self.exporter.filename("json"))) if incremental else None
+
+        if stream and previous:
+            print("Потоковый режим не совмещается с инкрементальным - наборы данных хранятся в памяти")
+        elif stream:
+            self.stream_sink = GitHubStreamSink(self.output_dir)
+
+        self._open_storage(warehouse, history)
+        self.checkpoint = GitHubCollectionCheckpoint(self._output_path("github_checkpoint"), self.username, resume)
+
+        if previous:
+            print("Инкрементальный режим: загружаем только изменения с прошлого запуска")
+            datasets = self._collect_datasets_incremental(previous)
+        else:
+            if incremental:
+                print("Предыдущий снимок не найден - выполняем полный сбор")
+            datasets = self._collect_datasets()
+
+        self._save_collected_data(datasets)
+        self.checkpoint.clear()
+        self.checkpoint = None
+        self.stream_sink = None
+        self._close_storage()
+
+    def _open_storage(self, enabled: bool, history: bool = False):
+        """Открыть хранилище и историю роста для текущего запуска"""
+        self._warehouse_stored = set()
+        self._incomplete_fork_repos = set()
+        if enabled:
+            self.warehouse = GitHubDataWarehouse(self._output_path("github_warehouse.sqlite3"))
+        if history:
+            self.history = GitHubGrowthHistory(self._output_path("github_history.sqlite3"))
+
+    def _close_storage(self):
+        if self.warehouse:
+            print(f"Данные записаны в хранилище {self.warehouse.path}")
+            self.warehouse.close()
+            self.warehouse = None
+        if self.history:
+            self.history.close()
+            self.history = None
+
+    def _load_previous_snapshot(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Загрузить предыдущий github_data.json, если он собран для этого же пользователя"""
+        if not os.path.exists(filename):
+            return None
+
+        try:
+            with open_output_file(filename, 'r') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"Не удалось прочитать {filename}: {e}")
+            return None
+
+        if snapshot.get("username") != self.username or not snapshot.get("sync_watermarks"):
+            return None
+
+        # В потоковом режиме крупные наборы записаны ссылками на NDJSON файлы,
+        # которые следующий потоковый запуск перезаписывает - объединять не с чем
+        datasets = [snapshot.get(key) for key in ("forks", "issues", "forks_of_user_repos", "user_repositories")]
+        datasets.append(snapshot.get("starred_analysis", {}).get("starred_repositories"))
+        if any(isinstance(dataset, dict) for dataset in datasets):
+            print(f"{filename} собран в потоковом режиме (--stream) и не подходит для инкрементального")
+            return None
+
+        return snapshot
+
+    def collect_all_data_async(self, concurrency: int = 8, resume: bool = False, stream: bool = False,
+                               warehouse: bool = False, history: bool = False):
+        """
+        Собрать все данные в асинхронном режиме и сохранить в те же файлы
+
+        Args:
+            concurrency: Максимальное количество одновременных запросов к API
+            resume: Продолжить прерванный запуск с контрольной точки
+            stream: Писать крупные наборы данных в NDJSON файлы по мере получения
+            warehouse: Записывать наборы данных в github_warehouse.sqlite3
+            history: Записать изменения метрик в github_history.sqlite3
+        """
+        print(f"Начинаем асинхронный сбор данных для пользователя: {self.username} (параллельно: {concurrency})")
+
+        self._configure_connection_pool(concurrency)
+        if stream:
+            self.stream_sink = GitHubStreamSink(self.output_dir)
+        self._open_storage(warehouse, history)
+        self.checkpoint = GitHubCollectionCheckpoint(self._output_path("github_checkpoint"), self.username, resume)
+        datasets = asyncio.run(self._collect_datasets_async(concurrency))
+        self._save_collected_data(datasets)
+        self.checkpoint.clear()
+        self.checkpoint = None
+        self.stream_sink = None
+        self._close_storage()
+
+
+class GitHubCollectionScheduler:
+    """
+    Параллельный сбор данных для нескольких аккаунтов
+
+    Аккаунты обрабатываются пулом из workers потоков: у каждого свой
+    GitHubDataCollector и свой каталог вывода <output_root>/<login>/
+    (github_data.json, CSV, контрольная точка, NDJSON, хранилище, история).
+    Запросы на чтение всех коллекторов распределяются по общему пулу
+    токенов; изменяющие запросы и запросы к /user идут от основного токена
+    коллектора.
+    """
+
+    def __init__(self, accounts: List[str], tokens: List[str], output_root: str = "github_accounts",
+                 workers: int = 4, concurrency: int = 1, base_url: Optional[str] = None,
+                 response_cache: Optional[GitHubResponseCache] = None,
+                 telemetry: Optional[GitHubTelemetry] = None, all_years_contributions: bool = False,
+                 exporter: Optional[GitHubDataExporter] = None):
+        """
+        Args:
+            accounts: Логины пользователей GitHub
+            tokens: Токены пула
+            output_root: Каталог, в котором создаются каталоги аккаунтов
+            workers: Количество аккаунтов, собираемых одновременно
+            concurrency: Одновременных запросов внутри аккаунта (1 = последовательный сбор)
+            base_url: Адрес API (None = GITHUB_API_URL или api.github.com)
+            response_cache: Общий кэш ответов REST API
+            telemetry: Общая телеметрия запросов
+            all_years_contributions: Запрашивать вклады за все годы с регистрации
+            exporter: Выбор, сжатие и формат выходных файлов (None = по умолчанию)
+        """
+        self.accounts = list(dict.fromkeys(account.strip() for account in accounts if account.strip()))
+        self.token_pool = GitHubTokenPool(tokens, base_url)
+        self.output_root = output_root
+        self.workers = workers
+        self.concurrency = concurrency
+        self.base_url = base_url
+        self.response_cache = response_cache
+        self.telemetry = telemetry
+        self.all_years_contributions = all_years_contributions
+        self.exporter = exporter or GitHubDataExporter()
+
+    def run(self, **collect_options) -> List[Dict[str, Any]]:
+        """
+        Собрать данные всех аккаунтов
+
+        Args:
+            **collect_options: Параметры collect_all_data (incremental, resume, stream, warehouse, history)
+
+        Returns:
+            Результаты по аккаунтам в исходном порядке: каталог и время или ошибка
+        """
+        print(f"🗂️  Аккаунтов: {len(self.accounts)}, токенов: {len(self.token_pool.tokens)}, "
+              f"одновременно: {self.workers}")
+        self.token_pool.ensure_pool_size(max(10, self.workers * max(1, self.concurrency)))
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            results = list(executor.map(lambda account: self._collect_account(account, collect_options),
+                                        self.accounts))
+
+        print(f"\n🗂️  СБОР ПО АККАУНТАМ ЗАВЕРШЕН за {time.perf_counter() - started:.1f} сек")
+        for result in results:
+            if "error" in result:
+                print(f"  ❌ {result['account']}: {result['error']}")
+            else:
+                print(f"  ✅ {result['account']}: {result['seconds']:.1f} сек -> {result['output_dir']}")
+        for token in self.token_pool.stats():
+            print(f"  🔑 {token['token']}: запросов {token['requests']}, остаток core {token['core_remaining']}, "
+                  f"graphql {token['graphql_remaining']}")
+        return results
+
+    def _collect_account(self, account: str, collect_options: Dict[str, Any]) -> Dict[str, Any]:
+        output_dir = os.path.join(self.output_root, account)
+        os.makedirs(output_dir, exist_ok=True)
+        started = time.perf_counter()
+        collector = None
+        try:
+            collector = GitHubDataCollector(self.token_pool.choose("core"), username=account,
+                                            response_cache=self.response_cache, base_url=self.base_url,
+                                            telemetry=self.telemetry, token_pool=self.token_pool)
+            collector.output_dir = output_dir
+            collector.all_years_contributions = self.all_years_contributions
+            collector.exporter = self.exporter
+            if self.concurrency > 1 and not collect_options.get("incremental"):
+                options = {key: value for key, value in collect_options.items() if key != "incremental"}
+                collector.collect_all_data_async(self.concurrency, **options)
+            else:
+                collector.collect_all_data(**collect_options)
+        except Exception as e:
+            print(f"❌ Ошибка сбора для {account}: {e}")
+            if collector:
+                collector._close_storage()
+            return {"account": account, "output_dir": output_dir, "error": str(e)}
+        return {"account": account, "output_dir": output_dir, "seconds": round(time.perf_counter() - started, 2)}
+
+
+def benchmark_collection_modes(token: str, concurrency: int = 8,
+                               base_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Сравнить время сбора данных в последовательном и асинхронном режимах
+
+    Файлы не записываются - замеряется только время сбора.
+
+    Args:
+        token: GitHub Personal Access Token
+        concurrency: Количество одновременных запросов для асинхронного режима
+        base_url: Адрес API (None = GITHUB_API_URL или api.github.com)
+
+    Returns:
+        Результаты замеров
+    """
+    collector = GitHubDataCollector(token, base_url=base_url)
+
+    started = time.perf_counter()
+    sequential = collector._collect_datasets()
+    sequential_time = time.perf_counter() - started
+
+    collector._configure_connection_pool(concurrency)
+    started = time.perf_counter()
+    concurrent = asyncio.run(collector._collect_datasets_async(concurrency))
+    async_time = time.perf_counter() - started
+
+    result = {
+        "username": collector.username,
+        "concurrency": concurrency,
+        "sequential_seconds": round(sequential_time, 2),
+        "async_seconds": round(async_time, 2),
+        "speedup": round(sequential_time / async_time, 2) if async_time > 0 else 0,
+        "datasets_match": all(
+            len(sequential[key]) == len(concurrent[key])
+            for key in sequential if isinstance(sequential[key], list)
+        )
+    }
+
+    print("\n⏱️ СРАВНЕНИЕ РЕЖИМОВ СБОРА:")
+    print(f"Последовательно: {result['sequential_seconds']} сек")
+    print(f"Асинхронно ({concurrency} потоков): {result['async_seconds']} сек")
+    print(f"Ускорение: x{result['speedup']}")
+    print(f"Объемы данных совпадают: {'Да' if result['datasets_match'] else 'Нет'}")
+
+    return result
+
+
+def benchmark_license_batch(token: str, license_key: str = "MIT",
+                            workers_options: List[int] = None,
+                            base_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Оценить пропускную способность batch добавления лицензий в пробном режиме
+
+    Для каждого количества потоков выполняется batch_add_licenses(dry_run=True)
+    новым менеджером без кэша ответов - файлы не создаются.
+
+    Args:
+        token: GitHub Personal Access Token
+        license_key: Лицензия, шаблон которой подготавливается
+        workers_options: Проверяемые количества потоков
+        base_url: Адрес API (None = GITHUB_API_URL или api.github.com)
+
+    Returns:
+        Результаты замеров по каждому количеству потоков
+    """
+    measurements = []
+
+    for workers in workers_options or [1, 4, 8]:
+        manager = GitHubLicenseBatchManager(token, base_url=base_url)
+        started = time.perf_counter()
+        results = manager.batch_add_licenses(license_key, force=True, workers=workers, dry_run=True)
+        elapsed = time.perf_counter() - started
+
+        measurements.append({
+            "workers": workers,
+            "repositories": len(results),
+            "seconds": round(elapsed, 2),
+            "repos_per_second": round(len(results) / elapsed, 2) if elapsed > 0 else 0
+        })
+
+    print("\n⏱️ ПРОПУСКНАЯ СПОСОБНОСТЬ ДОБАВЛЕНИЯ ЛИЦЕНЗИЙ (пробный запуск):")
+    for measurement in measurements:
+        print(f"Потоков: {measurement['workers']:>3} | Репозиториев: {measurement['repositories']} | "
+              f"{measurement['seconds']} сек | {measurement['repos_per_second']} репозиториев/сек")
+
+    return measurements
+
+
+def _get_cli_option(name: str, default: Optional[str] = None) -> Optional[str]:
+    """Получить значение опции командной строки вида --name value"""
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return sys.argv[index + 1]
+    return default
+
+
+def _load_cli_tokens() -> List[str]:
+    """Токены пула: файл --tokens-file (по одному на строку), GITHUB_TOKENS (через запятую) или GITHUB_TOKEN"""
+    tokens_file = _get_cli_option('--tokens-file')
+    if tokens_file:
+        with open(tokens_file, 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    if os.environ.get("GITHUB_TOKENS"):
+        return [token.strip() for token in os.environ["GITHUB_TOKENS"].split(',') if token.strip()]
+    if os.environ.get("GITHUB_TOKEN"):
+        return [os.environ["GITHUB_TOKEN"].strip()]
+    return []
+
+
+def _build_exporter() -> Optional[GitHubDataExporter]:
+    """
+    Настройки выходных файлов по опциям командной строки (--outputs, --compress, --compact-json, --parquet)
+
+    Returns:
+        Настройки или None, если опции неверны или не установлен нужный пакет (сообщение уже напечатано)
+    """
+    outputs = _get_cli_option('--outputs')
+    try:
+        return GitHubDataExporter(
+            outputs=[name.strip() for name in outputs.split(',')] if outputs else None,
+            compression=_get_cli_option('--compress'),
+            compact_json='--compact-json' in sys.argv,
+            parquet='--parquet' in sys.argv
+        )
+    except (ValueError, ImportError) as e:
+        print(e)
+        return None
+
+
+def _build_response_cache() -> Optional[GitHubResponseCache]:
+    """Создать кэш ответов по опциям командной строки (--no-cache, --cache-ttl, --cache-max-mb)"""
+    if '--no-cache' in sys.argv:
+        return None
+    ttl_hours = float(_get_cli_option('--cache-ttl', '168'))
+    max_size_mb = float(_get_cli_option('--cache-max-mb', '200'))
+    return GitHubResponseCache("github_cache.sqlite3", ttl_seconds=int(ttl_hours * 3600), max_size_mb=max_size_mb)
+
+
+def _print_resume_hint():
+    """Подсказать, как продолжить прерванный сбор данных"""
+    if os.path.exists(os.path.join("github_checkpoint", "state.json")):
+        print("Прогресс сохранен в github_checkpoint/ - запустите скрипт с флагом --resume, чтобы продолжить")
+
+
+def _report_telemetry(telemetry: GitHubTelemetry):
+    """Напечатать профиль запросов и сохранить отчеты телеметрии (--profile)"""
+    telemetry.print_summary()
+    telemetry.save("github_telemetry.json")
+    telemetry.save("github_telemetry.prom")
+
 
 def main():
     """Главная функция"""
+    telemetry = GitHubTelemetry() if '--profile' in sys.argv else None
+    try:
+        _run_cli(telemetry)
+    finally:
+        if telemetry:
+            _report_telemetry(telemetry)
+
+
+def _run_cli(telemetry: Optional[GitHubTelemetry] = None):
+    """Выполнить режим, выбранный аргументами командной строки"""
+    api_url = _get_cli_option('--api-url')
+
     # Проверка аргументов командной строки
     if len(sys.argv) > 1:
         if sys.argv[1] == '--license-manager':
@@ -3087,7 +7320,8 @@ def main():
                 print("❌ Токен не найден!")
                 return
 
-            license_manager = GitHubLicenseBatchManager(token)
+            license_manager = GitHubLicenseBatchManager(token, response_cache=_build_response_cache(), base_url=api_url,
+                                                        telemetry=telemetry)
 
             username = license_manager.get_authenticated_user()
             if not username:
@@ -3095,13 +7329,33 @@ def main():
                 return
 
             print(f"👤 Добро пожаловать, {username}!")
-            license_manager.interactive_batch_setup()
+            workers = int(_get_cli_option('--workers', '4'))
+            license_manager.interactive_batch_setup(workers=workers, dry_run='--dry-run' in sys.argv)
+            return
+
+        elif sys.argv[1] == '--license-benchmark':
+            # Пропускная способность batch добавления лицензий без создания файлов
+            token = "github_pat_1"
+            workers_options = [int(w) for w in _get_cli_option('--workers', '1,4,8').split(',')]
+            benchmark_license_batch(token, _get_cli_option('--license', 'MIT'), workers_options, base_url=api_url)
             return
 
         elif sys.argv[1] == '--demo-unstar':
             demo_unstar_warning()
             return
 
+        elif sys.argv[1] == '--restar':
+            # Восстановление звезд из резервной копии
+            if len(sys.argv) < 3 or sys.argv[2].startswith('--'):
+                print("Укажите файл резервной копии: --restar starred_backup_<дата>.json")
+                return
+            token = "---"
+            collector = GitHubDataCollector(token, base_url=api_url, telemetry=telemetry)
+            result = collector.restar_from_backup(sys.argv[2], workers=int(_get_cli_option('--workers', '4')),
+                                                  resume='--restart' not in sys.argv)
+            print(f"Успешность: {result.get('success_rate', 0)}%")
+            return
+
         elif sys.argv[1] == '--check-readme':
             # Проверка наличия README файлов
             token = "github_pat_1"
@@ -3109,7 +7363,8 @@ def main():
                 print("❌ Токен не найден!")
                 return
 
-            license_manager = GitHubLicenseBatchManager(token)
+            license_manager = GitHubLicenseBatchManager(token, response_cache=_build_response_cache(), base_url=api_url,
+                                                        telemetry=telemetry)
 
             username = license_manager.get_authenticated_user()
             if not username:
@@ -3130,7 +7385,8 @@ def main():
                 print("❌ Токен не найден!")
                 return
 
-            license_manager = GitHubLicenseBatchManager(token)
+            license_manager = GitHubLicenseBatchManager(token, response_cache=_build_response_cache(), base_url=api_url,
+                                                        telemetry=telemetry)
 
             username = license_manager.get_authenticated_user()
             if not username:
@@ -3144,6 +7400,92 @@ def main():
             license_manager.save_topics_check_to_csv(topics_data, "github_topics_check.csv")
             return
 
+        elif sys.argv[1] == '--e2e-benchmark':
+            # Сквозной бенчмарк на синтетическом аккаунте; стенд загружается только в этом режиме.
+            # Скрипт регистрируется как модуль Githabo, чтобы стенд не загрузил его второй копией
+            sys.modules.setdefault("Githabo", sys.modules[__name__])
+            from githabo_fake import benchmark_end_to_end
+            benchmark_end_to_end(
+                repos=int(_get_cli_option('--repos', '500')),
+                stars=int(_get_cli_option('--stars', '5000')),
+                forks=int(_get_cli_option('--forks', '2000')),
+                issues=int(_get_cli_option('--issues', '500')),
+                latency=float(_get_cli_option('--latency', '0')) / 1000,
+                concurrency=int(_get_cli_option('--concurrency', '8')),
+                rate_limit=int(_get_cli_option('--rate-limit', '5000')),
+                telemetry=telemetry
+            )
+            return
+
+        elif sys.argv[1] == '--warehouse-report':
+            # Отчеты по локальному хранилищу без запросов к API
+            if not os.path.exists("github_warehouse.sqlite3"):
+                print("Хранилище github_warehouse.sqlite3 не найдено - соберите данные с флагом --warehouse")
+                return
+            warehouse = GitHubDataWarehouse()
+            warehouse.print_report()
+            if '--parquet' in sys.argv:
+                warehouse.export_parquet(_get_cli_option('--parquet', 'github_parquet') or 'github_parquet')
+            warehouse.close()
+            return
+
+        elif sys.argv[1] == '--growth-report':
+            # Прирост метрик по истории запусков без запросов к API
+            if not os.path.exists("github_history.sqlite3"):
+                print("История github_history.sqlite3 не найдена - соберите данные с флагом --history")
+                return
+            history = GitHubGrowthHistory()
+            history.print_report(days=int(_get_cli_option('--days', '90')))
+            history.close()
+            return
+
+        elif sys.argv[1] == '--accounts':
+            # Сбор для нескольких аккаунтов с общим пулом токенов
+            accounts = (_get_cli_option('--accounts') or '').split(',')
+            if len(sys.argv) > 2 and sys.argv[2].startswith('@'):
+                with open(sys.argv[2][1:], 'r', encoding='utf-8') as f:
+                    accounts = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+            tokens = _load_cli_tokens()
+            if not tokens:
+                print("Токены не заданы: укажите --tokens-file, GITHUB_TOKENS (через запятую) или GITHUB_TOKEN")
+                return
+            exporter = _build_exporter()
+            if not exporter:
+                return
+            scheduler = GitHubCollectionScheduler(
+                accounts, tokens,
+                output_root=_get_cli_option('--output', 'github_accounts'),
+                workers=int(_get_cli_option('--workers', '4')),
+                concurrency=int(_get_cli_option('--concurrency', '8')) if '--async' in sys.argv else 1,
+                base_url=api_url, response_cache=_build_response_cache(), telemetry=telemetry,
+                all_years_contributions='--all-years' in sys.argv, exporter=exporter
+            )
+            scheduler.run(incremental='--incremental' in sys.argv, resume='--resume' in sys.argv,
+                          stream='--stream' in sys.argv, warehouse='--warehouse' in sys.argv,
+                          history='--history' in sys.argv)
+            return
+
+        elif sys.argv[1] == '--contributors':
+            # Контрибьюторы собственных (или перечисленных) репозиториев пакетными запросами
+            token = "github_pat_1"
+            collector = GitHubDataCollector(token, response_cache=_build_response_cache(), base_url=api_url,
+                                            telemetry=telemetry)
+            repos_option = _get_cli_option('--repos')
+            analysis = collector.get_contributors_analysis_bulk(repos_option.split(',') if repos_option else None)
+            if "error" in analysis:
+                print(analysis["error"])
+                return
+            collector.save_to_json(analysis, "github_contributors.json")
+            collector.save_contributors_analysis_to_csv(analysis, "github_contributors.csv")
+            return
+
+        elif sys.argv[1] == '--benchmark':
+            # Сравнение последовательного и асинхронного сбора
+            token = "github_pat_1"
+            concurrency = int(_get_cli_option('--concurrency', '8'))
+            benchmark_collection_modes(token, concurrency, base_url=api_url)
+            return
+
     # Получаем токен из переменной окружения или запрашиваем у пользователя
     token = "github_pat_1"
 
@@ -3157,25 +7499,48 @@ def main():
         print("Токен не предоставлен. Выход.")
         return
 
+    exporter = _build_exporter()
+    if not exporter:
+        return
+
     try:
         # Создаем коллектор
-        collector = GitHubDataCollector(token)
+        collector = GitHubDataCollector(token, response_cache=_build_response_cache(), base_url=api_url,
+                                        telemetry=telemetry)
+        collector.all_years_contributions = '--all-years' in sys.argv
+        collector.exporter = exporter
 
         # Собираем данные
-        collector.collect_all_data()
+        resume = '--resume' in sys.argv
+        stream = '--stream' in sys.argv
+        warehouse = '--warehouse' in sys.argv
+        history = '--history' in sys.argv
+        if '--incremental' in sys.argv:
+            collector.collect_all_data(incremental=True, resume=resume, stream=stream, warehouse=warehouse,
+                                       history=history)
+        elif '--async' in sys.argv:
+            concurrency = int(_get_cli_option('--concurrency', '8'))
+            collector.collect_all_data_async(concurrency, resume=resume, stream=stream, warehouse=warehouse,
+                                             history=history)
+        else:
+            collector.collect_all_data(resume=resume, stream=stream, warehouse=warehouse, history=history)
 
     except requests.exceptions.RequestException as e:
         print(f"Ошибка при работе с GitHub API: {e}")
+        _print_resume_hint()
     except KeyboardInterrupt:
         print("\nОперация прервана пользователем")
+        _print_resume_hint()
     except Exception as e:
         print(f"Неожиданная ошибка: {e}")
+        _print_resume_hint()
 
 
 def demo_unstar_warning():
     token = "---"
-    collector = GitHubDataCollector(token)
-    result = collector.unstar_all_repositories(confirm=True, batch_size=5)
+    collector = GitHubDataCollector(token, base_url=_get_cli_option('--api-url'))
+    result = collector.unstar_all_repositories(confirm=True, workers=int(_get_cli_option('--workers', '4')),
+                                               resume='--restart' not in sys.argv)
     print(result)
 
     print("Удаление звезд завершено!")
@@ -0,0 +1,980 @@
+#!/usr/bin/env python3
+"""
+Локальный стенд GitHub API для Githabo.py
+
+Синтетический аккаунт (FakeGitHubAccount), HTTP сервер с REST и GraphQL
+эндпоинтами, которые использует Githabo.py (FakeGitHubServer), и сквозной
+бенчмарк сбора данных и менеджера лицензий на этом стенде
+(benchmark_end_to_end). Токен и сеть не нужны.
+
+Githabo.py загружает модуль только в режиме --e2e-benchmark:
+python Githabo.py --e2e-benchmark [--repos N] [--stars N] ...
+"""
+
+import os
+import re
+import json
+import time
+import base64
+import gzip
+import asyncio
+import threading
+import hashlib
+import tempfile
+import random
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import List, Dict, Any, Optional, Tuple, Callable, Set
+
+from Githabo import GitHubDataCollector, GitHubDataExporter, GitHubLicenseBatchManager, GitHubTelemetry
+
+
+class FakeGraphQLError(Exception):
+    """Ошибка выполнения запроса локальным стендом GraphQL (попадает в поле errors ответа)"""
+
+    def __init__(self, message: str, error_type: str = None):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+class FakeConnection:
+    """Connection-поле стенда: список узлов с пагинацией first/after и totalCount"""
+
+    def __init__(self, items: List[Any], edge: Callable = None, extra: Dict[str, Any] = None):
+        """
+        Args:
+            items: Узлы в порядке выдачи
+            edge: Построение ребра по узлу (по умолчанию {"node": узел})
+            extra: Дополнительные поля connection (например, totalSize)
+        """
+        self.items = items
+        self.edge = edge
+        self.extra = extra or {}
+
+
+class FakeGraphQLExecutor:
+    """
+    Минимальный исполнитель GraphQL запросов для локального стенда GitHub API
+
+    Поддерживает то, что используют запросы этого скрипта: переменные,
+    алиасы, фрагменты (именованные и inline), аргументы-объекты и списки.
+    Значение поля в модели данных - обычное значение, словарь, список,
+    FakeConnection или функция от аргументов поля. Стоимость запроса
+    считается как у GitHub: каждое раскрытие connection - один запрос,
+    cost = max(1, round(запросы / 100)). Поле rateLimit в корне заполняется
+    после подсчета стоимости через fill_rate_limit(). Один экземпляр
+    выполняет один запрос.
+    """
+
+    TOKEN_RE = re.compile(
+        r'\s*(?:(#[^\n]*)|(\.\.\.)|([{}()\[\]:,!$=@])|("(?:[^"\\]|\\.)*")'
+        r'|(-?\d+(?:\.\d+)?)|([_A-Za-z][_0-9A-Za-z]*))'
+    )
+
+    def __init__(self, root: Dict[str, Any], query: str, variables: Dict[str, Any] = None):
+        """
+        Args:
+            root: Поля корневого типа Query
+            query: Текст запроса
+            variables: Переменные запроса
+        """
+        self.root = root
+        self._tokens = self._tokenize(query)
+        self._position = 0
+        self._fragments = {}
+        self._variables = variables or {}
+        self._connection_calls = 0
+        self._errors = []
+        self._rate_limit_fields = []
+
+    def execute(self) -> Tuple[Dict[str, Any], int]:
+        """
+        Выполнить запрос
+
+        Returns:
+            Кортеж (ответ с полями data и errors, стоимость запроса в баллах)
+        """
+        selections = self._parse_document()
+        data = self._resolve(self.root, selections, [])
+
+        result = {"data": data}
+        if self._errors:
+            result["errors"] = self._errors
+        return result, max(1, round(self._connection_calls / 100))
+
+    def fill_rate_limit(self, result: Dict[str, Any], rate_limit: Dict[str, Any]):
+        """Заполнить поля rateLimit ответа фактическими значениями лимита"""
+        for alias, subselection in self._rate_limit_fields:
+            result["data"][alias] = self._resolve(rate_limit, subselection, [alias])
+
+    # --- Разбор запроса ---
+
+    def _tokenize(self, source: str) -> List[Tuple[str, str]]:
+        tokens = []
+        position = 0
+        source = source.strip()
+        while position < len(source):
+            match = self.TOKEN_RE.match(source, position)
+            if not match:
+                raise FakeGraphQLError(f"Unexpected character at {position}: {source[position:position + 20]!r}")
+            position = match.end()
+            if match.group(1):
+                continue
+            for kind, group in (("spread", 2), ("punct", 3), ("string", 4), ("number", 5), ("name", 6)):
+                if match.group(group) is not None:
+                    tokens.append((kind, match.group(group)))
+                    break
+        return tokens
+
+    def _peek(self) -> Tuple[Optional[str], Optional[str]]:
+        if self._position < len(self._tokens):
+            return self._tokens[self._position]
+        return None, None
+
+    def _take(self, expected: str = None) -> Tuple[str, str]:
+        if self._position >= len(self._tokens):
+            raise FakeGraphQLError("Unexpected end of document")
+        token = self._tokens[self._position]
+        if expected is not None and token[1] != expected:
+            raise FakeGraphQLError(f"Expected {expected!r}, got {token[1]!r}")
+        self._position += 1
+        return token
+
+    def _parse_document(self) -> List[Tuple]:
+        operations = []
+        while self._position < len(self._tokens):
+            value = self._peek()[1]
+            if value == "fragment":
+                self._take()
+                name = self._take()[1]
+                self._take("on")
+                self._take()
+                self._fragments[name] = self._parse_selection_set()
+                continue
+            if value in ("query", "mutation"):
+                self._take()
+                if self._peek()[0] == "name":
+                    self._take()
+                if self._peek()[1] == "(":
+                    self._skip_variable_definitions()
+            operations.append(self._parse_selection_set())
+        if not operations:
+            raise FakeGraphQLError("Document has no operations")
+        return operations[0]
+
+    def _skip_variable_definitions(self):
+        depth = 0
+        while True:
+            value = self._take()[1]
+            if value == "(":
+                depth += 1
+            elif value == ")":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _parse_selection_set(self) -> List[Tuple]:
+        self._take("{")
+        selections = []
+        while self._peek()[1] != "}":
+            if self._peek()[0] == "spread":
+                self._take()
+                if self._peek()[1] == "on":
+                    self._take()
+                    type_name = self._take()[1]
+                    selections.append(("inline", type_name, self._parse_selection_set()))
+                else:
+                    selections.append(("spread", self._take()[1]))
+                continue
+
+            alias = name = self._take()[1]
+            if self._peek()[1] == ":":
+                self._take()
+                name = self._take()[1]
+
+            arguments = {}
+            if self._peek()[1] == "(":
+                self._take()
+                while self._peek()[1] != ")":
+                    argument = self._take()[1]
+                    self._take(":")
+                    arguments[argument] = self._parse_value()
+                    if self._peek()[1] == ",":
+                        self._take()
+                self._take(")")
+
+            subselection = self._parse_selection_set() if self._peek()[1] == "{" else None
+            selections.append(("field", alias, name, arguments, subselection))
+            if self._peek()[1] == ",":
+                self._take()
+        self._take("}")
+        return selections
+
+    def _parse_value(self) -> Any:
+        kind, value = self._take()
+        if value == "$":
+            return ("$", self._take()[1])
+        if kind == "string":
+            return json.loads(value)
+        if kind == "number":
+            return float(value) if "." in value else int(value)
+        if value == "[":
+            items = []
+            while self._peek()[1] != "]":
+                items.append(self._parse_value())
+                if self._peek()[1] == ",":
+                    self._take()
+            self._take("]")
+            return items
+        if value == "{":
+            fields = {}
+            while self._peek()[1] != "}":
+                key = self._take()[1]
+                self._take(":")
+                fields[key] = self._parse_value()
+                if self._peek()[1] == ",":
+                    self._take()
+            self._take("}")
+            return fields
+        if value in ("true", "false"):
+            return value == "true"
+        if value == "null":
+            return None
+        return value  # enum
+
+    # --- Выполнение ---
+
+    def _argument_value(self, value: Any) -> Any:
+        if isinstance(value, tuple) and value[0] == "$":
+            return self._variables.get(value[1])
+        if isinstance(value, list):
+            return [self._argument_value(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._argument_value(item) for key, item in value.items()}
+        return value
+
+    def _resolve(self, obj: Dict[str, Any], selections: List[Tuple], path: List[str]) -> Dict[str, Any]:
+        result = {}
+        for selection in selections:
+            if selection[0] == "spread":
+                result.update(self._resolve(obj, self._fragments[selection[1]], path))
+                continue
+            if selection[0] == "inline":
+                if obj.get("__typename", selection[1]) == selection[1]:
+                    result.update(self._resolve(obj, selection[2], path))
+                continue
+
+            _, alias, name, arguments, subselection = selection
+            if name == "__typename":
+                result[alias] = obj.get("__typename")
+                continue
+            if name == "rateLimit" and not path:
+                self._rate_limit_fields.append((alias, subselection or []))
+                result[alias] = None
+                continue
+            arguments = {key: self._argument_value(value) for key, value in arguments.items()}
+            field_path = path + [alias]
+
+            value = obj.get(name)
+            try:
+                if callable(value):
+                    value = value(arguments)
+                if isinstance(value, FakeConnection):
+                    value = self._paginate(value, arguments)
+            except FakeGraphQLError as e:
+                self._errors.append({"type": e.error_type or "INVALID", "path": field_path, "message": str(e)})
+                result[alias] = None
+                continue
+
+            if subselection is None or value is None:
+                result[alias] = value
+            elif isinstance(value, list):
+                result[alias] = [self._resolve(item, subselection, field_path) for item in value]
+            else:
+                result[alias] = self._resolve(value, subselection, field_path)
+        return result
+
+    def _paginate(self, connection: FakeConnection, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        first = arguments.get("first")
+        if first is None:
+            first = 100 if arguments.get("last") is None else arguments["last"]
+        if first > 100:
+            raise FakeGraphQLError(f"Requesting {first} records on the connection exceeds the `first` limit of 100 records.")
+
+        start = 0
+        if arguments.get("after"):
+            start = int(base64.b64decode(arguments["after"]).decode().split(":", 1)[1])
+
+        items = connection.items
+        page = items[start:start + first]
+        end = start + len(page)
+        self._connection_calls += 1
+
+        result = {
+            "totalCount": len(items),
+            "nodes": page,
+            "edges": [connection.edge(item) if connection.edge else {"node": item} for item in page],
+            "pageInfo": {
+                "hasNextPage": end < len(items),
+                "endCursor": base64.b64encode(f"cursor:{end}".encode()).decode() if page else None
+            }
+        }
+        result.update(connection.extra)
+        return result
+
+
+def _fake_timestamp(value: datetime) -> str:
+    """Дата в формате GitHub API"""
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class FakeGitHubAccount:
+    """
+    Синтетический аккаунт GitHub для локального стенда
+
+    Размеры задаются параметрами, содержимое детерминировано (seed).
+    Форки собственных репозиториев распределены по закону Ципфа, как у
+    настоящих аккаунтов: у нескольких репозиториев сотни форков, у
+    большинства - ни одного.
+    """
+
+    LANGUAGES = ["Python", "JavaScript", "Go", "Rust", "TypeScript", None]
+
+    def __init__(self, repos: int = 500, stars: int = 5000, forks: int = 2000, issues: int = 500,
+                 user_forks: int = None, login: str = "octocat", seed: int = 1):
+        """
+        Args:
+            repos: Количество собственных репозиториев
+            stars: Количество starred репозиториев
+            forks: Суммарное количество форков собственных репозиториев
+            issues: Количество issues пользователя
+            user_forks: Количество форков чужих репозиториев (по умолчанию repos / 10)
+            login: Логин пользователя
+            seed: Начальное значение генератора
+        """
+        rnd = random.Random(seed)
+        self.login = login
+        self.lock = threading.Lock()
+        base = datetime(2018, 1, 1)
+
+        self.repos = []
+        self.by_name = {}
+        weights = [1 / (i + 1) for i in range(repos)]
+        total_weight = sum(weights) or 1
+        fork_counts = [int(forks * w / total_weight) for w in weights]
+        if fork_counts:
+            fork_counts[0] += forks - sum(fork_counts)
+
+        for i in range(repos):
+            created = base + timedelta(hours=i * 7)
+            name = f"repo{i}"
+            files = {"main.py"}
+            if i % 2 == 0:
+                files.add("README.md")
+            if i % 4 == 0:
+                files.add("LICENSE")
+            repo = self._repository(
+                name=name, owner=login, created=created, index=i, rnd=rnd, files=files,
+                fork_items=[self._fork(name, f"user{j}", created + timedelta(minutes=j)) for j in range(fork_counts[i])]
+            )
+            self.repos.append(repo)
+            self.by_name[repo["nameWithOwner"]] = repo
+
+        self.user_forks = []
+        for i in range(repos // 10 if user_forks is None else user_forks):
+            fork = self._repository(name=f"fork{i}", owner=login, created=base + timedelta(hours=i * 11),
+                                    index=i, rnd=rnd, files={"README.md"}, fork_items=[])
+            fork["isFork"] = True
+            fork["parent"] = {"nameWithOwner": f"upstream{i % 50}/fork{i}", "url": f"https://github.com/upstream{i % 50}/fork{i}"}
+            self.user_forks.append(fork)
+            self.by_name[fork["nameWithOwner"]] = fork
+
+        # Starred: от новых к старым (порядок STARRED_AT DESC)
+        self.starred = []
+        for i in range(stars):
+            owner = f"org{i % 400}"
+            self.starred.append({
+                "name": f"project{i}",
+                "nameWithOwner": f"{owner}/project{i}",
+                "url": f"https://github.com/{owner}/project{i}",
+                "description": f"Project {i}",
+                "stargazerCount": int(rnd.paretovariate(1.2) * 10),
+                "forkCount": rnd.randint(0, 500),
+                "primaryLanguage": self._language(i),
+                "createdAt": _fake_timestamp(base - timedelta(days=i % 900)),
+                "updatedAt": _fake_timestamp(base + timedelta(days=i % 700)),
+                "pushedAt": _fake_timestamp(base + timedelta(days=i % 700)),
+                "isArchived": i % 37 == 0,
+                "licenseInfo": {"name": "MIT License", "key": "mit"} if i % 3 else None,
+                "owner": {"login": owner, "__typename": "Organization" if i % 3 else "User"},
+                "repositoryTopics": FakeConnection([{"topic": {"name": f"topic{i % 23}"}}, {"topic": {"name": f"topic{i % 7}"}}]),
+                "_starredAt": _fake_timestamp(base + timedelta(days=3000) - timedelta(minutes=i * 17)),
+            })
+
+        self.issues = []
+        for i in range(issues):
+            created = base + timedelta(hours=i * 13)
+            self.issues.append({
+                "title": f"Issue {i}",
+                "url": f"https://github.com/org{i % 30}/project{i}/issues/{i}",
+                "state": "OPEN" if i % 3 else "CLOSED",
+                "createdAt": _fake_timestamp(created),
+                "updatedAt": _fake_timestamp(created + timedelta(days=2)),
+                "closedAt": None if i % 3 else _fake_timestamp(created + timedelta(days=2)),
+                "comments": FakeConnection([{}] * (i % 5)),
+                "labels": FakeConnection([{"name": "bug"}] if i % 2 else []),
+                "repository": {"nameWithOwner": f"org{i % 30}/project{i}", "url": f"https://github.com/org{i % 30}/project{i}"},
+            })
+
+        self.graphql_root = self._graphql_root()
+
+    def _language(self, index: int) -> Optional[Dict[str, str]]:
+        language = self.LANGUAGES[index % len(self.LANGUAGES)]
+        return {"name": language} if language else None
+
+    def _fork(self, name: str, owner: str, created: datetime) -> Dict[str, Any]:
+        return {
+            "name": name, "nameWithOwner": f"{owner}/{name}", "url": f"https://github.com/{owner}/{name}",
+            "createdAt": _fake_timestamp(created), "pushedAt": _fake_timestamp(created),
+            "updatedAt": _fake_timestamp(created), "description": None, "primaryLanguage": None,
+            "stargazerCount": 0, "owner": {"login": owner}
+        }
+
+    def _repository(self, name: str, owner: str, created: datetime, index: int, rnd: random.Random,
+                    files: Set[str], fork_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        language = self._language(index)
+        repo = {
+            "name": name,
+            "nameWithOwner": f"{owner}/{name}",
+            "url": f"https://github.com/{owner}/{name}",
+            "createdAt": _fake_timestamp(created),
+            "updatedAt": _fake_timestamp(created + timedelta(days=10 + index % 300)),
+            "pushedAt": _fake_timestamp(created + timedelta(days=5 + index % 300)),
+            "description": f"Repository {index}" if index % 3 else None,
+            "forkCount": len(fork_items),
+            "stargazerCount": rnd.choice([0, 0, 0, 1, 2, 5, 12, 40, 150, 900]),
+            "isArchived": index % 41 == 0,
+            "isPrivate": False,
+            "isFork": False,
+            "diskUsage": 100 + index * 3,
+            "primaryLanguage": language,
+            "licenseInfo": {"name": "MIT License", "key": "mit"} if "LICENSE" in files else None,
+            "owner": {"login": owner, "__typename": "User"},
+            "watchers": FakeConnection([{}] * (index % 4)),
+            "issues": FakeConnection([{}] * (index % 6)),
+            "pullRequests": FakeConnection([{}] * (index % 3)),
+            "releases": FakeConnection([{}] * (index % 2)),
+            "tags": FakeConnection([{}] * (index % 2)),
+            "forks": FakeConnection(fork_items),
+            "repositoryTopics": FakeConnection([{"topic": {"name": "cli"}}, {"topic": {"name": "tool"}}] if index % 2 else []),
+            "languages": FakeConnection(
+                [{"name": (language or {"name": "Shell"})["name"]}, {"name": "Shell"}],
+                lambda node: {"size": 9000 if node["name"] != "Shell" else 1000, "node": node},
+                {"totalSize": 10000}
+            ),
+            "collaborators": FakeConnection([{"login": owner, "name": owner, "company": None, "location": None}]),
+            "mentionableUsers": FakeConnection([{"login": f"contributor{index % 9}", "name": None, "company": None, "location": None}]),
+            "defaultBranchRef": {"name": "main", "target": {"history": FakeConnection([{}] * (10 + index % 50))}},
+            "_files": files,
+        }
+        repo["object"] = lambda arguments, repo=repo: {
+            "__typename": "Tree",
+            "entries": [{"name": f, "type": "blob"} for f in sorted(repo["_files"])]
+        }
+        return repo
+
+    def _graphql_root(self) -> Dict[str, Any]:
+        def sort_repositories(items, arguments):
+            order = arguments.get("orderBy") or {}
+            key = {
+                "STARGAZERS": lambda r: r["stargazerCount"],
+                "CREATED_AT": lambda r: r["createdAt"],
+                "UPDATED_AT": lambda r: r["updatedAt"],
+                "PUSHED_AT": lambda r: r["pushedAt"],
+                "NAME": lambda r: r["name"],
+            }.get(order.get("field"))
+            if key:
+                return sorted(items, key=key, reverse=order.get("direction") == "DESC")
+            return items
+
+        def repositories(arguments):
+            if arguments.get("isFork") is True:
+                items = self.user_forks
+            elif arguments.get("isFork") is False:
+                items = self.repos
+            else:
+                items = self.repos + self.user_forks
+            return FakeConnection(sort_repositories(items, arguments))
+
+        def starred_repositories(arguments):
+            return FakeConnection(self.starred, lambda node: {"starredAt": node["_starredAt"], "node": node})
+
+        def issues(arguments):
+            since = (arguments.get("filterBy") or {}).get("since")
+            items = [i for i in self.issues if i["updatedAt"] >= since] if since else self.issues
+            return FakeConnection(items)
+
+        def contributions(arguments):
+            start = datetime.fromisoformat((arguments.get("from") or "2025-01-01T00:00:00Z").replace("Z", ""))
+            end = datetime.fromisoformat((arguments.get("to") or "2025-12-31T00:00:00Z").replace("Z", ""))
+            weeks, days, day = [], [], start
+            total = 0
+            while day <= end:
+                count = (day.toordinal() * 7) % 5
+                total += count
+                days.append({"date": day.strftime("%Y-%m-%d"), "contributionCount": count, "weekday": day.weekday()})
+                if len(days) == 7:
+                    weeks.append({"contributionDays": days})
+                    days = []
+                day += timedelta(days=1)
+            if days:
+                weeks.append({"contributionDays": days})
+            return {
+                "totalCommitContributions": total // 2,
+                "totalIssueContributions": total // 10,
+                "totalPullRequestContributions": total // 8,
+                "totalPullRequestReviewContributions": total // 20,
+                "totalRepositoryContributions": len(self.repos) // 10,
+                "restrictedContributionsCount": 0,
+                "contributionCalendar": {"totalContributions": total, "weeks": weeks}
+            }
+
+        user = {
+            "__typename": "User",
+            "login": self.login, "name": self.login.title(), "bio": None, "company": None, "location": None,
+            "websiteUrl": None, "email": "", "twitterUsername": None,
+            "createdAt": "2018-01-01T00:00:00Z", "updatedAt": "2025-01-01T00:00:00Z",
+            "followers": FakeConnection([{}] * 42),
+            "following": FakeConnection([{}] * 7),
+            "repositories": repositories,
+            "repositoriesContributedTo": FakeConnection([{}] * 12),
+            "starredRepositories": starred_repositories,
+            "issues": issues,
+            "pullRequests": FakeConnection([{}] * 30),
+            "contributionsCollection": contributions,
+            "topRepositories": lambda arguments: FakeConnection(sort_repositories(self.repos, arguments)),
+        }
+
+        def user_by_login(arguments):
+            if arguments.get("login") != self.login:
+                raise FakeGraphQLError(f"Could not resolve to a User with the login of '{arguments.get('login')}'.", "NOT_FOUND")
+            return user
+
+        def repository(arguments):
+            repo = self.by_name.get(f"{arguments.get('owner')}/{arguments.get('name')}")
+            if not repo:
+                raise FakeGraphQLError(
+                    f"Could not resolve to a Repository with the name '{arguments.get('owner')}/{arguments.get('name')}'.",
+                    "NOT_FOUND"
+                )
+            return repo
+
+        return {"user": user_by_login, "viewer": user, "repository": repository}
+
+    def add_file(self, repo_name: str, path: str) -> bool:
+        """Создать файл в корне репозитория (False - файл уже существует)"""
+        with self.lock:
+            repo = self.by_name[repo_name]
+            if path in repo["_files"]:
+                return False
+            repo["_files"].add(path)
+            if path.upper().startswith("LICENSE"):
+                repo["licenseInfo"] = {"name": "MIT License", "key": "mit"}
+            return True
+
+    def set_starred(self, full_name: str, starred: bool):
+        """Поставить или снять звезду"""
+        with self.lock:
+            self.starred = [repo for repo in self.starred if repo["nameWithOwner"] != full_name]
+            if starred:
+                owner, name = full_name.split("/", 1)
+                self.starred.insert(0, {
+                    "name": name, "nameWithOwner": full_name, "url": f"https://github.com/{full_name}",
+                    "description": None, "stargazerCount": 1, "forkCount": 0, "primaryLanguage": None,
+                    "createdAt": "2018-01-01T00:00:00Z", "updatedAt": "2018-01-01T00:00:00Z",
+                    "pushedAt": "2018-01-01T00:00:00Z", "isArchived": False, "licenseInfo": None,
+                    "owner": {"login": owner, "__typename": "User"},
+                    "repositoryTopics": FakeConnection([]),
+                    "_starredAt": _fake_timestamp(datetime.now()),
+                })
+
+
+class _FakeGitHubRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов локального стенда GitHub API (REST и GraphQL)"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"null") if length else None
+        parsed = urlparse(self.path)
+        token = self.headers.get("Authorization", "").split(" ")[-1]
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if parsed.path == "/graphql" and method == "POST":
+            server.count("POST /graphql")
+            return self._graphql(token, body or {})
+
+        route, handler = self._route(method, parsed.path)
+        server.count(f"{method} {route}")
+        if handler is None:
+            return self._send(404, {"message": "Not Found"})
+
+        status, payload, extra_headers = handler(parse_qs(parsed.query), body)
+        if method == "GET" and status == 200:
+            etag = '"%s"' % hashlib.md5(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+            extra_headers = dict(extra_headers or {}, ETag=etag)
+            if self.headers.get("If-None-Match") == etag:
+                # Условный запрос с совпавшим ETag не расходует лимит
+                server.count("304")
+                return self._send(304, None, extra_headers, server.rate_limit_headers(token, "core"))
+
+        headers, allowed = server.charge(token, "core", 1)
+        if not allowed:
+            return self._send(403, {"message": f"API rate limit exceeded for {token[:4]}..."}, None, headers)
+        self._send(status, payload, extra_headers, headers)
+
+    def _route(self, method: str, path: str) -> Tuple[str, Optional[Callable]]:
+        account = self.server.account
+        parts = [part for part in path.split("/") if part]
+
+        if method == "GET" and parts == ["user"]:
+            return "/user", lambda query, body: (200, {"login": account.login, "id": 1, "name": account.login.title(), "email": None}, None)
+        if method == "GET" and parts == ["user", "repos"]:
+            return "/user/repos", self._user_repos
+        if len(parts) == 2 and parts[0] == "licenses" and method == "GET":
+            return "/licenses/{key}", lambda query, body: (200, {
+                "key": parts[1].lower(), "name": parts[1].upper(),
+                "body": "MIT License\n\nCopyright (c) [year] [fullname]\n\nPermission is hereby granted..."
+            }, None)
+        if len(parts) == 4 and parts[:2] == ["user", "starred"] and method in ("PUT", "DELETE"):
+            def star(query, body):
+                account.set_starred(f"{parts[2]}/{parts[3]}", method == "PUT")
+                return 204, None, None
+            return "/user/starred/{owner}/{repo}", star
+
+        if len(parts) >= 3 and parts[0] == "repos":
+            repo = account.by_name.get(f"{parts[1]}/{parts[2]}")
+            rest = parts[3:]
+            if not rest and method == "GET":
+                return "/repos/{owner}/{repo}", lambda query, body: (200, self._rest_repository(repo), None) if repo else (404, {"message": "Not Found"}, None)
+            if rest[:1] == ["contents"] and len(rest) == 2:
+                path_name = rest[1]
+                if method == "GET":
+                    return "/repos/{owner}/{repo}/contents/{path}", lambda query, body: (
+                        (200, {"name": path_name, "path": path_name, "type": "file"}, None)
+                        if repo and path_name in repo["_files"] else (404, {"message": "Not Found"}, None))
+                if method == "PUT":
+                    def create(query, body):
+                        if not repo:
+                            return 404, {"message": "Not Found"}, None
+                        if not account.add_file(repo["nameWithOwner"], path_name):
+                            return 422, {"message": "Invalid request.\n\n\"sha\" wasn't supplied."}, None
+                        return 201, {"content": {"name": path_name, "path": path_name}}, None
+                    return "/repos/{owner}/{repo}/contents/{path}", create
+            if rest[:2] == ["git", "trees"] and method == "GET":
+                return "/repos/{owner}/{repo}/git/trees/{sha}", lambda query, body: (
+                    (200, {"tree": [{"path": f, "type": "blob"} for f in sorted(repo["_files"])], "truncated": False}, None)
+                    if repo else (404, {"message": "Not Found"}, None))
+
+        return path, None
+
+    def _user_repos(self, query: Dict[str, List[str]], body: Any) -> Tuple[int, Any, Dict[str, str]]:
+        account = self.server.account
+        per_page = min(int(query.get("per_page", ["30"])[0]), 100)
+        page = int(query.get("page", ["1"])[0])
+        repos = sorted(account.repos + account.user_forks, key=lambda r: r["updatedAt"], reverse=True)
+        items = repos[(page - 1) * per_page:page * per_page]
+        headers = {}
+        if page * per_page < len(repos):
+            headers["Link"] = f'<{self.server.url}/user/repos?per_page={per_page}&page={page + 1}>; rel="next"'
+        return 200, [self._rest_repository(repo) for repo in items], headers
+
+    @staticmethod
+    def _rest_repository(repo: Dict[str, Any]) -> Dict[str, Any]:
+        license_info = repo.get("licenseInfo")
+        return {
+            "name": repo["name"],
+            "full_name": repo["nameWithOwner"],
+            "owner": {"login": repo["owner"]["login"]},
+            "fork": repo["isFork"],
+            "private": repo["isPrivate"],
+            "description": repo["description"],
+            "stargazers_count": repo["stargazerCount"],
+            "updated_at": repo["updatedAt"],
+            "license": {"key": license_info["key"], "name": license_info["name"]} if license_info else None
+        }
+
+    def _graphql(self, token: str, body: Dict[str, Any]):
+        server = self.server
+        try:
+            executor = FakeGraphQLExecutor(server.account.graphql_root, body.get("query", ""), body.get("variables"))
+            result, cost = executor.execute()
+        except FakeGraphQLError as e:
+            return self._send(200, {"errors": [{"message": str(e)}]}, None, server.rate_limit_headers(token, "graphql"))
+
+        headers, allowed = server.charge(token, "graphql", cost)
+        if not allowed:
+            return self._send(200, {"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]}, None, headers)
+
+        executor.fill_rate_limit(result, {
+            "limit": int(headers["X-RateLimit-Limit"]),
+            "cost": cost,
+            "remaining": int(headers["X-RateLimit-Remaining"]),
+            "used": int(headers["X-RateLimit-Used"]),
+            "resetAt": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(int(headers["X-RateLimit-Reset"])))
+        })
+        self._send(200, result, None, headers)
+
+    def _send(self, status: int, payload: Any, extra_headers: Dict[str, str] = None,
+              rate_headers: Dict[str, str] = None):
+        raw = b"" if payload is None else json.dumps(payload).encode()
+        gzipped = len(raw) > 1024 and "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzipped:
+            raw = gzip.compress(raw, compresslevel=5)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(raw)))
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        for key, value in dict(rate_headers or {}, **(extra_headers or {})).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(raw)
+        self.server.count_bytes(len(raw))
+
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    """
+    Локальный стенд GitHub API для бенчмарков и регрессионных проверок
+
+    Отвечает на REST и GraphQL запросы этого скрипта данными FakeGitHubAccount.
+    Лимиты считаются на токен как у GitHub: REST - один запрос из limit в час,
+    GraphQL - стоимость запроса в баллах; заголовки X-RateLimit-* и поле
+    rateLimit отражают фактический расход. Ответы сжимаются gzip, GET ответы
+    получают ETag, условный запрос с совпавшим ETag возвращает 304 без расхода
+    лимита. Счетчики запросов по эндпоинтам доступны через counts.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, account: FakeGitHubAccount, latency: float = 0.0,
+                 rate_limit: int = 5000, graphql_rate_limit: int = 5000):
+        """
+        Args:
+            account: Синтетический аккаунт
+            latency: Задержка обработки каждого запроса (сек), имитация сети
+            rate_limit: Лимит REST запросов в час на токен
+            graphql_rate_limit: Лимит GraphQL баллов в час на токен
+        """
+        super().__init__(("127.0.0.1", 0), _FakeGitHubRequestHandler)
+        self.account = account
+        self.latency = latency
+        self.limits = {"core": rate_limit, "graphql": graphql_rate_limit}
+        self.counts: Dict[str, int] = {}
+        self.bytes_sent = 0
+        self._budgets = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Адрес стенда для base_url / --api-url"""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> str:
+        """Запустить стенд в фоновом потоке"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        """Остановить стенд"""
+        self.shutdown()
+        self.server_close()
+
+    def count(self, key: str):
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def count_bytes(self, size: int):
+        with self._lock:
+            self.bytes_sent += size
+
+    def total_requests(self) -> int:
+        """Количество запросов к API (без учета открытых соединений)"""
+        with self._lock:
+            return sum(value for key, value in self.counts.items() if key not in ("connections", "304"))
+
+    def charge(self, token: str, resource: str, cost: int) -> Tuple[Dict[str, str], bool]:
+        """
+        Списать стоимость запроса с бюджета токена
+
+        Returns:
+            Кортеж (заголовки X-RateLimit-*, запрос разрешен)
+        """
+        with self._lock:
+            budget = self._budget(token, resource)
+            allowed = budget["used"] + cost <= budget["limit"]
+            if allowed:
+                budget["used"] += cost
+            return self._headers(budget, resource), allowed
+
+    def rate_limit_headers(self, token: str, resource: str) -> Dict[str, str]:
+        """Заголовки X-RateLimit-* без списания"""
+        with self._lock:
+            return self._headers(self._budget(token, resource), resource)
+
+    def _budget(self, token: str, resource: str) -> Dict[str, float]:
+        now = time.time()
+        budget = self._budgets.get((token, resource))
+        if not budget or budget["reset"] <= now:
+            budget = {"limit": self.limits[resource], "used": 0, "reset": int(now) + 3600}
+            self._budgets[(token, resource)] = budget
+        return budget
+
+    @staticmethod
+    def _headers(budget: Dict[str, float], resource: str) -> Dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(budget["limit"]),
+            "X-RateLimit-Remaining": str(max(budget["limit"] - budget["used"], 0)),
+            "X-RateLimit-Used": str(budget["used"]),
+            "X-RateLimit-Reset": str(budget["reset"]),
+            "X-RateLimit-Resource": resource
+        }
+
+
+def benchmark_end_to_end(repos: int = 500, stars: int = 5000, forks: int = 2000, issues: int = 500,
+                         latency: float = 0.0, concurrency: int = 8, license_writes: int = 3,
+                         rate_limit: int = 5000, output_file: Optional[str] = "github_e2e_benchmark.json",
+                         telemetry: Optional[GitHubTelemetry] = None) -> Dict[str, Any]:
+    """
+    Сквозной бенчмарк на локальном стенде GitHub API (без токена и сети)
+
+    Замеряет время и количество запросов каждой фазы collect_all_data
+    (последовательный режим), полный асинхронный сбор, инкрементальный запуск
+    после потокового и основные сценарии GitHubLicenseBatchManager. Файлы
+    сбора пишутся только во временный каталог.
+
+    Args:
+        repos: Количество собственных репозиториев синтетического аккаунта
+        stars: Количество starred репозиториев
+        forks: Суммарное количество форков собственных репозиториев
+        issues: Количество issues
+        latency: Задержка стенда на запрос (сек)
+        concurrency: Параллельность асинхронного сбора и пула менеджера лицензий
+        license_writes: Сколько лицензий реально создать (запись ограничена вторичным лимитом)
+        rate_limit: Часовой лимит стенда (REST запросы и GraphQL баллы); при 5000 на больших
+            аккаунтах сценарии упираются в лимит так же, как на GitHub
+        output_file: JSON файл для результатов (None = не сохранять)
+        telemetry: Телеметрия запросов (по умолчанию создается новая; отчет входит в результат)
+
+    Returns:
+        Результаты замеров
+    """
+    print(f"Подготовка стенда: {repos} репозиториев, {stars} звезд, {forks} форков, {issues} issues...")
+    account = FakeGitHubAccount(repos=repos, stars=stars, forks=forks, issues=issues)
+    server = FakeGitHubServer(account, latency=latency, rate_limit=rate_limit, graphql_rate_limit=rate_limit)
+    base_url = server.start()
+    token = f"benchmark-{os.getpid()}-{int(time.time() * 1000)}"
+    telemetry = telemetry or GitHubTelemetry()
+
+    def measure(name: str, func: Callable, *args, **kwargs) -> Dict[str, Any]:
+        requests_before = server.total_requests()
+        started = time.perf_counter()
+        func(*args, **kwargs)
+        return {
+            "flow": name,
+            "seconds": round(time.perf_counter() - started, 3),
+            "requests": server.total_requests() - requests_before
+        }
+
+    try:
+        collector = GitHubDataCollector(token, username=account.login, base_url=base_url, telemetry=telemetry)
+        sequential = measure("collect_all_data", collector._collect_datasets)
+        phases = [dict(phase=name, **stats) for name, stats in collector.phase_stats.items()]
+
+        collector = GitHubDataCollector(token, username=account.login, base_url=base_url, telemetry=telemetry)
+        collector._configure_connection_pool(concurrency)
+        concurrent = measure(f"collect_all_data_async({concurrency})",
+                             lambda: asyncio.run(collector._collect_datasets_async(concurrency)))
+
+        manager_flows = [sequential, concurrent]
+        for name, flow in (
+            ("get_my_repos", lambda m: m.get_my_repos()),
+            ("check_readme_presence", lambda m: m.check_readme_presence()),
+            ("check_topics_presence", lambda m: m.check_topics_presence()),
+            (f"batch_add_licenses(dry_run, workers={concurrency})",
+             lambda m: m.batch_add_licenses("mit", force=True, workers=concurrency, dry_run=True)),
+        ):
+            manager_flows.append(measure(name, flow, GitHubLicenseBatchManager(token, base_url=base_url, telemetry=telemetry)))
+
+        # Инкрементальный запуск после потокового: снимок со ссылками на NDJSON
+        # должен приводить к полному сбору, а не к объединению со ссылками
+        with tempfile.TemporaryDirectory() as output_dir:
+            collector = GitHubDataCollector(token, username=account.login, base_url=base_url, telemetry=telemetry)
+            collector.output_dir = output_dir
+            collector.exporter = GitHubDataExporter(outputs=["json"])
+            manager_flows.append(measure("collect_all_data(stream) -> incremental", lambda: (
+                collector.collect_all_data(stream=True), collector.collect_all_data(incremental=True)
+            )))
+
+        if license_writes:
+            targets = [repo["nameWithOwner"] for repo in account.repos if "LICENSE" not in repo["_files"]][:license_writes]
+            manager_flows.append(measure(
+                f"batch_add_licenses({len(targets)} writes)",
+                lambda m: m.batch_add_licenses("mit", include_only=targets, workers=concurrency),
+                GitHubLicenseBatchManager(token, base_url=base_url, telemetry=telemetry)
+            ))
+    finally:
+        server.stop()
+
+    result = {
+        "account": {"repos": repos, "stars": stars, "forks": forks, "issues": issues},
+        "latency_seconds": latency,
+        "rate_limit": rate_limit,
+        "phases": phases,
+        "flows": manager_flows,
+        "requests_by_endpoint": dict(sorted(server.counts.items())),
+        "bytes_sent": server.bytes_sent,
+        "telemetry": telemetry.to_dict()
+    }
+
+    print("\n⏱️ ФАЗЫ collect_all_data (последовательно):")
+    for phase in phases:
+        print(f"  {phase['phase']:<24} {phase['seconds']:>8.3f} сек  {phase['requests']:>6} запросов")
+    print("\n⏱️ СЦЕНАРИИ:")
+    for flow in manager_flows:
+        print(f"  {flow['flow']:<48} {flow['seconds']:>8.3f} сек  {flow['requests']:>6} запросов")
+    print(f"\nСоединений открыто: {server.counts.get('connections', 0)}, передано {server.bytes_sent / 1024:.0f} КБ")
+
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"Результаты сохранены в {output_file}")
+
+    return result